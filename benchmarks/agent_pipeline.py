@@ -0,0 +1,135 @@
+"""
+Offline end-to-end benchmark of the agent pipeline.
+
+Runs `process_query` with a scripted chat model that replays a recorded tool-call session,
+while the tools and the vector store are the real ones. Reports per-phase latency (LLM,
+each tool, framework overhead) and Python allocations, with no network access needed once
+the vector store has been indexed.
+
+Usage:
+    uv run python benchmarks/agent_pipeline.py [--runs 10] [--llm-delay 0.0] [--json out.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(__file__), "fixtures", "greenhouse_session.json")
+DEFAULT_QUERY = "Temperature and humidity monitoring for a greenhouse that runs on battery"
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _stats(values):
+    return {
+        "mean_ms": round(statistics.mean(values) * 1000, 3),
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3),
+    }
+
+
+def run_benchmark(runs, query, script_path, llm_delay, warmup=1, top_allocations=10):
+    from agent.agent import process_query
+    from agent.iot_planner import build_iot_planner
+    from agent.scripted_llm import ScriptedChatModel
+
+    llm = ScriptedChatModel.from_file(script_path, delay_s=llm_delay)
+    planner = build_iot_planner(llm=llm)
+
+    # Warm-up runs open the vector store, load the embedding model and fill import caches
+    for _ in range(warmup):
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_query(planner, query)
+
+    phases = {"total": [], "llm": [], "framework_overhead": []}
+    allocations = []
+    tracemalloc.start()
+    baseline_snapshot = tracemalloc.take_snapshot()
+
+    for _ in range(runs):
+        llm.call_log.clear()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, summary = process_query(planner, query)
+        total = time.perf_counter() - start
+        after, peak = tracemalloc.get_traced_memory()
+
+        if summary["errors"]["error_count"]:
+            raise RuntimeError(f"Agent run failed: {summary['errors']['errors']}")
+
+        llm_time = sum(call["seconds"] for call in llm.call_log)
+        tool_time = 0.0
+        for tool_name, perf in summary["tool_performance"].items():
+            phases.setdefault(f"tool:{tool_name}", []).append(perf["total_runtime"])
+            tool_time += perf["total_runtime"]
+
+        phases["total"].append(total)
+        phases["llm"].append(llm_time)
+        phases["framework_overhead"].append(max(total - llm_time - tool_time, 0.0))
+        allocations.append(
+            {"peak_kb": (peak - before) / 1024, "retained_kb": (after - before) / 1024}
+        )
+
+    top_sites = [
+        {"site": str(stat.traceback[0]), "size_kb": round(stat.size_diff / 1024, 1)}
+        for stat in tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")[
+            :top_allocations
+        ]
+    ]
+    tracemalloc.stop()
+
+    return {
+        "query": query,
+        "runs": runs,
+        "llm_delay_s": llm_delay,
+        "phases": {name: _stats(values) for name, values in phases.items()},
+        "allocations": {
+            "mean_peak_kb": round(statistics.mean(a["peak_kb"] for a in allocations), 1),
+            "mean_retained_kb": round(statistics.mean(a["retained_kb"] for a in allocations), 1),
+            "top_sites": top_sites,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline agent pipeline benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="User query to replay")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help="Recorded session JSON")
+    parser.add_argument(
+        "--llm-delay", type=float, default=0.0, help="Simulated seconds per LLM turn"
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.runs, args.query, args.script, args.llm_delay)
+
+    print(f"Agent pipeline ({report['runs']} runs, LLM delay {report['llm_delay_s']}s)")
+    for name, stats in report["phases"].items():
+        print(f"  {name:<34} p50 {stats['p50_ms']:>9.2f} ms   p95 {stats['p95_ms']:>9.2f} ms")
+    print(
+        f"  allocations: peak {report['allocations']['mean_peak_kb']:.0f} KB/run, "
+        f"retained {report['allocations']['mean_retained_kb']:.0f} KB/run"
+    )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark of blueprint keyword matching on large heuristic tables and long requests.
+
+Generates a synthetic heuristics table (component types x options x keywords) and requests
+of increasing length, then times:
+    - the compiled single-pass matcher (agent.tools.blueprint_matcher.BlueprintMatcher)
+    - the original per-keyword substring scan, stopping at the first hit per component type
+The report also counts component types where the two disagree, i.e. where a keyword only
+occurs inside a longer word.
+
+Usage:
+    uv run python benchmarks/blueprint_matching.py [--options 5000] [--request-words 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import string
+import sys
+import time
+
+COMPONENT_TYPES = ["microcontroller", "sensor", "actuator", "display", "power supply", "case"]
+
+
+# Keywords and filler words use disjoint letters, so the substring scan can't hit keywords
+# inside filler words and has to work through the table as it would for a real request
+KEYWORD_LETTERS = string.ascii_lowercase[:13]
+FILLER_LETTERS = string.ascii_lowercase[13:]
+
+
+def _word(rng, letters, low=3, high=9):
+    return "".join(rng.choice(letters) for _ in range(rng.randint(low, high)))
+
+
+def make_table(options, keywords_per_option, rng):
+    table = {comp_type: [] for comp_type in COMPONENT_TYPES}
+    for i in range(options):
+        keywords = [
+            " ".join(_word(rng, KEYWORD_LETTERS) for _ in range(rng.choice([1, 1, 1, 2])))
+            for _ in range(keywords_per_option)
+        ]
+        table[COMPONENT_TYPES[i % len(COMPONENT_TYPES)]].append((f"Component {i}", keywords))
+    return table
+
+
+def make_request(table, words, rng):
+    keywords = [kw for options in table.values() for _, kws in options for kw in kws]
+    parts = []
+    while len(parts) < words:
+        # Mostly filler words, with the occasional real keyword
+        parts.append(rng.choice(keywords) if rng.random() < 0.01 else _word(rng, FILLER_LETTERS))
+    return " ".join(parts)
+
+
+def substring_match(table, request):
+    """The original matching loop: first option per type with a keyword substring hit"""
+    req = request.lower()
+    components = {}
+    for comp_type, options in table.items():
+        for label, keywords in options:
+            if keywords and any(word in req for word in keywords):
+                components[comp_type] = label
+                break
+    return components
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, round(statistics.median(times) * 1000, 3)
+
+
+def run_benchmark(options, keywords_per_option, request_words, repeat, seed=0):
+    from agent.tools.blueprint_matcher import BlueprintMatcher, Heuristics
+
+    rng = random.Random(seed)
+    table = make_table(options, keywords_per_option, rng)
+
+    start = time.perf_counter()
+    matcher = BlueprintMatcher(Heuristics.from_table(table))
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    report = {
+        "options": options,
+        "keywords": len(matcher.keyword_targets),
+        "compile_ms": round(compile_ms, 1),
+        "requests": [],
+    }
+    for words in request_words:
+        request = make_request(table, words, rng)
+        compiled, compiled_ms = _time(lambda: matcher.match(request), repeat)
+        substring, substring_ms = _time(lambda: substring_match(table, request), repeat)
+        report["requests"].append(
+            {
+                "words": words,
+                "compiled_p50_ms": compiled_ms,
+                "substring_scan_p50_ms": substring_ms,
+                "types_differing": sum(
+                    compiled.get(comp_type) != substring.get(comp_type) for comp_type in table
+                ),
+            }
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blueprint keyword matching benchmark")
+    parser.add_argument("--options", type=int, default=5000, help="Component options in total")
+    parser.add_argument("--keywords", type=int, default=3, help="Keywords per option")
+    parser.add_argument(
+        "--request-words",
+        type=int,
+        nargs="+",
+        default=[20, 200, 2000],
+        help="Request lengths (words) to time",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.options, args.keywords, args.request_words, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark of batch BOM quoting.
+
+Builds a synthetic BOM whose lines each have offers from several vendors with random
+prices and stock, then times:
+    - agent.tools.bom_quoting_tool.allocate, the array-based vendor selection
+    - a per-line Python loop implementing the same policy, as a correctness reference
+    - quote_bom end to end (offers already fetched), including building the JSON result
+
+Usage:
+    uv run python benchmarks/bom_quoting.py [--lines 500] [--vendors 8] [--units 5000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+
+def make_offers(lines, vendors, rng):
+    offers = {}
+    for i in range(lines):
+        offers[f"component-{i}"] = [
+            {
+                "vendor": f"vendor-{v}",
+                "part_number": f"V{v}-{i}",
+                "price": round(rng.uniform(0.1, 50), 2),
+                "stock": rng.choice([0, rng.randint(1, 5_000), rng.randint(5_000, 200_000)]),
+            }
+            for v in rng.sample(range(vendors), rng.randint(1, vendors))
+        ]
+    return offers
+
+
+def reference_allocate(line_offers, required):
+    """Cheapest offer that covers the line, else greedily cheapest-first across offers"""
+    takes = []
+    for offers, quantity in zip(line_offers, required):
+        take = [0] * len(offers)
+        feasible = [j for j, o in enumerate(offers) if o["stock"] >= quantity]
+        if feasible:
+            take[min(feasible, key=lambda j: offers[j]["price"])] = quantity
+        else:
+            remaining = quantity
+            for j in sorted(range(len(offers)), key=lambda j: offers[j]["price"]):
+                take[j] = min(remaining, offers[j]["stock"])
+                remaining -= take[j]
+        takes.append(take)
+    return takes
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    ordered = sorted(times)
+    return result, {
+        "p50_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 3),
+    }
+
+
+def run_benchmark(lines, vendors, units, repeat, seed=0):
+    import numpy as np
+
+    from agent.tools.bom_quoting_tool import allocate, quote_bom
+
+    rng = random.Random(seed)
+    offers = make_offers(lines, vendors, rng)
+    bom = [(name, rng.randint(1, 10)) for name in offers]
+    line_offers = [offers[name] for name, _ in bom]
+    required = [quantity * units for _, quantity in bom]
+
+    prices = np.full((lines, vendors), np.inf)
+    stocks = np.zeros((lines, vendors), dtype=np.int64)
+    for i, candidates in enumerate(line_offers):
+        for j, offer in enumerate(candidates):
+            prices[i, j], stocks[i, j] = offer["price"], offer["stock"]
+    required_array = np.array(required, dtype=np.int64)
+
+    take, vectorized = _time(lambda: allocate(prices, stocks, required_array), repeat)
+    reference, loop = _time(lambda: reference_allocate(line_offers, required), repeat)
+    quote, end_to_end = _time(lambda: quote_bom(bom, units=units, offers=offers), repeat)
+
+    reference_cost = sum(
+        offer["price"] * quantity
+        for offers_, takes in zip(line_offers, reference)
+        for offer, quantity in zip(offers_, takes)
+    )
+    vectorized_cost = float((np.where(take > 0, prices, 0) * take).sum())
+    return {
+        "lines": lines,
+        "vendors": vendors,
+        "units": units,
+        "vectorized_allocate": vectorized,
+        "python_loop_allocate": loop,
+        "quote_bom_end_to_end": end_to_end,
+        "costs_match": abs(reference_cost - vectorized_cost) < 1e-6 * max(reference_cost, 1),
+        "total_cost": quote["total_cost"],
+        "lines_split": sum(line["status"] == "split" for line in quote["lines"]),
+        "lines_short": sum(line["status"] == "short" for line in quote["lines"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch BOM quoting benchmark")
+    parser.add_argument("--lines", type=int, default=500, help="BOM lines")
+    parser.add_argument("--vendors", type=int, default=8, help="Vendors per component (max)")
+    parser.add_argument("--units", type=int, default=5000, help="Units to build")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed repetitions")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.lines, args.vendors, args.units, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["costs_match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Benchmark of the trigram index behind fuzzy component lookup against linear scans.
+
+Builds a synthetic catalog of vendor-style item names (manufacturer, part number,
+description), then times lookups of perturbed names (dropped characters, hyphens, partial
+names) with:
+    - the trigram index (agent.inventory.fuzzy.TrigramIndex)
+    - an exact lowercase-equality linear scan, as component_sourcing_tool used to do
+    - a brute-force linear scan computing the same trigram similarity for every item,
+      which also checks that the index returns the same best match
+
+Usage:
+    uv run python benchmarks/fuzzy_lookup.py [--items 100000] [--queries 500] [--json out.json]
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import string
+import sys
+import time
+
+MANUFACTURERS = [
+    "Adafruit", "SparkFun", "DFRobot", "Seeed", "Waveshare", "HiLetgo", "Bosch",
+    "Texas Instruments", "Espressif", "Microchip", "STMicro", "Nordic", "Murata", "Sensirion",
+    "Honeywell",
+]
+DESCRIPTIONS = [
+    "Temperature Sensor", "Humidity Sensor", "PIR Motion Sensor", "Relay Module", "OLED Display",
+    "Soil Moisture Sensor", "Gas Sensor", "Stepper Motor", "Servo Motor", "Solar Panel",
+    "Li-Ion Battery", "Weatherproof Enclosure", "WiFi Module", "BLE Module", "LoRa Module",
+    "Microcontroller Board", "Pressure Sensor", "Light Sensor",
+]
+
+
+def make_catalog(count, rng):
+    def part_number():
+        prefix = "".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 4)))
+        suffix = "".join(
+            rng.choice(string.ascii_uppercase + string.digits) for _ in range(rng.randint(0, 5))
+        )
+        return f"{prefix}-{rng.randint(10, 9999)}{suffix}"
+
+    return [
+        f"{rng.choice(MANUFACTURERS)} {part_number()} {rng.choice(DESCRIPTIONS)}"
+        for _ in range(count)
+    ]
+
+
+def perturb(name, rng):
+    """Simulate how an LLM or user misremembers a catalog name"""
+    words = name.split(" ")
+    choice = rng.randrange(3)
+    if choice == 0:  # drop the manufacturer
+        return " ".join(words[1:])
+    if choice == 1:  # drop one character
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1 :]
+    return name.replace("-", "")  # hyphen-less part number
+
+
+def _percentiles(values):
+    ordered = sorted(values)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]  # noqa: E731
+    return {
+        "p50_ms": round(pick(50) * 1000, 4),
+        "p95_ms": round(pick(95) * 1000, 4),
+        "mean_ms": round(statistics.mean(values) * 1000, 4),
+    }
+
+
+def run_benchmark(items, queries, linear_queries, seed=0):
+    from agent.inventory.fuzzy import TrigramIndex, trigrams
+
+    rng = random.Random(seed)
+    keys = make_catalog(items, rng)
+    targets = rng.sample(range(len(keys)), queries)
+    query_texts = [perturb(keys[i], rng) for i in targets]
+
+    start = time.perf_counter()
+    index = TrigramIndex(keys)
+    build_seconds = time.perf_counter() - start
+
+    index_times, index_hits = [], 0
+    for target, query in zip(targets, query_texts):
+        start = time.perf_counter()
+        results = index.search(query, limit=5)
+        index_times.append(time.perf_counter() - start)
+        index_hits += bool(results) and keys[results[0][0]] == keys[target]
+
+    exact_times = []
+    for query in query_texts[:linear_queries]:
+        start = time.perf_counter()
+        normalized = query.strip().lower()
+        _ = [key for key in keys if key.strip().lower() == normalized]
+        exact_times.append(time.perf_counter() - start)
+
+    # Brute force with the same IDF-weighted cosine similarity, as a correctness reference
+    key_grams = [trigrams(key) for key in keys]
+    idf = {gram: float(index.idf[gram_id]) for gram, gram_id in index.gram_ids.items()}
+    key_norms = [math.sqrt(sum(idf[g] ** 2 for g in grams)) for grams in key_grams]
+    linear_times, agreements = [], 0
+    for query in query_texts[:linear_queries]:
+        start = time.perf_counter()
+        grams = trigrams(query)
+        query_norm = math.sqrt(sum(idf.get(g, index.unseen_idf) ** 2 for g in grams))
+        scores = [
+            sum(idf[g] ** 2 for g in grams & kg) / (norm * query_norm)
+            for kg, norm in zip(key_grams, key_norms)
+        ]
+        best = max(range(len(keys)), key=scores.__getitem__)
+        linear_times.append(time.perf_counter() - start)
+        indexed = index.search(query, limit=1)
+        agreements += bool(indexed) and math.isclose(
+            indexed[0][1], scores[best], abs_tol=1e-3
+        )
+
+    return {
+        "items": items,
+        "queries": queries,
+        "index_build_seconds": round(build_seconds, 3),
+        "trigram_index": {
+            **_percentiles(index_times),
+            "top1_accuracy": round(index_hits / queries, 4),
+        },
+        "exact_linear_scan": {
+            **_percentiles(exact_times),
+            "note": "exact match only; finds none of the perturbed names",
+        },
+        "fuzzy_linear_scan": {
+            **_percentiles(linear_times),
+            "best_score_agreement": round(agreements / max(linear_queries, 1), 4),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trigram index vs linear scan benchmark")
+    parser.add_argument("--items", type=int, default=100_000, help="Synthetic catalog size")
+    parser.add_argument("--queries", type=int, default=500, help="Indexed lookups to time")
+    parser.add_argument(
+        "--linear-queries", type=int, default=20, help="Lookups for the (slow) linear scans"
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.items, args.queries, args.linear_queries)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
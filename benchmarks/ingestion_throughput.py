@@ -0,0 +1,272 @@
+"""
+Benchmark of document ingestion throughput and memory.
+
+Runs the ingestion stages over assets/ and over synthetic corpora scaled up from it:
+    - extract: rag.parser.extract_text_from_pdf (real PDFs only)
+    - clean: rag.parser._clean_text
+    - chunk: rag.parser.get_text_chunks (which cleans again before splitting)
+    - add_chunks: VectorStore.add_chunks into a fresh store, once per batch size, split
+      into its ingest.embed and ingest.write spans
+
+Each stage reports its time, throughput (pages/sec, chunks/sec, embeddings/sec), peak RSS
+sampled while it runs and the peak of Python allocations (tracemalloc, measured in a
+separate pass for the pure-Python stages so it doesn't skew their timings). A scaled corpus
+of factor N holds N copies of the extracted text, each after the first with its lines
+shuffled, so the copies are embedded as distinct chunks. The report carries a timestamp and
+the git revision for comparison across commits.
+
+Usage:
+    uv run python benchmarks/ingestion_throughput.py [--scales 1 4] [--batch-sizes 32 100 500]
+        [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+
+
+def _rss_bytes():
+    """Current resident set size (falls back to the process high-water mark off Linux)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _PeakRss:
+    """Samples RSS in a background thread while the block runs"""
+
+    def __init__(self, interval_s=0.005):
+        self.interval_s = interval_s
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval_s):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _mb(size):
+    return round(size / 2**20, 1)
+
+
+def _measure(fn, trace=False):
+    """Run fn once; returns (result, seconds, peak RSS in MB, peak traced MB or None)"""
+    if trace:
+        tracemalloc.start()
+    try:
+        with _PeakRss() as rss:
+            start = time.perf_counter()
+            result = fn()
+            seconds = time.perf_counter() - start
+        traced = _mb(tracemalloc.get_traced_memory()[1]) if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return result, seconds, _mb(rss.peak), traced
+
+
+def _stage(fn, count, unit, trace_separately=True):
+    """
+    Time a stage, then re-run it under tracemalloc for its allocation peak.
+
+    Returns:
+        tuple: (fn's result, stats), with throughput as count(result) {unit} per second.
+    """
+    result, seconds, rss_mb, traced_mb = _measure(fn, trace=not trace_separately)
+    if trace_separately:
+        _, _, _, traced_mb = _measure(fn, trace=True)
+    items = count(result)
+    return result, {
+        "seconds": round(seconds, 3),
+        f"{unit}_per_s": round(items / seconds, 1) if seconds else None,
+        "peak_rss_mb": rss_mb,
+        "peak_traced_mb": traced_mb,
+    }
+
+
+def extract_corpus(assets_dir):
+    """(texts by file, page count) of the PDFs in assets_dir"""
+    import pymupdf
+
+    from rag.parser import extract_text_from_pdf
+
+    texts, pages = {}, 0
+    for file in sorted(os.listdir(assets_dir)):
+        if file.endswith(".pdf"):
+            path = os.path.join(assets_dir, file)
+            text = extract_text_from_pdf(path)
+            if text:
+                texts[file] = text
+                with pymupdf.open(path) as doc:
+                    pages += doc.page_count
+    return texts, pages
+
+
+def scale_corpus(texts, scale, seed=0):
+    """scale copies of texts; copies after the first have their lines shuffled"""
+    rng = random.Random(seed)
+    scaled = dict(texts)
+    for copy in range(1, scale):
+        for file, text in texts.items():
+            lines = text.split("\n")
+            rng.shuffle(lines)
+            scaled[f"copy{copy}-{file}"] = "\n".join(lines)
+    return scaled
+
+
+def add_chunks_run(chunks, batch_size):
+    """Stats of add_chunks into a fresh store, with its embed and write time"""
+    from rag.spans import SpanRecorder, activate, deactivate
+    from rag.vector_store import VectorStore
+
+    with tempfile.TemporaryDirectory() as db_path:
+        store = VectorStore(db_path=db_path)
+        # Load the embedding model outside the measurement
+        store.embedding_function(["warm up"])
+
+        recorder = SpanRecorder()
+        tokens = activate(recorder)
+        try:
+            # Native embedding work dominates, so tracing allocations inline costs little
+            _, stats = _stage(
+                lambda: store.add_chunks(chunks, batch_size=batch_size),
+                lambda _: len(chunks),
+                "chunks",
+                trace_separately=False,
+            )
+        finally:
+            deactivate(tokens)
+        stored = store.count()
+
+    phases = recorder.breakdown()
+    embed_s = phases.get("ingest.embed", {}).get("total_ms", 0) / 1000
+    write_s = phases.get("ingest.write", {}).get("total_ms", 0) / 1000
+    return {
+        "batch_size": batch_size,
+        **stats,
+        "embed_s": round(embed_s, 3),
+        "embeddings_per_s": round(len(chunks) / embed_s, 1) if embed_s else None,
+        "write_s": round(write_s, 3),
+        "stored": stored,
+    }
+
+
+def run_benchmark(scales, batch_sizes):
+    from rag.parser import _clean_text, get_text_chunks
+
+    (texts, pages), extract = _stage(
+        lambda: extract_corpus(ASSETS_DIR), lambda result: result[1], "pages"
+    )
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "corpus": {"files": len(texts), "pages": pages},
+        "extract": extract,
+        "scales": [],
+    }
+    complete = True
+
+    for scale in scales:
+        corpus = scale_corpus(texts, scale)
+        characters = sum(map(len, corpus.values()))
+
+        _, clean = _stage(
+            lambda: [_clean_text(text) for text in corpus.values()],
+            lambda _: characters,
+            "chars",
+        )
+        chunks, chunk = _stage(
+            lambda: [
+                c for file, text in corpus.items() for c in get_text_chunks(text, source_file=file)
+            ],
+            len,
+            "chunks",
+        )
+
+        add_runs = [add_chunks_run(chunks, batch_size) for batch_size in batch_sizes]
+        complete &= all(run["stored"] == len(chunks) for run in add_runs)
+
+        best = min(add_runs, key=lambda run: run["seconds"])
+        # get_text_chunks cleans the text itself, so clean isn't counted twice
+        total_s = extract["seconds"] * scale + chunk["seconds"] + best["seconds"]
+        report["scales"].append(
+            {
+                "scale": scale,
+                "pages": pages * scale,
+                "characters": characters,
+                "chunks": len(chunks),
+                "clean": clean,
+                "chunk": chunk,
+                "add_chunks": add_runs,
+                # Extraction time is extrapolated from the real corpus for the copies
+                "end_to_end_pages_per_s": round(pages * scale / total_s, 2),
+            }
+        )
+
+    report["complete"] = complete
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion throughput and memory benchmark")
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 4], help="Corpus size multipliers"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[32, 100, 500], help="add_chunks batches"
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.scales, args.batch_sizes)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    # Every batch size must have stored every chunk
+    return 0 if report["complete"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
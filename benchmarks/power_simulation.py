@@ -0,0 +1,112 @@
+"""
+Benchmark of the duty-cycle power simulation.
+
+Times:
+    - simulate_power: a day of randomly scheduled components on a fine time grid
+    - sweep_batteries: runtimes of load configurations x chemistries x capacities in one
+      vectorized pass, against a Python loop over every candidate as a reference
+
+Usage:
+    uv run python benchmarks/power_simulation.py [--components 20] [--step 1] [--configs 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    ordered = sorted(times)
+    return result, {
+        "p50_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 3),
+    }
+
+
+def reference_sweep(loads_w, capacities, chemistries):
+    runtimes = []
+    for load_w in loads_w:
+        for chemistry in chemistries:
+            for capacity in capacities:
+                full_wh = capacity / 1000 * chemistry.nominal_voltage
+                drain_w = load_w + full_wh * chemistry.self_discharge_per_month / (30 * 24)
+                runtimes.append(full_wh * chemistry.usable_fraction / drain_w)
+    return runtimes
+
+
+def run_benchmark(components, step_s, configs, capacities, repeat, seed=0):
+    import numpy as np
+
+    from agent.tools.power_simulation import (
+        BATTERY_CHEMISTRIES,
+        ComponentLoad,
+        simulate_power,
+        sweep_batteries,
+    )
+
+    rng = random.Random(seed)
+    loads = [
+        ComponentLoad(
+            name=f"component-{i}",
+            voltage=rng.choice([1.8, 3.3, 5.0, 12.0]),
+            active_ma=rng.uniform(1, 250),
+            sleep_ma=rng.uniform(0.001, 0.1),
+            active_s=rng.uniform(0.01, 5),
+            period_s=rng.choice([10, 60, 300, 600, 3600]),
+            offset_s=rng.uniform(0, 60),
+        )
+        for i in range(components)
+    ]
+    profile, simulation = _time(lambda: simulate_power(loads, step_s=step_s), repeat)
+
+    loads_w = np.array([rng.uniform(0.0005, 0.5) for _ in range(configs)])
+    capacity_grid = np.linspace(100, 20000, capacities)
+    runtime, vectorized = _time(
+        lambda: sweep_batteries(loads_w, capacity_grid, BATTERY_CHEMISTRIES), repeat
+    )
+    reference, loop = _time(
+        lambda: reference_sweep(loads_w.tolist(), capacity_grid.tolist(), BATTERY_CHEMISTRIES),
+        max(1, repeat // 10),
+    )
+
+    return {
+        "components": components,
+        "grid_steps": int(profile.power_w.size),
+        "simulate_power": simulation,
+        "average_power_W": round(profile.average_w, 6),
+        "candidates": int(runtime.size),
+        "vectorized_sweep": vectorized,
+        "python_loop_sweep": loop,
+        "runtimes_match": bool(np.allclose(runtime.ravel(), reference)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duty-cycle power simulation benchmark")
+    parser.add_argument("--components", type=int, default=20, help="Simulated components")
+    parser.add_argument("--step", type=float, default=1.0, help="Time grid step in seconds")
+    parser.add_argument("--configs", type=int, default=2000, help="Load configurations swept")
+    parser.add_argument("--capacities", type=int, default=100, help="Battery capacities swept")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.components, args.step, args.configs, args.capacities, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["runtimes_match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Benchmark of retrieval quality and latency over the bundled assets/ corpus.
+
+Chunks the PDFs, embeds the chunks and the golden queries (benchmarks/fixtures/
+retrieval_golden.json) once per chunking, and compares Chroma's HNSW index against an exact
+brute-force search over the same embeddings:
+    - recall@k, hit rate@k and MRR against the golden relevance judgments
+    - ANN recall@k: overlap of the HNSW top k with the exact top k
+    - index build time and per-query latency percentiles
+
+Sweeps chunk size/overlap and the HNSW parameters M (max_neighbors), ef_construction and
+ef_search. The report carries a timestamp and the git revision so runs can be tracked over
+time (--json, or --history to append one line per run to a JSONL file).
+
+Usage:
+    uv run python benchmarks/retrieval_quality.py [--k 5] [--chunk-sizes 500 1000 1500]
+        [--overlaps 0 200] [--M 8 16 32] [--ef-construction 100] [--ef-search 10 100]
+        [--json out.json] [--history results/retrieval_history.jsonl]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+DEFAULT_GOLDEN = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "retrieval_golden.json")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _latency(values):
+    return {
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(values) * 1000, 3),
+    }
+
+
+def _normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_corpus(assets_dir):
+    from rag.parser import extract_text_from_pdf
+
+    corpus = {}
+    for file in sorted(os.listdir(assets_dir)):
+        if file.endswith(".pdf"):
+            text = extract_text_from_pdf(os.path.join(assets_dir, file))
+            if text:
+                corpus[file] = text
+    return corpus
+
+
+def judge(chunks, golden):
+    """Indices of the chunks relevant to each golden query"""
+    normalized = [_normalize(chunk.text) for chunk in chunks]
+    relevant = []
+    for entry in golden:
+        phrases = [(r["source_file"], _normalize(r["contains"])) for r in entry["relevant"]]
+        relevant.append(
+            {
+                i
+                for i, chunk in enumerate(chunks)
+                if any(
+                    chunk.source_file == source and phrase in normalized[i]
+                    for source, phrase in phrases
+                )
+            }
+        )
+    return relevant
+
+
+def exact_search(chunk_embeddings, query_embedding, k):
+    """Top k chunk indices by squared L2 distance (Chroma's default space)"""
+    import numpy as np
+
+    distances = ((chunk_embeddings - query_embedding) ** 2).sum(axis=1)
+    top = np.argpartition(distances, min(k, len(distances) - 1))[:k]
+    return top[np.argsort(distances[top])].tolist()
+
+
+def quality(rankings, relevant, k):
+    """recall@k, hit rate@k and MRR over the queries that have relevant chunks"""
+    recalls, hits, reciprocal_ranks = [], [], []
+    for ranking, targets in zip(rankings, relevant):
+        if not targets:
+            continue
+        top = ranking[:k]
+        found = [i for i in top if i in targets]
+        # Normalized by min(k, |relevant|) so a perfect top k scores 1 even when many
+        # overlapping chunks contain the passage
+        recalls.append(len(found) / min(k, len(targets)))
+        hits.append(1.0 if found else 0.0)
+        rank = next((position for position, i in enumerate(top, 1) if i in targets), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    return {
+        f"recall_at_{k}": round(statistics.mean(recalls), 4) if recalls else None,
+        f"hit_rate_at_{k}": round(statistics.mean(hits), 4) if hits else None,
+        "mrr": round(statistics.mean(reciprocal_ranks), 4) if reciprocal_ranks else None,
+    }
+
+
+def ann_recall(rankings, exact_rankings, k):
+    overlaps = [
+        len(set(ranking[:k]) & set(exact[:k])) / max(1, len(exact[:k]))
+        for ranking, exact in zip(rankings, exact_rankings)
+    ]
+    return round(statistics.mean(overlaps), 4)
+
+
+def _timed_queries(search, query_embeddings, repeat):
+    rankings, times = [], []
+    for _ in range(repeat):
+        rankings = []
+        for query_embedding in query_embeddings:
+            start = time.perf_counter()
+            rankings.append(search(query_embedding))
+            times.append(time.perf_counter() - start)
+    return rankings, _latency(times)
+
+
+def build_index(client, name, embeddings, neighbors, ef_construction, ef_search):
+    """Chroma collection over precomputed embeddings; returns (collection, build seconds)"""
+    collection = client.create_collection(
+        name,
+        embedding_function=None,
+        configuration={
+            "hnsw": {
+                "space": "l2",
+                "max_neighbors": neighbors,
+                "ef_construction": ef_construction,
+                "ef_search": ef_search,
+            }
+        },
+    )
+    batch_size = client.get_max_batch_size()
+    start = time.perf_counter()
+    for i in range(0, len(embeddings), batch_size):
+        batch = embeddings[i : i + batch_size]
+        collection.add(ids=[str(i + j) for j in range(len(batch))], embeddings=batch)
+    return collection, time.perf_counter() - start
+
+
+def run_benchmark(
+    golden_path, k, chunk_sizes, overlaps, neighbor_counts, ef_constructions, ef_searches, repeat
+):
+    import chromadb
+    import numpy as np
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    from rag.parser import get_text_chunks
+
+    with open(golden_path, "r", encoding="utf-8") as f:
+        golden = json.load(f)["queries"]
+    queries = [entry["query"] for entry in golden]
+
+    corpus = load_corpus(ASSETS_DIR)
+    embedding_function = DefaultEmbeddingFunction()
+    query_embeddings = np.asarray(embedding_function(queries), dtype=np.float32)
+    client = chromadb.EphemeralClient()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "k": k,
+        "corpus": {"files": len(corpus), "characters": sum(map(len, corpus.values()))},
+        "queries": len(queries),
+        "chunkings": [],
+    }
+
+    for chunk_size in chunk_sizes:
+        for chunk_overlap in overlaps:
+            if chunk_overlap >= chunk_size:
+                continue
+            chunks = [
+                chunk
+                for file, text in corpus.items()
+                for chunk in get_text_chunks(text, file, chunk_size, chunk_overlap)
+            ]
+            relevant = judge(chunks, golden)
+
+            start = time.perf_counter()
+            chunk_embeddings = np.asarray(
+                embedding_function([chunk.text for chunk in chunks]), dtype=np.float32
+            )
+            embed_s = time.perf_counter() - start
+
+            exact_rankings, exact_latency = _timed_queries(
+                lambda q: exact_search(chunk_embeddings, q, k), query_embeddings, repeat
+            )
+            chunking = {
+                "chunk_size": chunk_size,
+                "chunk_overlap": chunk_overlap,
+                "chunks": len(chunks),
+                "unjudged_queries": [q for q, r in zip(queries, relevant) if not r],
+                "embed_s": round(embed_s, 3),
+                "embed_chunks_per_s": round(len(chunks) / embed_s, 1),
+                "exact": {"latency": exact_latency, **quality(exact_rankings, relevant, k)},
+                "hnsw": [],
+            }
+
+            for neighbors in neighbor_counts:
+                for ef_construction in ef_constructions:
+                    for ef_search in ef_searches:
+                        name = (
+                            f"bench-{chunk_size}-{chunk_overlap}-{neighbors}"
+                            f"-{ef_construction}-{ef_search}"
+                        )
+                        collection, build_s = build_index(
+                            client, name, chunk_embeddings, neighbors, ef_construction, ef_search
+                        )
+
+                        def search(query_embedding):
+                            ids = collection.query(
+                                query_embeddings=[query_embedding], n_results=k, include=[]
+                            )["ids"][0]
+                            return [int(i) for i in ids]
+
+                        rankings, latency = _timed_queries(search, query_embeddings, repeat)
+                        client.delete_collection(name)
+                        chunking["hnsw"].append(
+                            {
+                                "M": neighbors,
+                                "ef_construction": ef_construction,
+                                "ef_search": ef_search,
+                                "build_s": round(build_s, 3),
+                                "latency": latency,
+                                **quality(rankings, relevant, k),
+                                f"ann_recall_at_{k}": ann_recall(rankings, exact_rankings, k),
+                            }
+                        )
+            report["chunkings"].append(chunking)
+
+    report["judged"] = not any(c["unjudged_queries"] for c in report["chunkings"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval quality and latency benchmark")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN, help="Golden query set (JSON)")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[500, 1000, 1500])
+    parser.add_argument("--overlaps", type=int, nargs="+", default=[0, 200])
+    parser.add_argument("--M", type=int, nargs="+", default=[8, 16, 32], help="max_neighbors")
+    parser.add_argument("--ef-construction", type=int, nargs="+", default=[100])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the queries")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    parser.add_argument("--history", help="Append the report as one line to this JSONL file")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.golden,
+        args.k,
+        args.chunk_sizes,
+        args.overlaps,
+        args.M,
+        args.ef_construction,
+        args.ef_search,
+        args.repeat,
+    )
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+    # Every golden query must have a relevant chunk, or its scores would silently drop out
+    return 0 if report["judged"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
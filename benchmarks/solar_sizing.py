@@ -0,0 +1,96 @@
+"""
+Benchmark of solar panel and battery sizing.
+
+Simulates a year of the bundled hourly irradiance profile for a grid of panel sizes x
+battery sizes and times:
+    - agent.tools.solar_sizing.simulate_solar, the day-composed array simulation
+    - stepping all candidates hour by hour (8760 vectorized steps), as a reference
+
+Usage:
+    uv run python benchmarks/solar_sizing.py [--panels 12] [--batteries 13] [--load 0.3]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    ordered = sorted(times)
+    return result, {
+        "p50_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 3),
+    }
+
+
+def hourly_simulation(load_w, irradiance, panels, batteries):
+    import numpy as np
+
+    from agent.tools.solar_sizing import BATTERY_USABLE_FRACTION, HARVEST_EFFICIENCY
+
+    capacity = batteries * BATTERY_USABLE_FRACTION
+    harvest = irradiance[:, None] / 1000 * HARVEST_EFFICIENCY * panels[None, :] - load_w
+    charge = np.tile(capacity, (len(panels), 1))
+    empty = np.zeros((len(irradiance) // 24, len(panels), len(batteries)), dtype=bool)
+    for hour in range(len(irradiance)):
+        charge += harvest[hour][:, None]
+        empty[hour // 24] |= charge < -1e-9
+        np.clip(charge, 0, capacity, out=charge)
+    return empty.sum(axis=0)
+
+
+def run_benchmark(panel_count, battery_count, load_w, repeat):
+    import numpy as np
+
+    from agent.tools.solar_sizing import load_irradiance, simulate_solar, size_solar
+
+    irradiance = load_irradiance()
+    panels = np.geomspace(0.5, 100, panel_count)
+    batteries = np.geomspace(2, 500, battery_count)
+
+    simulation, composed = _time(
+        lambda: simulate_solar(load_w, irradiance, panels, batteries), repeat
+    )
+    reference, stepped = _time(
+        lambda: hourly_simulation(load_w, irradiance, panels, batteries), max(1, repeat // 10)
+    )
+    sized, sizing = _time(lambda: size_solar(load_w, irradiance, panels, batteries), repeat)
+
+    return {
+        "hours": int(len(irradiance)),
+        "candidates": panel_count * battery_count,
+        "day_composed_simulation": composed,
+        "hourly_stepped_simulation": stepped,
+        "size_solar": sizing,
+        "downtime_matches": bool((simulation.downtime_days == reference).all()),
+        "sized": sized,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solar sizing benchmark")
+    parser.add_argument("--panels", type=int, default=12, help="Panel sizes in the grid")
+    parser.add_argument("--batteries", type=int, default=13, help="Battery sizes in the grid")
+    parser.add_argument("--load", type=float, default=0.3, help="Constant load in W")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.panels, args.batteries, args.load, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["downtime_matches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Startup-time benchmark for the CLI entry points, built on `python -X importtime`.
+
+Exits non-zero when any entry point exceeds its import-time budget or imports a heavy
+dependency that should only load on the code path that needs it.
+
+Usage:
+    uv run python benchmarks/startup_time.py [--repeat 5] [--scale 1.0] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Module -> import-time budget in milliseconds (median of several cold runs)
+BUDGETS_MS = {
+    "rag.cli": 200,
+    "agent.cli": 200,
+    "agent.client": 200,
+    "agent.server": 200,
+    "evaluation": 200,
+}
+
+# Heavy dependencies that none of the entry points above may import eagerly
+HEAVY_MODULES = [
+    "chromadb",
+    "pymupdf",
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+    "langchain_text_splitters",
+    "dotenv",
+    "phoenix",
+]
+
+
+def measure_import(module: str):
+    """Import module in a fresh interpreter and return (total_ms, imported top-level modules)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+
+    total_us = 0
+    imported = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported.add(name.strip().split(".")[0])
+        # Nested imports are indented; only top-level entries add to the total
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, imported
+
+
+def run_benchmark(repeat=5, scale=1.0):
+    """Measure every entry point and compare against its budget"""
+    report = {}
+    for module, budget_ms in BUDGETS_MS.items():
+        timings = []
+        imported = set()
+        for _ in range(repeat):
+            total_ms, imported = measure_import(module)
+            timings.append(total_ms)
+        median_ms = statistics.median(timings)
+        heavy = sorted(set(HEAVY_MODULES) & imported)
+        report[module] = {
+            "median_ms": round(median_ms, 2),
+            "min_ms": round(min(timings), 2),
+            "budget_ms": budget_ms * scale,
+            "heavy_imports": heavy,
+            "passed": median_ms <= budget_ms * scale and not heavy,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every budget (e.g. for slow CI hosts)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.repeat, args.scale)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for module, result in report.items():
+            status = "✅" if result["passed"] else "❌"
+            print(
+                f"{status} {module:<14} {result['median_ms']:>8.1f} ms "
+                f"(budget {result['budget_ms']:.0f} ms)"
+            )
+            if result["heavy_imports"]:
+                print(f"   ⚠️ Eagerly imports: {', '.join(result['heavy_imports'])}")
+
+    return 0 if all(result["passed"] for result in report.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Token-size comparison of agent tool outputs in "pretty" vs "compact" encoding.
+
+Every tool output is sent back to the LLM on each later turn, so its token count multiplies
+input cost. Counts use tiktoken's cl100k_base when it is installed and otherwise a
+word-piece approximation; absolute numbers differ from Gemini's tokenizer but the relative
+savings carry over.
+
+Usage:
+    uv run python benchmarks/tool_output_tokens.py [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+SAMPLE_CALLS = [
+    ("research_tool", {"query": "soil moisture sensors for agriculture", "max_results": 5}),
+    (
+        "iot_blueprint_generator",
+        {"user_request": "Battery powered wifi greenhouse temperature monitor, outdoor"},
+    ),
+    (
+        "component_sourcing_tool",
+        {
+            "component_types": "ESP32-WROOM-32, DHT22 Temperature & Humidity Sensor, "
+            "SEN0193 Soil Moisture, Songle SRD-05VDC-SL-C Relay, Lithium Ion Battery Pack, "
+            "IP65 Weatherproof Enclosure"
+        },
+    ),
+    (
+        "power_battery_estimator",
+        {
+            "components_json": json.dumps({
+                "ESP32-WROOM-32": {"voltage": 3.3, "mA": 120},
+                "DHT22": {"voltage": 3.3, "mA": 1.5},
+                "SEN0193": {"voltage": 3.3, "mA": 5},
+            })
+        },
+    ),
+]
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken if available, else approximate BPE word pieces"""
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except ImportError:
+        # Newline-plus-indent runs are one token each, as in BPE vocabularies
+        pieces = re.findall(r"\w+|[^\w\s]|\n\s*", text)
+        # Long words split into several BPE pieces, roughly one per 4 characters
+        return sum(max(1, -(-len(piece) // 4)) for piece in pieces)
+
+
+def load_tools():
+    from agent.tools.component_sourcing_tool import component_sourcing_tool
+    from agent.tools.iot_blueprint_generator import iot_blueprint_generator
+    from agent.tools.power_battery_estimator import power_battery_estimator
+    from agent.tools.research_tool import research_tool
+
+    tools = [
+        research_tool,
+        iot_blueprint_generator,
+        component_sourcing_tool,
+        power_battery_estimator,
+    ]
+    return {t.name: t for t in tools}
+
+
+def run_benchmark():
+    tools = load_tools()
+    previous_format = os.environ.get("IOT_TOOL_OUTPUT_FORMAT")
+    report = {}
+    try:
+        for tool_name, args in SAMPLE_CALLS:
+            sizes = {}
+            for output_format in ("pretty", "compact"):
+                os.environ["IOT_TOOL_OUTPUT_FORMAT"] = output_format
+                output = tools[tool_name].invoke(args)
+                sizes[output_format] = {"chars": len(output), "tokens": count_tokens(output)}
+            saved = sizes["pretty"]["tokens"] - sizes["compact"]["tokens"]
+            report[tool_name] = {
+                **sizes,
+                "tokens_saved": saved,
+                "savings_pct": round(100 * saved / max(sizes["pretty"]["tokens"], 1), 1),
+            }
+    finally:
+        if previous_format is None:
+            os.environ.pop("IOT_TOOL_OUTPUT_FORMAT", None)
+        else:
+            os.environ["IOT_TOOL_OUTPUT_FORMAT"] = previous_format
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tool output token counts")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark()
+
+    print(f"{'tool':<26} {'pretty':>8} {'compact':>8} {'saved':>8}")
+    for tool_name, result in report.items():
+        print(
+            f"{tool_name:<26} {result['pretty']['tokens']:>8} {result['compact']['tokens']:>8} "
+            f"{result['savings_pct']:>7.1f}%"
+        )
+    total_pretty = sum(r["pretty"]["tokens"] for r in report.values())
+    total_compact = sum(r["compact"]["tokens"] for r in report.values())
+    print(f"{'total':<26} {total_pretty:>8} {total_compact:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
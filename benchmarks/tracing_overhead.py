@@ -0,0 +1,105 @@
+"""
+Benchmark of the agent pipeline's tracing overhead.
+
+Runs benchmarks/agent_pipeline.py once per tracing setting, each in a fresh interpreter
+(LangChain instrumentation can't be undone in-process), and compares per-run latency with
+tracing off. A setting is a mode with an optional sample rate: "off", "jsonl", "jsonl:0.1"
+or "otlp:0.5" ("otlp" needs a collector listening on IOT_TRACING_ENDPOINT). JSONL traces go
+to a temporary file, and the number of exported spans is reported.
+
+Usage:
+    uv run python benchmarks/tracing_overhead.py [--settings off jsonl jsonl:0.1] [--runs 20]
+        [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PIPELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agent_pipeline.py")
+
+
+def run_setting(setting, runs, llm_delay, directory):
+    mode, _, sample_rate = setting.partition(":")
+    traces_file = os.path.join(directory, f"{setting.replace(':', '_')}.jsonl")
+    report_file = os.path.join(directory, f"{setting.replace(':', '_')}.json")
+    env = {
+        **os.environ,
+        "IOT_TRACING": mode,
+        "IOT_TRACING_SAMPLE_RATE": sample_rate or "1",
+        "IOT_TRACING_FILE": traces_file,
+    }
+    subprocess.run(
+        [
+            sys.executable,
+            PIPELINE,
+            "--runs",
+            str(runs),
+            "--llm-delay",
+            str(llm_delay),
+            "--json",
+            report_file,
+        ],
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    with open(report_file, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    spans = None
+    if mode == "jsonl":
+        spans = 0
+        if os.path.exists(traces_file):
+            with open(traces_file, "r", encoding="utf-8") as f:
+                spans = sum(1 for _ in f)
+    return {"setting": setting, "spans_exported": spans, "phases": report["phases"]}
+
+
+def run_benchmark(settings, runs, llm_delay):
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run_setting(setting, runs, llm_delay, directory) for setting in settings]
+
+    baseline = next((r for r in results if r["setting"] == "off"), None)
+    for result in results:
+        if baseline is None or result is baseline:
+            continue
+        for phase in ("total", "framework_overhead"):
+            before = baseline["phases"][phase]["p50_ms"]
+            after = result["phases"][phase]["p50_ms"]
+            result[f"{phase}_p50_overhead_ms"] = round(after - before, 3)
+        result["total_p50_overhead_pct"] = round(
+            100 * result["total_p50_overhead_ms"] / baseline["phases"]["total"]["p50_ms"], 2
+        )
+    return {"runs": runs, "llm_delay_s": llm_delay, "settings": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent pipeline tracing overhead benchmark")
+    parser.add_argument(
+        "--settings",
+        nargs="+",
+        default=["off", "jsonl", "jsonl:0.1"],
+        help="Tracing settings to compare (mode[:sample rate])",
+    )
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs per setting")
+    parser.add_argument(
+        "--llm-delay", type=float, default=0.0, help="Simulated seconds per LLM turn"
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.settings, args.runs, args.llm_delay)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark of vendor lookups against local mock vendor APIs.
+
+Starts one mock vendor server per bundled inventory (agent.inventory.mock_vendor_server)
+with simulated latency, then times component lookups with:
+    - sequential requests on a new connection per vendor per lookup
+    - concurrent requests over pooled keep-alive connections (HTTPVendorBackend)
+    - the same with one vendor slower than its timeout, which should return the other
+      vendors' offers once the timeout expires
+
+Usage:
+    uv run python benchmarks/vendor_fanout.py [--lookups 50] [--latency 0.05] [--json out.json]
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+COMPONENTS = ["ESP32-WROOM-32", "DHT-22", "ESP32 Mini DevKit", "SSD1306 OLED Display"]
+
+
+def _percentiles(values):
+    ordered = sorted(values)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]  # noqa: E731
+    return {
+        "p50_ms": round(pick(50) * 1000, 2),
+        "p95_ms": round(pick(95) * 1000, 2),
+        "mean_ms": round(statistics.mean(values) * 1000, 2),
+    }
+
+
+def _sequential_fresh_lookup(servers):
+    body = json.dumps({"components": COMPONENTS})
+    for server in servers:
+        parts = urlsplit(server.url)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+        connection.request("POST", "/offers", body=body, headers={"Connection": "close"})
+        json.loads(connection.getresponse().read())
+        connection.close()
+
+
+def _connections(servers):
+    return sum(server.connection_count for server in servers)
+
+
+def _run(servers, lookup, lookups):
+    connections_before = _connections(servers)
+    times = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        lookup()
+        times.append(time.perf_counter() - start)
+    return {**_percentiles(times), "connections_opened": _connections(servers) - connections_before}
+
+
+def _stop(servers):
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def run_benchmark(lookups, latency, slow_latency, timeout):
+    from agent.inventory.backends import HTTPVendorBackend
+    from agent.inventory.mock_vendor_server import start_mock_vendors
+    from agent.tools.component_sourcing_tool import find_component_offers
+
+    servers = start_mock_vendors({vendor: latency for vendor in ("Digi-Key", "AliExpress")})
+    try:
+        backends = [HTTPVendorBackend(s.vendor, s.url, timeout=timeout) for s in servers]
+        report = {
+            "lookups": lookups,
+            "vendors": len(servers),
+            "vendor_latency_s": latency,
+            "sequential_new_connections": _run(
+                servers, lambda: _sequential_fresh_lookup(servers), lookups
+            ),
+            "concurrent_pooled": _run(
+                servers, lambda: find_component_offers(COMPONENTS, backends=backends), lookups
+            ),
+        }
+    finally:
+        _stop(servers)
+
+    servers = start_mock_vendors({"Digi-Key": latency, "AliExpress": slow_latency})
+    try:
+        backends = [HTTPVendorBackend(s.vendor, s.url, timeout=timeout) for s in servers]
+        partial = []
+        slow_lookups = max(1, lookups // 10)
+
+        def slow_lookup():
+            results = find_component_offers(COMPONENTS, backends=backends)
+            partial.append(bool(results.get("vendor_errors")) and bool(results["ESP32-WROOM-32"]))
+
+        report["slow_vendor"] = {
+            "slow_vendor_latency_s": slow_latency,
+            "timeout_s": timeout,
+            **_run(servers, slow_lookup, slow_lookups),
+            "partial_result_rate": round(sum(partial) / len(partial), 4),
+        }
+    finally:
+        _stop(servers)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vendor backend fan-out benchmark")
+    parser.add_argument("--lookups", type=int, default=50, help="Lookups per scenario")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock vendor latency (s)")
+    parser.add_argument(
+        "--slow-latency", type=float, default=2.0, help="Latency of the slow vendor (s)"
+    )
+    parser.add_argument("--timeout", type=float, default=0.5, help="Per-vendor timeout (s)")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.lookups, args.latency, args.slow_latency, args.timeout)
+    print(json.dumps(report, indent=2))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
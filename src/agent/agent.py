@@ -1,17 +1,29 @@
+import copy
 import os
 import re
+import time
 from datetime import datetime
 from langchain_core.messages import HumanMessage, AIMessage
 from evaluation.evaluation_tracker import EvaluationTracker, EvaluationCallbackHandler
 from evaluation.evaluation_utils import save_evaluation_results, display_performance_summary
+from rag.budget import budget_scope, current_budget, get_default_budget
+from rag.single_flight import SingleFlight, coalescing_enabled
 
 
 from .iot_planner import build_iot_planner
+from .tools.research_prefetch import (
+    ResearchPrefetcher,
+    activate_prefetcher,
+    deactivate_prefetcher,
+    prefetch_enabled,
+)
 
 
-def run_agent(query: str):
+def run_agent(query: str, memory_profile=False, budget_s=None, max_turns=None):
     agent = build_iot_planner()
-    response, evaluation_summary = process_query(agent, query)
+    response, evaluation_summary = process_query(
+        agent, query, memory_profile=memory_profile, budget_s=budget_s, max_turns=max_turns
+    )
 
     print(f"\n🤖 IoT Planner Response:")
     print(response)
@@ -23,14 +35,99 @@ def run_agent(query: str):
     display_performance_summary(evaluation_summary)
 
 
-def process_query(agent, query) -> str:
-    """Process a single query with the agent and return the response and evaluation metrics"""
-    tracker = EvaluationTracker()
+# Identical planner requests running at the same time share one agent run
+_planner_requests = SingleFlight("process_query")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase with whitespace collapsed and trailing punctuation dropped"""
+    return " ".join(query.lower().split()).rstrip(" ?!.")
+
+
+def _has_research_tool(agent) -> bool:
+    tools_node = getattr(agent, "nodes", {}).get("tools")
+    return "research_tool" in getattr(getattr(tools_node, "bound", None), "tools_by_name", {})
+
+
+def process_query(
+    agent,
+    query,
+    memory_profile=False,
+    prefetch=None,
+    coalesce=None,
+    budget_s=None,
+    max_turns=None,
+) -> str:
+    """
+    Process a single query with the agent and return the response and evaluation metrics
+
+    Args:
+        budget_s (float): Seconds the request may take, propagated to every tool and
+            retrieval call (see rag.budget); defaults to IOT_REQUEST_BUDGET_S (no deadline).
+        max_turns (int): Most LLM turns before a final answer is forced; defaults to
+            IOT_MAX_AGENT_TURNS.
+        prefetch (bool): Start retrieval on the query while the first LLM turn runs (see
+            research_prefetch); defaults to IOT_RESEARCH_PREFETCH.
+        coalesce (bool): Share the run of an identical (normalized) query already in flight
+            on the same agent instead of starting another; defaults to IOT_COALESCE. Shared
+            responses are marked under "coalescing" in the evaluation summary. A caller
+            waits on the other run only until its own deadline (budget_s, or that of an
+            enclosing budget_scope), then runs the query itself.
+    """
+    budget = get_default_budget(budget_s, max_turns)
+    if not (coalescing_enabled() if coalesce is None else coalesce):
+        return _process_query(agent, query, memory_profile, prefetch, budget)
+
+    # Only requests with the same budget share a run
+    key = (
+        id(agent),
+        normalize_query(query),
+        memory_profile,
+        prefetch,
+        budget.budget_s,
+        budget.max_turns,
+    )
+    deadlines = [b for b in (budget, current_budget()) if b is not None and b.deadline]
+    wait_s = min((b.remaining() for b in deadlines), default=None)
+
+    def run():
+        return _process_query(agent, query, memory_profile, prefetch, budget)
+
+    started = time.perf_counter()
+    try:
+        (response, evaluation_summary), shared = _planner_requests.do(key, run, timeout=wait_s)
+    except TimeoutError:
+        # The identical run outlasted this caller's deadline
+        return run()
+    if shared:
+        evaluation_summary = copy.deepcopy(evaluation_summary)
+        evaluation_summary["coalescing"] = {
+            **evaluation_summary.get("coalescing", {}),
+            "served_by_coalescing": True,
+            "waited_seconds": round(time.perf_counter() - started, 3),
+        }
+    return response, evaluation_summary
+
+
+def _process_query(agent, query, memory_profile, prefetch, budget):
+    # Tools and retrievals (including prefetch) see the budget through the context
+    with budget_scope(budget):
+        return _run_query(agent, query, memory_profile, prefetch, budget)
+
+
+def _run_query(agent, query, memory_profile, prefetch, budget):
+    tracker = EvaluationTracker(memory_profile=memory_profile)
     tracker.start_tracking()
 
     callback_handler = EvaluationCallbackHandler(tracker)
 
+    prefetcher = prefetcher_token = None
     try:
+        if (prefetch_enabled() if prefetch is None else prefetch) and _has_research_tool(agent):
+            prefetcher = ResearchPrefetcher()
+            prefetcher_token = activate_prefetcher(prefetcher)
+            prefetcher.start(query)
+
         print("🔍 Searching IoT research database...")
 
         response = agent.invoke(
@@ -56,16 +153,19 @@ def process_query(agent, query) -> str:
                     else:
                         text_response = str(content)
 
-                    # Extract token usage metadata from AIMessage if available
-                    if isinstance(last_message, AIMessage) and hasattr(last_message, "usage_metadata"):
+                    # Tokens are counted per LLM turn by the callback handler; only fall
+                    # back to the final message's usage if no turn was reported
+                    if (
+                        not tracker.metrics["llm_turns"]
+                        and isinstance(last_message, AIMessage)
+                        and getattr(last_message, "usage_metadata", None)
+                    ):
                         usage_metadata = last_message.usage_metadata
-                        if usage_metadata:
-                            tracker.metrics["tokens_used"]["input_tokens"] = (
-                                usage_metadata.get("input_tokens", 0)
-                            )
-                            tracker.metrics["tokens_used"]["output_tokens"] = (
-                                usage_metadata.get("output_tokens", 0)
-                            )
+                        tracker.track_llm_turn(
+                            last_message.response_metadata.get("model_name"),
+                            usage_metadata.get("input_tokens", 0),
+                            usage_metadata.get("output_tokens", 0),
+                        )
                 else:
                     text_response = str(last_message)
             else:
@@ -73,20 +173,27 @@ def process_query(agent, query) -> str:
         else:
             text_response = str(response)
 
-        tracker.metrics["tokens_used"]["total_tokens"] = (
-            tracker.metrics["tokens_used"]["input_tokens"]
-            + tracker.metrics["tokens_used"]["output_tokens"]
-        )
+        _finish_run(tracker, prefetcher, prefetcher_token, budget)
         tracker.end_tracking()
 
         return text_response, tracker.get_summary()
     except Exception as e:
         tracker.track_error(e)
+        _finish_run(tracker, prefetcher, prefetcher_token, budget)
         tracker.end_tracking()
         error_response = f"❌ Error processing query: {e}"
         return error_response, tracker.get_summary()
 
 
+def _finish_run(tracker, prefetcher, token, budget):
+    tracker.track_budget(budget.stats())
+    if prefetcher is None:
+        return
+    deactivate_prefetcher(token)
+    prefetcher.close()
+    tracker.track_prefetch(prefetcher.stats())
+
+
 def save_response_to_markdown(query: str, response):
     """Save the agent response to a markdown file in the temp directory"""
     try:
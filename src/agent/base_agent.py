@@ -1,45 +1,66 @@
-import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.agents import create_agent
-from dotenv import load_dotenv
+from .llm_provider import create_chat_model, create_tool_model
 
 
-load_dotenv()
+def create_iot_agent(tools, llm=None, tool_llm=None, routing=None):
+    """
+    Initialize the IoT Planner Agent
 
+    Args:
+        tools: Tools available to the agent.
+        llm: Chat model to use; defaults to the provider selected by IOT_LLM_PROVIDER.
+        tool_llm: Cheaper chat model for tool-calling turns. Defaults to the provider's tool
+            tier when llm is not given either; with only llm given, every turn uses llm.
+        routing (str): "single" or "tiered" (see model_routing); defaults to
+            IOT_MODEL_ROUTING, which defaults to "single".
+    """
+    from langchain.agents import create_agent
 
-def create_iot_agent(tools):
-    """Initialize the IoT Planner Agent"""
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0,
-        google_api_key=os.getenv("GEMINI_API_KEY"),
-        max_output_tokens=2048,
-        top_p=0.95,
-        top_k=40,
-    )
-
-    system_prompt = """You are a research-powered IoT planning assistant.
+    from .model_routing import ModelRoutingMiddleware, get_routing_policy
+    from .turn_budget import TurnBudgetMiddleware
 
-IMPORTANT RULES:
-- Provide a single focused, well-structured answer based on the user's request
-- ALWAYS search the research database before answering any IoT question
-- ALWAYS use the Blueprint Generator tool as a starting point before recommending any components
-- Use the Power Battery Estimator tool to validate power requirements for your recommended components rather than guessing
-- Use specific technical terms in your searches (e.g., "proximity sensors", "automatic door systems", "ultrasonic detection")
-- Base ALL technical advice on the results returned by the tools
-- If research is insufficient, acknowledge the limitation but still provide practical guidance
-- Cite research sources when making recommendations
-- You MUST ensure that you understand component sourcing and power estimation before responding to the user
-- You MUST stop calling tools once you have enough information to answer the user's query
-- Avoid unnecessary tool calls to minimize latency
+    routing = routing or get_routing_policy()
+    if llm is None:
+        llm = create_chat_model()
+        if routing == "tiered" and tool_llm is None:
+            tool_llm = create_tool_model()
+    # Outermost first: the turn cap decides whether a turn may still call tools
+    middleware = [TurnBudgetMiddleware()]
+    if routing == "tiered" and tool_llm is not None:
+        middleware.append(ModelRoutingMiddleware(tool_llm, llm))
 
-OUTPUT FORMATTING:
-- Target response length: 500-800 tokens
-- Use BULLET LISTS instead of tables for component recommendations
-- Avoid padding, excessive whitespace, or filler content
-- STOP generating immediately after completing your answer
-- Be concise while remaining helpful and accurate
-"""
+    system_prompt = (
+        "You are a research-powered IoT planning assistant.\n"
+        "\n"
+        "IMPORTANT RULES:\n"
+        "- Provide a single focused, well-structured answer based on the user's request\n"
+        "- ALWAYS search the research database before answering any IoT question\n"
+        "- ALWAYS use the Design Pipeline tool as a starting point before recommending any "
+        "components; it runs the Blueprint Generator, Component Sourcing and Power Battery "
+        "Estimator in one call\n"
+        "- Only call the Blueprint Generator, Component Sourcing or Power Battery Estimator "
+        "tools directly to refine a design (e.g. swap a component and re-estimate power) rather "
+        "than guessing\n"
+        "- Use the BOM Quoting tool to price component lists with quantities or build sizes "
+        "instead of comparing vendor offers yourself\n"
+        '- Use specific technical terms in your searches (e.g., "proximity sensors", "automatic '
+        'door systems", "ultrasonic detection")\n'
+        "- Base ALL technical advice on the results returned by the tools\n"
+        "- If research is insufficient, acknowledge the limitation but still provide practical "
+        "guidance\n"
+        "- Cite research sources when making recommendations\n"
+        "- You MUST ensure that you understand component sourcing and power estimation before "
+        "responding to the user\n"
+        "- You MUST stop calling tools once you have enough information to answer the user's "
+        "query\n"
+        "- Avoid unnecessary tool calls to minimize latency\n"
+        "\n"
+        "OUTPUT FORMATTING:\n"
+        "- Target response length: 500-800 tokens\n"
+        "- Use BULLET LISTS instead of tables for component recommendations\n"
+        "- Avoid padding, excessive whitespace, or filler content\n"
+        "- STOP generating immediately after completing your answer\n"
+        "- Be concise while remaining helpful and accurate\n"
+    )
 
-    agent = create_agent(llm, tools, system_prompt=system_prompt)
+    agent = create_agent(llm, tools, system_prompt=system_prompt, middleware=middleware)
     return agent
@@ -5,8 +5,6 @@ CLI for the IoT Planner Agent as a one-shot query processor
 import sys
 import argparse
 
-from agent.agent import run_agent
-
 
 def main():
     """Run the IoT Planner Agent as a one-shot query processor"""
@@ -14,6 +12,23 @@ def main():
         description="IoT Planner Agent - Research-powered IoT recommendations"
     )
     parser.add_argument("query", help="The IoT question or query to process")
+    parser.add_argument(
+        "--memprofile",
+        action="store_true",
+        help="Record peak RSS and allocations per phase (slower)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Latency budget in seconds; tools degrade and an answer is forced to meet it",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=None,
+        help="Most LLM turns before a final answer is forced (default 8)",
+    )
 
     args = parser.parse_args()
     query = args.query
@@ -32,7 +47,16 @@ def main():
             print("No query provided. Exiting...")
             return 1
 
-    run_agent(query)
+    from agent.agent import run_agent
+    from agent.tracer import shutdown_tracing
+
+    try:
+        run_agent(
+            query, memory_profile=args.memprofile, budget_s=args.budget, max_turns=args.max_turns
+        )
+    finally:
+        # Export the spans still queued for the last batch
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Thin CLI client for the IoT Planner server
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+DEFAULT_URL = os.getenv("IOT_PLANNER_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+
+
+def request_json(url, path, payload=None, timeout=600):
+    """Send a GET (no payload) or POST request and decode the JSON response"""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        url.rstrip("/") + path, data=data, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def main():
+    """Send a query to a running IoT Planner server"""
+    parser = argparse.ArgumentParser(description="IoT Planner Client - Query a running server")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Base URL of the planner server")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser("plan", help="Run the full IoT planner")
+    plan_parser.add_argument("query", help="The IoT question or query to process")
+    plan_parser.add_argument("--budget", type=float, help="Latency budget in seconds")
+    plan_parser.add_argument("--max-turns", type=int, help="Most LLM turns before answering")
+
+    rag_parser = subparsers.add_parser("rag", help="Query the research database directly")
+    rag_parser.add_argument("query", help="The query text to search for")
+    rag_parser.add_argument("--top_k", type=int, default=5, help="Number of results")
+
+    subparsers.add_parser("health", help="Check server health and readiness")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "health":
+            _, health = request_json(args.url, "/healthz")
+            status, ready = request_json(args.url, "/readyz")
+            print(f"Health: {health.get('status')} | Ready: {ready.get('status')}")
+            return 0 if status == 200 else 1
+
+        if args.command == "plan":
+            payload = {"query": args.query, "budget_s": args.budget, "max_turns": args.max_turns}
+            status, body = request_json(args.url, "/plan", payload)
+        else:
+            status, body = request_json(
+                args.url, "/rag", {"query": args.query, "top_k": args.top_k}
+            )
+    except urllib.error.URLError as e:
+        print(f"❌ Could not reach planner server at {args.url}: {e.reason}")
+        return 1
+
+    if status != 200:
+        print(f"❌ Server error ({status}): {body.get('error')}")
+        return 1
+
+    if args.command == "plan":
+        from evaluation.evaluation_utils import display_performance_summary
+
+        print("\n🤖 IoT Planner Response:")
+        print(body["response"])
+        display_performance_summary(body["evaluation_summary"])
+    else:
+        for result in body["results"]:
+            print(f"*** {result['metadata']['source_file']} ***")
+            print(result["document"])
+            print("-" * 40)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""
+Vendor backends for component sourcing.
+
+Every vendor answers the same question, "which offers do you have for these components?",
+through a VendorBackend. Local inventories go through CatalogBackend; live vendor APIs go
+through HTTPVendorBackend, which keeps pooled keep-alive connections. fetch_offers queries
+all backends concurrently and returns whatever arrived within each vendor's timeout. Each
+backend runs on its own few threads, so calls a slow vendor leaves behind can only tie up
+that vendor's threads, never another vendor's.
+
+Backends are configured with IOT_VENDOR_ENDPOINTS ("Digi-Key=http://host:port,...") and
+IOT_VENDOR_TIMEOUT_S; without endpoints, the process-wide local catalog is used.
+"""
+
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+DEFAULT_VENDOR_TIMEOUT_S = 2.0
+DEFAULT_VENDOR_CONCURRENCY = 4
+
+# A fuzzy match is used in place of an exact one only when it is both close to the query
+# and clearly ahead of the runner-up; otherwise the ranked suggestions are left to the LLM
+FUZZY_ACCEPT_SCORE = 0.4
+FUZZY_ACCEPT_MARGIN = 0.1
+
+
+class VendorBackend:
+    """Source of vendor offers; subclasses implement find_offers"""
+
+    name = "vendor"
+    timeout = DEFAULT_VENDOR_TIMEOUT_S
+    # Calls that may run at once; fetch_offers refuses more instead of queueing them
+    concurrency = DEFAULT_VENDOR_CONCURRENCY
+
+    def find_offers(self, component_list) -> dict:
+        """
+        Look up offers for each component.
+
+        Returns:
+            dict: {component name: [offer dicts]}, plus an optional "suggestions" entry of
+                {component name: [{"name", "score"}]} for names without an exact match.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CatalogBackend(VendorBackend):
+    """Backend over an in-process inventory (InventoryCatalog or SQLiteInventory)"""
+
+    def __init__(self, catalog, name="local", timeout=DEFAULT_VENDOR_TIMEOUT_S):
+        self.catalog = catalog
+        self.name = name
+        self.timeout = timeout
+
+    def find_offers(self, component_list) -> dict:
+        results = {}
+        suggestions = {}
+        for comp in component_list:
+            # Names are the common case; fall back to vendor part numbers
+            offers = self.catalog.find_by_name(comp) or self.catalog.find_by_part_number(comp)
+            if offers:
+                results[comp] = [offer.to_dict() for offer in offers]
+                continue
+
+            candidates = self.catalog.search(comp, limit=5, min_score=0.1)
+            suggestions[comp] = [{"name": name, "score": score} for name, score in candidates]
+            results[comp] = []
+            if candidates:
+                best_name, best_score = candidates[0]
+                runner_up = candidates[1][1] if len(candidates) > 1 else 0.0
+                if (
+                    best_score >= FUZZY_ACCEPT_SCORE
+                    and best_score - runner_up >= FUZZY_ACCEPT_MARGIN
+                ):
+                    results[comp] = [
+                        {**offer.to_dict(), "matched_name": best_name}
+                        for offer in self.catalog.find_by_name(best_name)
+                    ]
+
+        if suggestions:
+            results["suggestions"] = suggestions
+        return results
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections to one host"""
+
+    def __init__(self, base_url: str, size: int = 4, timeout: float = DEFAULT_VENDOR_TIMEOUT_S):
+        parts = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def request(self, method: str, path: str, body: bytes = None, headers=None):
+        """
+        Send a request on an idle connection (or a new one) and return (status, body bytes).
+        A request that fails on a reused connection is retried once on a fresh one, since the
+        server may have closed it while idle.
+        """
+        headers = {"Connection": "keep-alive", **(headers or {})}
+        for attempt in range(2):
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, data
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+            return connection, False
+
+    def _release(self, connection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HTTPVendorBackend(VendorBackend):
+    """
+    Backend for a vendor API that answers POST {base_url}/offers {"components": [...]}
+    with the find_offers result format
+    """
+
+    def __init__(self, name, base_url, timeout=DEFAULT_VENDOR_TIMEOUT_S, pool_size=4):
+        self.name = name
+        self.base_url = base_url
+        self.timeout = timeout
+        self.concurrency = pool_size
+        self.pool = ConnectionPool(base_url, size=pool_size, timeout=timeout)
+
+    def find_offers(self, component_list) -> dict:
+        body = json.dumps({"components": list(component_list)}).encode("utf-8")
+        status, data = self.pool.request(
+            "POST", "/offers", body=body, headers={"Content-Type": "application/json"}
+        )
+        if status != 200:
+            raise RuntimeError(f"{self.name} returned HTTP {status}")
+        return json.loads(data)
+
+    def close(self):
+        self.pool.close()
+
+
+# Per backend: its own thread pool and a slot per thread, reused across tool invocations
+_lanes = weakref.WeakKeyDictionary()
+_lanes_lock = threading.Lock()
+
+
+def _get_lane(backend: VendorBackend):
+    with _lanes_lock:
+        lane = _lanes.get(backend)
+        if lane is None:
+            executor = ThreadPoolExecutor(
+                max_workers=backend.concurrency, thread_name_prefix=f"vendor-{backend.name}"
+            )
+            lane = _lanes[backend] = (executor, threading.BoundedSemaphore(backend.concurrency))
+    return lane
+
+
+def _submit(backend: VendorBackend, component_list):
+    """Start find_offers on one of the backend's threads, or return None if all are busy"""
+    executor, slots = _get_lane(backend)
+    if not slots.acquire(blocking=False):
+        return None
+    future = executor.submit(backend.find_offers, component_list)
+    # Freed when the call finishes, however long after its caller gave up on it
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def fetch_offers(backends, component_list, timeout=None):
+    """
+    Query every backend concurrently.
+
+    A vendor that fails or exceeds its own timeout is reported in the errors instead of
+    holding up the others; its request is abandoned, not waited for. A vendor whose threads
+    are all still busy with abandoned calls is reported as busy rather than queued behind
+    them.
+
+    Args:
+        timeout (float): Longest wait for any vendor, e.g. the time left in a request's
+            budget; vendors aren't queried at all when it is 0.
+
+    Returns:
+        tuple[list[tuple[VendorBackend, dict]], dict]: (backend, result) pairs for the vendors
+            that answered, and {vendor name: error message} for those that didn't.
+    """
+    if timeout is not None and timeout <= 0:
+        return [], {backend.name: "skipped: deadline passed" for backend in backends}
+
+    start = time.monotonic()
+    futures = [(backend, _submit(backend, component_list)) for backend in backends]
+
+    responses, errors = [], {}
+    for backend, future in futures:
+        if future is None:
+            errors[backend.name] = f"busy: {backend.concurrency} earlier calls still running"
+            continue
+        backend_timeout = backend.timeout if timeout is None else min(backend.timeout, timeout)
+        remaining = max(0.0, start + backend_timeout - time.monotonic())
+        try:
+            responses.append((backend, future.result(timeout=remaining)))
+        except FutureTimeoutError:
+            future.cancel()
+            errors[backend.name] = f"timed out after {round(backend_timeout, 2)}s"
+        except Exception as e:
+            errors[backend.name] = str(e) or type(e).__name__
+    return responses, errors
+
+
+def merge_offers(responses, component_list, suggestion_limit: int = 5) -> dict:
+    """Combine per-vendor find_offers results into one in the same format"""
+    results = {comp: [] for comp in component_list}
+    suggestions = {}
+    for _, result in responses:
+        for comp, offers in result.items():
+            if comp == "suggestions":
+                continue
+            results.setdefault(comp, []).extend(offers)
+        for comp, candidates in result.get("suggestions", {}).items():
+            best = suggestions.setdefault(comp, {})
+            for candidate in candidates:
+                best[candidate["name"]] = max(candidate["score"], best.get(candidate["name"], 0))
+
+    if suggestions:
+        results["suggestions"] = {
+            comp: [
+                {"name": name, "score": score}
+                for name, score in sorted(best.items(), key=lambda item: -item[1])[
+                    :suggestion_limit
+                ]
+            ]
+            for comp, best in suggestions.items()
+        }
+    return results
+
+
+def parse_vendor_endpoints(value: str) -> dict:
+    """Parse "Vendor A=http://host:port,Vendor B=https://..." into {vendor: base URL}"""
+    endpoints = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        name, sep, url = entry.partition("=")
+        if not sep or not name.strip() or not url.strip():
+            raise ValueError(f"Invalid vendor endpoint '{entry}', expected NAME=URL")
+        endpoints[name.strip()] = url.strip()
+    return endpoints
+
+
+_default_backends = None
+_default_backends_config = None
+_default_backends_lock = threading.Lock()
+
+
+def get_default_backends() -> list[VendorBackend]:
+    """
+    Process-wide vendor backends: HTTP backends for IOT_VENDOR_ENDPOINTS when set, otherwise
+    the local inventory catalog. Rebuilt only when the configuration changes, so connection
+    pools stay warm between tool calls.
+    """
+    global _default_backends, _default_backends_config
+    config = (os.getenv("IOT_VENDOR_ENDPOINTS", ""), os.getenv("IOT_VENDOR_TIMEOUT_S", ""))
+    with _default_backends_lock:
+        if _default_backends is None or _default_backends_config != config:
+            endpoints, timeout = config
+            timeout = float(timeout) if timeout else DEFAULT_VENDOR_TIMEOUT_S
+            if endpoints.strip():
+                backends = [
+                    HTTPVendorBackend(name, url, timeout=timeout)
+                    for name, url in parse_vendor_endpoints(endpoints).items()
+                ]
+            else:
+                from .catalog import get_default_catalog
+
+                backends = [CatalogBackend(get_default_catalog(), timeout=timeout)]
+            for backend in _default_backends or []:
+                backend.close()
+            _default_backends, _default_backends_config = backends, config
+        return _default_backends
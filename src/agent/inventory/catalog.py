@@ -0,0 +1,210 @@
+"""
+In-memory vendor inventory catalog with hash indexes and mtime-based hot reload
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../"))
+
+DEFAULT_INVENTORY_FILES = {
+    "Digi-Key": os.path.join(ROOT_DIR, "mock_inventory", "mock_digikey_inventory.json"),
+    "AliExpress": os.path.join(ROOT_DIR, "mock_inventory", "mock_aliexpress_inventory.json"),
+}
+DEFAULT_VENDOR_URLS = {
+    "Digi-Key": "https://www.digikey.com/",
+    "AliExpress": "https://www.aliexpress.com/",
+}
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive key used by every catalog index"""
+    return " ".join(name.lower().split())
+
+
+@dataclass
+class Offer:
+    """A single vendor's listing for a component"""
+
+    vendor: str
+    vendor_url: str
+    name: str
+    part_number: str
+    price: float
+    stock: int
+    current_ma: float
+    voltage: float
+    category: str
+
+    def to_dict(self) -> dict:
+        """Offer in the component_sourcing_tool output format"""
+        return {
+            "vendor": self.vendor,
+            "vendor_url": self.vendor_url,
+            "price": self.price,
+            "stock": self.stock,
+            "technical_specs": {"mA": self.current_ma, "voltage": self.voltage},
+            "part_number": self.part_number,
+            "category": self.category,
+        }
+
+
+class InventoryCatalog:
+    """
+    Loads vendor inventory files once and indexes their items by normalized name,
+    part number and category. Files are re-read only when their mtime changes.
+    """
+
+    def __init__(self, inventory_files=None, vendor_urls=None, check_interval: float = 1.0):
+        """
+        Args:
+            inventory_files (dict): Vendor name -> path of a {"category": [items]} JSON file.
+            vendor_urls (dict): Vendor name -> vendor website URL.
+            check_interval (float): Minimum seconds between file mtime checks.
+        """
+        self.inventory_files = inventory_files or DEFAULT_INVENTORY_FILES
+        self.vendor_urls = vendor_urls or DEFAULT_VENDOR_URLS
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._mtimes = {}
+        self._vendor_offers = {}
+        self._last_check = 0.0
+        self.by_name = {}
+        self.by_part_number = {}
+        self.by_category = {}
+        self._fuzzy = None
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload any vendor file whose mtime changed; returns True if the indexes were rebuilt"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            changed = False
+            for vendor, path in self.inventory_files.items():
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if force or self._mtimes.get(vendor, -1) != mtime:
+                    self._mtimes[vendor] = mtime
+                    self._vendor_offers[vendor] = self._load_vendor(vendor, path)
+                    changed = True
+
+            if changed:
+                self._build_indexes()
+            return changed
+
+    def _load_vendor(self, vendor, path) -> list[Offer]:
+        try:
+            with open(path, "r") as f:
+                inventory = json.load(f)
+        except Exception:
+            return []
+
+        vendor_url = self.vendor_urls.get(vendor, "")
+        return [
+            Offer(
+                vendor=vendor,
+                vendor_url=vendor_url,
+                name=item.get("name", ""),
+                part_number=item.get("part_number"),
+                price=item.get("price"),
+                stock=item.get("stock"),
+                current_ma=item.get("mA"),
+                voltage=item.get("voltage"),
+                category=category,
+            )
+            for category, items in inventory.items()
+            for item in items
+        ]
+
+    def _build_indexes(self):
+        # Build into fresh dicts and swap them in, so concurrent readers never see a partial index
+        by_name, by_part_number, by_category = {}, {}, {}
+        for vendor in self.inventory_files:
+            for offer in self._vendor_offers.get(vendor, []):
+                by_name.setdefault(normalize_name(offer.name), []).append(offer)
+                if offer.part_number:
+                    by_part_number.setdefault(normalize_name(offer.part_number), []).append(offer)
+                by_category.setdefault(normalize_name(offer.category), []).append(offer)
+        self.by_name, self.by_part_number, self.by_category = by_name, by_part_number, by_category
+        self._fuzzy = None
+
+    def find_by_name(self, name: str) -> list[Offer]:
+        self.refresh()
+        return self.by_name.get(normalize_name(name), [])
+
+    def find_by_part_number(self, part_number: str) -> list[Offer]:
+        self.refresh()
+        return self.by_part_number.get(normalize_name(part_number), [])
+
+    def find_by_category(self, category: str) -> list[Offer]:
+        self.refresh()
+        return self.by_category.get(normalize_name(category), [])
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0):
+        """
+        Approximate lookup over item names and part numbers.
+
+        Returns:
+            list[tuple[str, float]]: (catalog item name, similarity score) pairs, best first.
+        """
+        self.refresh()
+        fuzzy = self._fuzzy
+        if fuzzy is None:
+            fuzzy = self._fuzzy = self._build_fuzzy_index()
+        index, key_names = fuzzy
+
+        matches = {}
+        # Over-fetch since a name and its part numbers can both match the same item
+        for key_id, score in index.search(query, limit=limit * 3, min_score=min_score):
+            name = key_names[key_id]
+            matches[name] = max(score, matches.get(name, 0.0))
+        ranked = sorted(matches.items(), key=lambda match: -match[1])
+        return ranked[:limit]
+
+    def _build_fuzzy_index(self):
+        from .fuzzy import TrigramIndex
+
+        keys, key_names = [], []
+        for offers in self.by_name.values():
+            keys.append(offers[0].name)
+            key_names.append(offers[0].name)
+        for part_number, offers in self.by_part_number.items():
+            keys.append(part_number)
+            key_names.append(offers[0].name)
+        return TrigramIndex(keys), key_names
+
+    def __len__(self):
+        return sum(len(offers) for offers in self._vendor_offers.values())
+
+
+_default_catalog = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_default_catalog():
+    """
+    Process-wide inventory: the SQLite database at IOT_INVENTORY_DB when set, otherwise an
+    in-memory catalog over the bundled mock vendor inventories
+    """
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            if _default_catalog is None:
+                db_path = os.getenv("IOT_INVENTORY_DB")
+                if db_path:
+                    from .sqlite_store import SQLiteInventory
+
+                    _default_catalog = SQLiteInventory(db_path)
+                else:
+                    _default_catalog = InventoryCatalog()
+    return _default_catalog
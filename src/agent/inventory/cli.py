@@ -0,0 +1,69 @@
+import argparse
+import sys
+import time
+
+from .catalog import DEFAULT_INVENTORY_FILES
+
+
+def import_command(args):
+    from .sqlite_store import SQLiteInventory
+
+    inventory = SQLiteInventory(args.db)
+    sources = [(args.vendor, args.file)] if args.file else DEFAULT_INVENTORY_FILES.items()
+    for vendor, path in sources:
+        if not vendor:
+            print("❌ --vendor is required with --file")
+            return 1
+        start = time.perf_counter()
+        count = inventory.import_json(vendor, path, vendor_url=args.vendor_url)
+        print(f"📦 Imported {count} items for {vendor} in {time.perf_counter() - start:.2f}s")
+    print(f"✅ {len(inventory)} items in {args.db}")
+    return 0
+
+
+def search_command(args):
+    from .sqlite_store import SQLiteInventory
+
+    inventory = SQLiteInventory(args.db)
+    offers = inventory.find_by_name(args.query) or inventory.find_by_part_number(args.query)
+    if offers:
+        for offer in offers:
+            print(
+                f"{offer.vendor}: {offer.name} ({offer.part_number}) ${offer.price}, "
+                f"{offer.stock} in stock"
+            )
+        return 0
+    for name, score in inventory.search(args.query, limit=args.limit):
+        print(f"{score:.2f}  {name}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="IoT Inventory CLI - Import vendor inventories into a SQLite database"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import", help="Replace a vendor's items with a {category: [items]} JSON dump"
+    )
+    import_parser.add_argument("db", help="Path to the SQLite inventory database")
+    import_parser.add_argument(
+        "--file", help="Inventory JSON file (default: the bundled mock inventories)"
+    )
+    import_parser.add_argument("--vendor", help="Vendor name for --file")
+    import_parser.add_argument("--vendor_url", default=None, help="Vendor website URL")
+    import_parser.set_defaults(func=import_command)
+
+    search_parser = subparsers.add_parser("search", help="Look up a component by name")
+    search_parser.add_argument("db", help="Path to the SQLite inventory database")
+    search_parser.add_argument("query", help="Component name or part number")
+    search_parser.add_argument("--limit", type=int, default=5, help="Number of suggestions")
+    search_parser.set_defaults(func=search_command)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
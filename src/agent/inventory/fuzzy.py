@@ -0,0 +1,135 @@
+"""
+Character-trigram TF-IDF index for approximate component-name lookup
+"""
+
+import math
+import re
+
+import numpy as np
+
+# Candidates are drawn from at most this many of the query's rarest trigrams, stopping
+# early once the posting entries collected exceed the budget
+CANDIDATE_TRIGRAMS = 8
+CANDIDATE_BUDGET = 10000
+# Generic queries ("pir sensor") match thousands of keys; only the ones sharing the most
+# rare trigrams are scored exactly
+MAX_SCORED_CANDIDATES = 2000
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop in-word separators and collapse other punctuation to single spaces"""
+    # "DHT-22", "DHT 22" and "DHT22" should look alike, so in-word separators are dropped
+    normalized = re.sub(r"(?<=[a-z0-9])[-_./](?=[a-z0-9])", "", text.lower())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", normalized).split())
+
+
+def trigrams(text: str) -> set[str]:
+    """Character trigrams of a lowercased, punctuation-free string, padded at word edges"""
+    padded = f"  {normalize_text(text)} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigram to key ids, scored by IDF-weighted cosine
+    similarity. A lookup touches only the posting lists of the query's rarest trigrams and
+    the trigram rows of the candidates they produce, never the whole key set.
+    """
+
+    def __init__(self, keys: list[str]):
+        """
+        Args:
+            keys (list[str]): Strings to index; search results refer to them by position.
+        """
+        self.keys = keys
+        key_count = max(len(keys), 1)
+
+        gram_ids = {}
+        key_grams = []
+        for key in keys:
+            key_grams.append([gram_ids.setdefault(gram, len(gram_ids)) for gram in trigrams(key)])
+        self.gram_ids = gram_ids
+
+        # CSR layout of key -> trigram ids
+        lengths = np.fromiter((len(grams) for grams in key_grams), dtype=np.int64, count=len(keys))
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.indices = np.fromiter(
+            (gram for grams in key_grams for gram in grams), dtype=np.int32, count=self.indptr[-1]
+        )
+
+        document_frequency = np.bincount(self.indices, minlength=len(gram_ids))
+        self.idf = np.log(key_count / np.maximum(document_frequency, 1)) + 1.0
+        self.unseen_idf = math.log(key_count) + 1.0
+        self.norms = np.sqrt(
+            np.add.reduceat(self.idf[self.indices] ** 2, self.indptr[:-1])
+            if len(self.indices)
+            else np.zeros(len(keys))
+        )
+
+        # Inverted index: trigram id -> key ids, as slices of one sorted array
+        key_of_entry = np.repeat(np.arange(len(keys), dtype=np.int32), lengths)
+        order = np.argsort(self.indices, kind="stable")
+        self.posting_keys = key_of_entry[order]
+        self.posting_ptr = np.concatenate(([0], np.cumsum(document_frequency)))
+
+    def _posting(self, gram_id: int):
+        return self.posting_keys[self.posting_ptr[gram_id] : self.posting_ptr[gram_id + 1]]
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0):
+        """
+        Rank keys by similarity to the query.
+
+        Returns:
+            list[tuple[int, float]]: (key id, score in [0, 1]) pairs, best first.
+        """
+        query_grams = trigrams(query)
+        present = [self.gram_ids[gram] for gram in query_grams if gram in self.gram_ids]
+        if not present:
+            return []
+
+        # Query trigrams missing from the index still lower the similarity, at the rarest weight
+        missing = len(query_grams) - len(present)
+        query_norm = math.sqrt(
+            float(np.sum(self.idf[present] ** 2)) + missing * self.unseen_idf**2
+        )
+
+        # Candidate generation from the most selective trigrams. Keys sharing only one of
+        # several rare trigrams can't score well, so they are dropped before exact scoring.
+        present.sort(key=lambda gram_id: self.posting_ptr[gram_id + 1] - self.posting_ptr[gram_id])
+        postings = []
+        collected = 0
+        for gram_id in present[:CANDIDATE_TRIGRAMS]:
+            if postings and collected >= CANDIDATE_BUDGET:
+                break
+            posting = self._posting(gram_id)
+            postings.append(posting)
+            collected += len(posting)
+        candidates, hits = np.unique(np.concatenate(postings), return_counts=True)
+        if len(postings) > 2:
+            keep = hits >= max(2, len(postings) // 2)
+            if keep.sum() >= limit:
+                candidates, hits = candidates[keep], hits[keep]
+        if len(candidates) > MAX_SCORED_CANDIDATES:
+            best = np.argpartition(-hits, MAX_SCORED_CANDIDATES)[:MAX_SCORED_CANDIDATES]
+            candidates = np.sort(candidates[best])
+
+        # Exact scoring: gather every candidate's trigram row and look up the query weights
+        query_weight = np.zeros(len(self.idf))
+        query_weight[present] = self.idf[present] ** 2
+        starts = self.indptr[candidates]
+        lengths = self.indptr[candidates + 1] - starts
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        entries = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        dot = np.add.reduceat(query_weight[self.indices[entries]], offsets)
+        scores = dot / (self.norms[candidates] * query_norm)
+
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(candidates[i]), round(float(scores[i]), 4))
+            for i in top
+            if scores[i] >= min_score
+        ]
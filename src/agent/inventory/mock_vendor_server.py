@@ -0,0 +1,153 @@
+"""
+Local mock vendor API serving the bundled mock inventories, for tests and benchmarks.
+
+Each server plays one vendor: POST /offers {"components": [...]} answers in the
+VendorBackend.find_offers format after an optional simulated latency.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends import CatalogBackend
+from .catalog import DEFAULT_INVENTORY_FILES, DEFAULT_VENDOR_URLS, InventoryCatalog
+
+
+class MockVendorServer(ThreadingHTTPServer):
+    """HTTP server answering offer lookups from one vendor's inventory file"""
+
+    daemon_threads = True
+
+    def __init__(self, address, vendor, inventory_file=None, latency=0.0, jitter=0.0):
+        """
+        Args:
+            address (tuple): (host, port) to bind; port 0 picks a free port.
+            vendor (str): Vendor name reported in offers.
+            inventory_file (str): {"category": [items]} JSON file; defaults to the bundled
+                mock inventory for the vendor.
+            latency (float): Seconds to wait before answering each lookup.
+            jitter (float): Extra uniformly random seconds added to the latency.
+        """
+        super().__init__(address, MockVendorRequestHandler)
+        inventory_file = inventory_file or DEFAULT_INVENTORY_FILES[vendor]
+        catalog = InventoryCatalog(
+            {vendor: inventory_file}, {vendor: DEFAULT_VENDOR_URLS.get(vendor, "")}
+        )
+        self.backend = CatalogBackend(catalog, name=vendor)
+        self.vendor = vendor
+        self.latency = latency
+        self.jitter = jitter
+        self.request_count = 0
+        self.connection_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        with self._count_lock:
+            self.connection_count += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up before a slow response is written; that's expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockVendorRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests, as a real vendor API would
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle on, keep-alive responses stall
+    # on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok", "vendor": self.server.vendor})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self.path != "/offers":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            components = json.loads(body or b"{}")["components"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": 'Body must be {"components": [...]}'})
+            return
+
+        with self.server._count_lock:
+            self.server.request_count += 1
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        self._send_json(200, self.server.backend.find_offers(components))
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_vendors(latencies=None, host="127.0.0.1"):
+    """
+    Start one mock server per bundled vendor on free ports, each in a background thread.
+
+    Args:
+        latencies (dict): Vendor name -> simulated latency in seconds (default 0).
+
+    Returns:
+        list[MockVendorServer]: Running servers; call shutdown() and server_close() when done.
+    """
+    latencies = latencies or {}
+    servers = []
+    for vendor in DEFAULT_INVENTORY_FILES:
+        server = MockVendorServer((host, 0), vendor, latency=latencies.get(vendor, 0.0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def main():
+    """Serve one bundled mock vendor inventory over HTTP"""
+    parser = argparse.ArgumentParser(
+        description="Mock Vendor Server - Serve a mock inventory as a vendor API"
+    )
+    parser.add_argument("--vendor", choices=list(DEFAULT_INVENTORY_FILES), required=True)
+    parser.add_argument("--inventory_file", default=None, help="Inventory JSON to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind to")
+    parser.add_argument("--port", type=int, default=0, help="Port to listen on (0 = any)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds")
+    args = parser.parse_args()
+
+    server = MockVendorServer(
+        (args.host, args.port), args.vendor, args.inventory_file, args.latency, args.jitter
+    )
+    print(f"🏪 Mock {args.vendor} API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
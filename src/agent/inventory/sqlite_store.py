@@ -0,0 +1,458 @@
+"""
+SQLite-backed vendor inventory for catalogs too large to hold in memory.
+
+Items live in one table indexed on name, part number, category, price and stock, with an
+FTS5 index over their names and part numbers for approximate lookups. The database runs
+in WAL mode so agent processes can keep reading while a nightly import is written.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from collections import Counter
+
+from .catalog import DEFAULT_VENDOR_URLS, Offer, normalize_name
+from .fuzzy import CANDIDATE_BUDGET, CANDIDATE_TRIGRAMS, normalize_text, trigrams
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vendors (
+    name TEXT PRIMARY KEY,
+    url TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    vendor TEXT NOT NULL,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    part_number TEXT,
+    part_key TEXT,
+    price REAL,
+    stock INTEGER,
+    mA REAL,
+    voltage REAL
+);
+CREATE INDEX IF NOT EXISTS items_name_key ON items (name_key);
+CREATE INDEX IF NOT EXISTS items_part_key ON items (part_key);
+CREATE INDEX IF NOT EXISTS items_category_price ON items (category_key, price);
+CREATE INDEX IF NOT EXISTS items_price ON items (price);
+CREATE INDEX IF NOT EXISTS items_stock ON items (stock);
+CREATE INDEX IF NOT EXISTS items_vendor ON items (vendor);
+-- Distinct normalized names and part numbers, the keys the in-memory TrigramIndex scores,
+-- and how many of them contain each trigram (for IDF weights)
+CREATE TABLE IF NOT EXISTS search_keys (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    items INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS key_trigrams (
+    gram TEXT PRIMARY KEY,
+    keys INTEGER NOT NULL
+);
+"""
+
+ITEM_COLUMNS = "vendor, category, name, part_number, price, stock, mA, voltage"
+# Item keys per (kind, key), the same keys InventoryCatalog builds its fuzzy index from
+ITEM_KEYS = (
+    "SELECT 'name', name_key, COUNT(*) FROM items WHERE {where} GROUP BY name_key "
+    "UNION ALL SELECT 'part', part_key, COUNT(*) FROM items "
+    "WHERE part_key IS NOT NULL AND {where} GROUP BY part_key"
+)
+# Stay below SQLite's limit on host parameters per statement
+MAX_PARAMS = 900
+
+
+def _fts_terms(text: str) -> list[str]:
+    """In-word trigrams of normalized text, the unit both FTS tokenizers are queried with"""
+    return sorted(gram for gram in trigrams(text) if " " not in gram)
+
+
+def iter_inventory_items(path: str, chunk_size: int = 1 << 16):
+    """
+    Stream (category, item) pairs from a {"category": [items...]} JSON file without loading
+    the whole document, so memory stays flat for multi-gigabyte vendor dumps.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def skip_whitespace():
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position < len(buffer) or eof:
+                    return
+                fill()
+
+        def expect(*chars):
+            nonlocal position
+            skip_whitespace()
+            if position >= len(buffer) or buffer[position] not in chars:
+                found = buffer[position : position + 20] if position < len(buffer) else "EOF"
+                raise ValueError(f"Expected one of {chars} in {path}, found {found!r}")
+            position += 1
+            return buffer[position - 1]
+
+        def decode_value():
+            nonlocal position
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    # A number at the end of the buffer may continue in the next chunk
+                    if end < len(buffer) or eof:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        expect("{")
+        skip_whitespace()
+        if buffer[position : position + 1] == "}":
+            return
+        while True:
+            category = decode_value()
+            expect(":")
+            expect("[")
+            skip_whitespace()
+            if buffer[position : position + 1] == "]":
+                position += 1
+            else:
+                while True:
+                    yield category, decode_value()
+                    if expect(",", "]") == "]":
+                        break
+            if expect(",", "}") == "}":
+                return
+
+
+class SQLiteInventory:
+    """
+    Vendor inventory backed by a SQLite database, with the same lookup interface as
+    InventoryCatalog (find_by_name, find_by_part_number, find_by_category, search).
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): Path to the SQLite database; created with the schema if missing.
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        self.fts_tokenizer = self._create_fts_table(connection)
+        # Databases imported before trigram statistics were kept get them on first open
+        with connection:
+            if connection.execute("SELECT 1 FROM items LIMIT 1").fetchone() and not (
+                connection.execute("SELECT 1 FROM search_keys LIMIT 1").fetchone()
+            ):
+                self._add_keys(connection, connection.execute(ITEM_KEYS.format(where="1")))
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, so each thread opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _create_fts_table(self, connection) -> str:
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts "
+                    f"USING fts5(search_text, tokenize='{tokenizer}')"
+                )
+                # Per-term document counts, used to query with the rarest trigrams first
+                connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts_vocab "
+                    "USING fts5vocab(items_fts, 'row')"
+                )
+                row = connection.execute(
+                    "SELECT sql FROM sqlite_master WHERE name = 'items_fts'"
+                ).fetchone()
+                return "trigram" if "trigram" in row[0] else "unicode61"
+            except sqlite3.OperationalError:
+                # SQLite builds before 3.34 lack the trigram tokenizer
+                continue
+        raise RuntimeError("SQLite was built without FTS5 support")
+
+    def import_json(self, vendor: str, path: str, vendor_url: str = None, batch_size=5000):
+        """
+        Replace a vendor's items with the contents of a {"category": [items]} JSON file.
+
+        The file is streamed and written in batches inside one transaction, so readers keep
+        seeing the previous inventory until the import commits.
+
+        Returns:
+            int: Number of items imported.
+        """
+        connection = self._connection()
+        if vendor_url is None:
+            vendor_url = DEFAULT_VENDOR_URLS.get(vendor, "")
+
+        count = 0
+        with connection:
+            connection.execute(
+                "INSERT INTO vendors (name, url) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET url = excluded.url",
+                (vendor, vendor_url),
+            )
+            connection.execute(
+                "DELETE FROM items_fts WHERE rowid IN (SELECT id FROM items WHERE vendor = ?)",
+                (vendor,),
+            )
+            self._remove_keys(
+                connection,
+                connection.execute(ITEM_KEYS.format(where="vendor = ?"), (vendor, vendor)),
+            )
+            connection.execute("DELETE FROM items WHERE vendor = ?", (vendor,))
+
+            batch = []
+            for category, item in iter_inventory_items(path):
+                batch.append((category, item))
+                if len(batch) >= batch_size:
+                    count += self._insert_batch(connection, vendor, batch)
+                    batch = []
+            if batch:
+                count += self._insert_batch(connection, vendor, batch)
+        return count
+
+    def _search_text(self, name, part_number) -> str:
+        text = f"{name} {part_number or ''}"
+        if self.fts_tokenizer == "trigram":
+            return normalize_text(text)
+        # Without the trigram tokenizer, trigrams are indexed as individual words instead
+        return " ".join(_fts_terms(text))
+
+    def _insert_batch(self, connection, vendor, batch) -> int:
+        # Row ids are assigned up front so items and their FTS rows go in with executemany
+        first_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM items").fetchone()[0]
+        items, search_rows = [], []
+        for item_id, (category, item) in enumerate(batch, start=first_id):
+            name = item.get("name", "")
+            part_number = item.get("part_number")
+            items.append(
+                (
+                    item_id,
+                    vendor,
+                    category,
+                    normalize_name(category),
+                    name,
+                    normalize_name(name),
+                    part_number,
+                    normalize_name(part_number) if part_number else None,
+                    item.get("price"),
+                    item.get("stock"),
+                    item.get("mA"),
+                    item.get("voltage"),
+                )
+            )
+            search_rows.append((item_id, self._search_text(name, part_number)))
+
+        connection.executemany(
+            "INSERT INTO items (id, vendor, category, category_key, name, name_key, part_number,"
+            " part_key, price, stock, mA, voltage) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            items,
+        )
+        connection.executemany(
+            "INSERT INTO items_fts (rowid, search_text) VALUES (?, ?)", search_rows
+        )
+        keys = Counter()
+        for item in items:
+            keys["name", item[5]] += 1
+            if item[7] is not None:
+                keys["part", item[7]] += 1
+        self._add_keys(connection, ((kind, key, n) for (kind, key), n in keys.items()))
+        return len(batch)
+
+    def _add_keys(self, connection, keys):
+        """Count items under their (kind, key, items) keys, and the trigrams of new keys"""
+        gram_counts = Counter()
+        for kind, key, count in keys:
+            updated = connection.execute(
+                "UPDATE search_keys SET items = items + ? WHERE kind = ? AND key = ?",
+                (count, kind, key),
+            )
+            if not updated.rowcount:
+                connection.execute(
+                    "INSERT INTO search_keys (kind, key, items) VALUES (?, ?, ?)",
+                    (kind, key, count),
+                )
+                gram_counts.update(trigrams(key))
+        connection.executemany(
+            "INSERT INTO key_trigrams (gram, keys) VALUES (?, ?) "
+            "ON CONFLICT(gram) DO UPDATE SET keys = keys + excluded.keys",
+            gram_counts.items(),
+        )
+
+    def _remove_keys(self, connection, keys):
+        """Uncount items from their keys, dropping keys no item has any more"""
+        gram_counts = Counter()
+        for kind, key, count in keys.fetchall():
+            connection.execute(
+                "UPDATE search_keys SET items = items - ? WHERE kind = ? AND key = ?",
+                (count, kind, key),
+            )
+            remaining = connection.execute(
+                "SELECT items FROM search_keys WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if remaining is not None and remaining[0] <= 0:
+                connection.execute(
+                    "DELETE FROM search_keys WHERE kind = ? AND key = ?", (kind, key)
+                )
+                gram_counts.update(trigrams(key))
+        connection.executemany(
+            "UPDATE key_trigrams SET keys = keys - ? WHERE gram = ?",
+            ((count, gram) for gram, count in gram_counts.items()),
+        )
+        connection.execute("DELETE FROM key_trigrams WHERE keys <= 0")
+
+    def _trigram_weights(self, connection, grams) -> tuple[dict, float]:
+        """IDF weights of the indexed trigrams among grams, and the weight of an unseen one,
+        as TrigramIndex computes them"""
+        key_count = max(connection.execute("SELECT COUNT(*) FROM search_keys").fetchone()[0], 1)
+        grams = list(grams)
+        weights = {}
+        for start in range(0, len(grams), MAX_PARAMS):
+            chunk = grams[start : start + MAX_PARAMS]
+            weights.update(
+                (gram, math.log(key_count / count) + 1.0)
+                for gram, count in connection.execute(
+                    "SELECT gram, keys FROM key_trigrams "
+                    f"WHERE gram IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return weights, math.log(key_count) + 1.0
+
+    def _offers(self, where: str, params) -> list[Offer]:
+        rows = self._connection().execute(
+            f"SELECT {ITEM_COLUMNS}, COALESCE((SELECT url FROM vendors "
+            f"WHERE vendors.name = items.vendor), '') FROM items WHERE {where} ORDER BY id",
+            params,
+        )
+        return [
+            Offer(
+                vendor=vendor,
+                vendor_url=url,
+                name=name,
+                part_number=part_number,
+                price=price,
+                stock=stock,
+                current_ma=ma,
+                voltage=voltage,
+                category=category,
+            )
+            for vendor, category, name, part_number, price, stock, ma, voltage, url in rows
+        ]
+
+    def find_by_name(self, name: str) -> list[Offer]:
+        return self._offers("name_key = ?", (normalize_name(name),))
+
+    def find_by_part_number(self, part_number: str) -> list[Offer]:
+        return self._offers("part_key = ?", (normalize_name(part_number),))
+
+    def find_by_category(self, category: str) -> list[Offer]:
+        return self._offers("category_key = ?", (normalize_name(category),))
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0, candidates: int = 200):
+        """
+        Approximate lookup over item names and part numbers, mirroring the in-memory
+        TrigramIndex: candidates come from the FTS postings of the query's rarest trigrams,
+        and the items sharing the most of them are re-scored by IDF-weighted trigram cosine
+        similarity, with the same weights, so both backends score a query alike.
+
+        Returns:
+            list[tuple[str, float]]: (item name, similarity score) pairs, best first.
+        """
+        terms = _fts_terms(query)
+        if not terms:
+            return []
+        connection = self._connection()
+
+        placeholders = ", ".join("?" * len(terms))
+        document_frequency = dict(
+            connection.execute(
+                f"SELECT term, doc FROM items_fts_vocab WHERE term IN ({placeholders})", terms
+            )
+        )
+        present = sorted(
+            (term for term in terms if term in document_frequency),
+            key=lambda term: document_frequency[term],
+        )
+
+        hits = Counter()
+        # Rows containing all of the rarest trigrams are the likeliest matches; FTS finds them
+        # directly, before per-term postings are truncated to the candidate budget
+        strongest = present[:CANDIDATE_TRIGRAMS]
+        if len(strongest) > 1:
+            rows = connection.execute(
+                "SELECT rowid FROM items_fts WHERE items_fts MATCH ? LIMIT ?",
+                (" AND ".join(f'"{term}"' for term in strongest), candidates),
+            )
+            hits.update({row_id: len(strongest) for (row_id,) in rows})
+
+        collected = 0
+        for term in strongest:
+            if collected >= CANDIDATE_BUDGET:
+                break
+            rows = connection.execute(
+                "SELECT rowid FROM items_fts WHERE items_fts MATCH ? LIMIT ?",
+                (f'"{term}"', CANDIDATE_BUDGET),
+            ).fetchall()
+            hits.update(row_id for (row_id,) in rows)
+            collected += len(rows)
+        if not hits:
+            return []
+
+        best_ids = [row_id for row_id, _ in hits.most_common(candidates)]
+        rows = connection.execute(
+            f"SELECT name, part_number FROM items WHERE id IN ({', '.join('?' * len(best_ids))})",
+            best_ids,
+        )
+
+        query_grams = trigrams(query)
+        rows = [
+            (name, [trigrams(key) for key in (name, part_number) if key])
+            for name, part_number in rows
+        ]
+        weights, unseen_weight = self._trigram_weights(
+            connection, query_grams.union(*(grams for _, keys in rows for grams in keys))
+        )
+        # Query trigrams no key contains still lower the similarity, at the rarest weight
+        query_norm = math.sqrt(sum(weights.get(gram, unseen_weight) ** 2 for gram in query_grams))
+        matches = {}
+        for name, keys in rows:
+            for key_grams in keys:
+                dot = sum(weights.get(gram, 0.0) ** 2 for gram in query_grams & key_grams)
+                norm = math.sqrt(sum(weights.get(gram, 0.0) ** 2 for gram in key_grams))
+                score = dot / (norm * query_norm) if norm else 0.0
+                matches[name] = max(round(score, 4), matches.get(name, 0.0))
+        ranked = sorted(
+            (match for match in matches.items() if match[1] >= min_score),
+            key=lambda match: -match[1],
+        )
+        return ranked[:limit]
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM items").fetchone()[0]
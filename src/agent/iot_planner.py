@@ -3,14 +3,21 @@ from .tools.research_tool import research_tool
 from .tools.iot_blueprint_generator import iot_blueprint_generator
 from .tools.component_sourcing_tool import component_sourcing_tool
 from .tools.power_battery_estimator import power_battery_estimator
+from .tools.design_pipeline_tool import design_pipeline_tool
+from .tools.bom_quoting_tool import bom_quoting_tool
+from .tracer import setup_tracing
 
 
-def build_iot_planner():
+def build_iot_planner(llm=None):
     """Build the full IoT Planner Agent with all tools"""
+    # A no-op unless IOT_TRACING is set
+    setup_tracing()
     tools = [
         research_tool,
         iot_blueprint_generator,
         component_sourcing_tool,
         power_battery_estimator,
+        design_pipeline_tool,
+        bom_quoting_tool,
     ]
-    return create_iot_agent(tools)
+    return create_iot_agent(tools, llm=llm)
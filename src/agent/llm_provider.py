@@ -0,0 +1,91 @@
+"""
+Chat model providers for the IoT Planner Agent
+"""
+
+import os
+
+DEFAULT_PROVIDER = "gemini"
+
+
+def _create_gemini_model(**overrides):
+    """Google Gemini, the production model"""
+    from dotenv import load_dotenv
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    load_dotenv()
+
+    settings = {
+        "model": "gemini-2.5-flash",
+        "temperature": 0,
+        "google_api_key": os.getenv("GEMINI_API_KEY"),
+        "max_output_tokens": 2048,
+        "top_p": 0.95,
+        "top_k": 40,
+    }
+    return ChatGoogleGenerativeAI(**{**settings, **overrides})
+
+
+def _create_scripted_model(**overrides):
+    """Local scripted model replaying a recorded session from IOT_LLM_SCRIPT"""
+    from .scripted_llm import ScriptedChatModel
+
+    # Accept the same model settings as Gemini, so tiers can be tried offline
+    if "model" in overrides:
+        overrides["model_name"] = overrides.pop("model")
+    script_path = overrides.pop("script_path", None) or os.getenv("IOT_LLM_SCRIPT")
+    if not script_path:
+        raise ValueError("The scripted provider needs a script path (set IOT_LLM_SCRIPT)")
+    if os.getenv("IOT_LLM_DELAY_S"):
+        overrides.setdefault("delay_s", float(os.getenv("IOT_LLM_DELAY_S")))
+    return ScriptedChatModel.from_file(script_path, **overrides)
+
+
+PROVIDERS = {
+    "gemini": _create_gemini_model,
+    "scripted": _create_scripted_model,
+}
+
+# Settings of the cheaper tier used for tool-calling turns (see model_routing). A tool call
+# fits well within the output limit; an answer the tier writes is discarded and re-written
+# by the full model, so the limit also caps what that discarded attempt costs.
+TOOL_TIER_SETTINGS = {
+    "gemini": {"model": "gemini-2.5-flash-lite", "max_output_tokens": 256},
+}
+
+
+def register_provider(name: str, factory):
+    """Register a factory returning a LangChain chat model under the given provider name"""
+    PROVIDERS[name] = factory
+
+
+def create_chat_model(provider: str = None, **overrides):
+    """
+    Create the chat model for the agent.
+
+    Args:
+        provider: Provider name; defaults to IOT_LLM_PROVIDER or "gemini".
+        **overrides: Provider-specific settings (e.g. model, max_output_tokens, script_path).
+    """
+    provider = provider or os.getenv("IOT_LLM_PROVIDER", DEFAULT_PROVIDER)
+    if provider not in PROVIDERS:
+        raise ValueError(
+            f"Unknown LLM provider '{provider}'. Available: {', '.join(sorted(PROVIDERS))}"
+        )
+    return PROVIDERS[provider](**overrides)
+
+
+def create_tool_model(provider: str = None, **overrides):
+    """
+    Create the chat model for tool-calling turns.
+
+    Uses the provider's TOOL_TIER_SETTINGS, then IOT_TOOL_MODEL and IOT_TOOL_MAX_OUTPUT_TOKENS
+    when set (e.g. IOT_TOOL_MODEL=gemini-2.5-flash to keep the model but only tighten the
+    output limit), then overrides.
+    """
+    provider = provider or os.getenv("IOT_LLM_PROVIDER", DEFAULT_PROVIDER)
+    settings = dict(TOOL_TIER_SETTINGS.get(provider, {}))
+    if os.getenv("IOT_TOOL_MODEL"):
+        settings["model"] = os.getenv("IOT_TOOL_MODEL")
+    if os.getenv("IOT_TOOL_MAX_OUTPUT_TOKENS"):
+        settings["max_output_tokens"] = int(os.getenv("IOT_TOOL_MAX_OUTPUT_TOKENS"))
+    return create_chat_model(provider, **{**settings, **overrides})
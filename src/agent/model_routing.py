@@ -0,0 +1,68 @@
+"""
+Tiered model routing for the agent's turns.
+
+Most turns of a planning run only pick the next tool call, which needs neither the full
+model nor a long output budget. With the "tiered" policy, every turn first goes to the tool
+tier (by default gemini-2.5-flash-lite with max_output_tokens=256). Once that model stops
+calling tools, its answer is discarded and the turn is re-run on the synthesis tier (the
+agent's main model), so the final answer always comes from the full model. The discarded
+attempt is counted as an escalation; the tool tier's low output limit keeps it cheap, but
+it is still one extra LLM call per request.
+
+The policy is set with IOT_MODEL_ROUTING ("single", the default, uses the main model for
+every turn; "tiered" opts in to routing). The tool tier's model and output limit can be
+changed with IOT_TOOL_MODEL and IOT_TOOL_MAX_OUTPUT_TOKENS (see llm_provider.create_tool_model).
+
+Each LLM turn is tagged with its tier (the "model_tier" metadata seen by callbacks), so the
+evaluation summary reports tokens, latency and cost per tier under "model_tiers".
+"""
+
+import os
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import AIMessage
+
+ROUTING_POLICIES = ("single", "tiered")
+DEFAULT_POLICY = "single"
+TOOL_TIER = "tool"
+SYNTHESIS_TIER = "synthesis"
+
+
+def get_routing_policy() -> str:
+    """Routing policy from IOT_MODEL_ROUTING"""
+    policy = (os.getenv("IOT_MODEL_ROUTING") or DEFAULT_POLICY).strip().lower()
+    if policy not in ROUTING_POLICIES:
+        raise ValueError(
+            f"Unknown IOT_MODEL_ROUTING {policy!r}; expected one of {ROUTING_POLICIES}"
+        )
+    return policy
+
+
+def with_tier(model, tier: str):
+    """Copy of a chat model whose calls report their tier in the callback metadata"""
+    return model.model_copy(update={"metadata": {**(model.metadata or {}), "model_tier": tier}})
+
+
+class ModelRoutingMiddleware(AgentMiddleware):
+    """Sends tool-selection turns to the tool tier and final answers to the synthesis tier"""
+
+    def __init__(self, tool_model, synthesis_model):
+        """
+        Args:
+            tool_model: Chat model for turns that call tools.
+            synthesis_model: Chat model for the final answer.
+        """
+        super().__init__()
+        self.tool_model = with_tier(tool_model, TOOL_TIER)
+        self.synthesis_model = with_tier(synthesis_model, SYNTHESIS_TIER)
+
+    def wrap_model_call(self, request, handler):
+        if not request.tools:
+            # No tools to choose from (e.g. a forced final answer, see turn_budget)
+            return handler(request.override(model=self.synthesis_model))
+        response = handler(request.override(model=self.tool_model))
+        messages = [m for m in response.result if isinstance(m, AIMessage)]
+        if messages and messages[-1].tool_calls:
+            return response
+        # The tool tier is done calling tools: write the answer with the full model
+        return handler(request.override(model=self.synthesis_model))
@@ -0,0 +1,120 @@
+"""
+Offline scripted chat model that replays recorded tool-call sequences for benchmarking
+"""
+
+import json
+import time
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that answers each agent turn from a recorded script instead of calling an API.
+
+    Each turn in the script is a dict with optional keys:
+        - content (str): Text content of the AI message
+        - tool_calls (list): [{"name": ..., "args": {...}}] tool calls to request
+        - delay_s (float): Simulated model latency for this turn
+        - usage (dict): {"input_tokens": int, "output_tokens": int} to report, optionally
+          with "cached_input_tokens" (prompt cache hits, included in input_tokens)
+
+    String arguments may contain "{query}", which is replaced by the user's latest message.
+    The turn is chosen by counting AI messages since the last human message, so one model
+    instance can replay the same script for many concurrent queries.
+    """
+
+    turns: list[dict]
+    delay_s: float = 0.0
+    chars_per_token: float = 4.0
+    model_name: str = "scripted"
+    # Truncate content to this many tokens, like a provider's output limit
+    max_output_tokens: int = None
+
+    _call_log: list = PrivateAttr(default_factory=list)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs):
+        """Load a script from a JSON file of the form {"turns": [...], "delay_s": ...}"""
+        with open(path, "r", encoding="utf-8") as f:
+            script = json.load(f)
+        return cls(**{**script, **kwargs})
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def call_log(self) -> list[dict]:
+        """Per-call records of turn index and generation time (seconds)"""
+        return self._call_log
+
+    def bind_tools(self, tools, **kwargs):
+        # Tool calls come from the script, so there is nothing to bind
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        start = time.perf_counter()
+
+        turn_index = 0
+        query = ""
+        for message in messages:
+            if isinstance(message, HumanMessage):
+                turn_index = 0
+                query = message.content if isinstance(message.content, str) else ""
+            elif isinstance(message, AIMessage):
+                turn_index += 1
+        # Past the end of the script, keep repeating the final answer
+        turn = self.turns[min(turn_index, len(self.turns) - 1)]
+
+        content = turn.get("content", "").replace("{query}", query)
+        if self.max_output_tokens is not None:
+            content = content[: int(self.max_output_tokens * self.chars_per_token)]
+        tool_calls = [
+            {
+                "name": call["name"],
+                "args": {
+                    key: value.replace("{query}", query) if isinstance(value, str) else value
+                    for key, value in call.get("args", {}).items()
+                },
+                "id": f"call_{turn_index}_{i}",
+                "type": "tool_call",
+            }
+            for i, call in enumerate(turn.get("tool_calls", []))
+        ]
+
+        usage = turn.get("usage") or {
+            "input_tokens": int(sum(len(str(m.content)) for m in messages) / self.chars_per_token),
+            "output_tokens": int(
+                (len(content) + len(json.dumps([c["args"] for c in tool_calls])))
+                / self.chars_per_token
+            ),
+        }
+        usage_metadata = {
+            "input_tokens": usage["input_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "total_tokens": usage["input_tokens"] + usage["output_tokens"],
+        }
+        if usage.get("cached_input_tokens"):
+            usage_metadata["input_token_details"] = {"cache_read": usage["cached_input_tokens"]}
+
+        time.sleep(turn.get("delay_s", self.delay_s))
+
+        message = AIMessage(content=content, tool_calls=tool_calls, usage_metadata=usage_metadata)
+        self._call_log.append(
+            {"turn": turn_index, "seconds": time.perf_counter() - start, **usage_metadata}
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={
+                "model_name": self.model_name,
+                "token_usage": {
+                    "prompt_tokens": usage_metadata["input_tokens"],
+                    "completion_tokens": usage_metadata["output_tokens"],
+                },
+            },
+        )
@@ -0,0 +1,201 @@
+"""
+Long-running IoT Planner server that keeps the agent, vector store and embedding model warm
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class PlannerServer(ThreadingHTTPServer):
+    """HTTP server holding a single warm planner shared by all request threads"""
+
+    daemon_threads = False  # let in-flight requests finish on shutdown
+    block_on_close = True
+
+    def __init__(self, address, planner_factory=None, db_path="./chroma_db"):
+        super().__init__(address, PlannerRequestHandler)
+        self.planner_factory = planner_factory
+        self.db_path = db_path
+        self.planner = None
+        self.ready = threading.Event()
+        self.warmup_error = None
+
+    def warm_up(self):
+        """Build the planner and open the vector store once, then mark the server ready"""
+        from rag.tool import rag_query
+
+        try:
+            if self.planner_factory is None:
+                from .iot_planner import build_iot_planner
+
+                self.planner_factory = build_iot_planner
+            self.planner = self.planner_factory()
+            # A first query opens the store, indexes it if needed and loads the embedding model
+            rag_query("IoT", top_k=1, db_path=self.db_path)
+            warm_up_blueprints()
+            self.ready.set()
+            print("✅ Planner server ready")
+        except Exception as e:
+            self.warmup_error = str(e)
+            print(f"❌ Planner warm-up failed: {e}")
+
+
+def warm_up_blueprints():
+    """Embed the blueprint component catalog up front when semantic matching is enabled"""
+    from .tools.blueprint_matcher import get_blueprint_matcher
+    from .tools.iot_blueprint_generator import (
+        IOT_COMPONENT_DESCRIPTIONS,
+        IOT_COMPONENT_HEURISTICS,
+    )
+    from .tools.semantic_blueprint import get_matching_mode, get_semantic_index
+
+    if get_matching_mode() == "semantic":
+        get_semantic_index(
+            get_blueprint_matcher(IOT_COMPONENT_HEURISTICS, IOT_COMPONENT_DESCRIPTIONS)
+        )
+
+
+class PlannerRequestHandler(BaseHTTPRequestHandler):
+    """Routes health, readiness, planning and raw RAG requests"""
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            if self.server.ready.is_set():
+                self._send_json(200, {"status": "ready"})
+            else:
+                self._send_json(
+                    503, {"status": "starting", "error": self.server.warmup_error}
+                )
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        routes = {"/plan": self._handle_plan, "/rag": self._handle_rag}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+
+        if not isinstance(payload, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+        query = payload.get("query")
+        if query is not None and not isinstance(query, str):
+            self._send_json(400, {"error": "'query' must be a string"})
+            return
+        query = (query or "").strip()
+        if not query:
+            self._send_json(400, {"error": "Missing 'query'"})
+            return
+        # A null budget_s or max_turns means no limit; top_k has no such meaning
+        for field, kinds, kind_name, nullable in (
+            ("budget_s", (int, float), "number", True),
+            ("max_turns", int, "integer", True),
+            ("top_k", int, "integer", False),
+        ):
+            value = payload.get(field)
+            if value is None and (nullable or field not in payload):
+                continue
+            if isinstance(value, bool) or not isinstance(value, kinds) or value <= 0:
+                self._send_json(400, {"error": f"'{field}' must be a positive {kind_name}"})
+                return
+        if not self.server.ready.is_set():
+            self._send_json(503, {"error": "Planner is not ready yet"})
+            return
+
+        try:
+            self._send_json(200, handler(query, payload))
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _handle_plan(self, query, payload):
+        from evaluation.evaluation_utils import record_evaluation_metrics
+
+        from .agent import process_query
+
+        response, evaluation_summary = process_query(
+            self.server.planner,
+            query,
+            budget_s=payload.get("budget_s"),
+            max_turns=payload.get("max_turns"),
+        )
+        record_evaluation_metrics(query, evaluation_summary)
+        return {"query": query, "response": response, "evaluation_summary": evaluation_summary}
+
+    def _handle_rag(self, query, payload):
+        from rag.budget import RequestBudget, budget_scope
+        from rag.tool import rag_query
+
+        with budget_scope(RequestBudget(budget_s=payload.get("budget_s"))):
+            results = rag_query(query, payload.get("top_k", 5), db_path=self.server.db_path)
+        return {"query": query, "results": [asdict(r) for r in results]}
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, db_path="./chroma_db"):
+    """Run the planner server until SIGINT/SIGTERM, then drain in-flight requests"""
+    from .tracer import shutdown_tracing
+
+    server = PlannerServer((host, port), db_path=db_path)
+
+    def request_shutdown(signum, frame):
+        print("\n🛑 Shutting down planner server...")
+        # shutdown() blocks until serve_forever returns, so it can't run on the serving thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    threading.Thread(target=server.warm_up, daemon=True).start()
+    print(f"🚀 Planner server listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # Export the spans still queued for the last batch
+        shutdown_tracing()
+    print("👋 Planner server stopped")
+
+
+def main():
+    """Run the IoT Planner as a long-running local server"""
+    parser = argparse.ArgumentParser(
+        description="IoT Planner Server - Keep the planner warm between requests"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind to")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--db_path", default="./chroma_db", help="Path to the vector store")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.db_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
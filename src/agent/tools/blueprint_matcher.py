@@ -0,0 +1,173 @@
+"""
+Compiled keyword matcher for the blueprint heuristics.
+
+All keywords of a heuristics table are compiled once into a lookup of word sequences, and
+a request is matched in a single pass over its words, instead of substring-scanning the
+request once per keyword.
+
+A heuristics table maps each component type to its options in priority order:
+    {"sensor": [("DHT22 Temperature & Humidity Sensor", ["temperature", "humidity"]), ...]}
+Tables can be loaded from a JSON file of the same shape, where each option is either a
+[label, keywords] pair or a {"label", "keywords", "description"} object. Set
+IOT_BLUEPRINT_HEURISTICS to such a file to replace the built-in table.
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+# Component types that are left out of a blueprint unless one of their keywords matches
+OPTIONAL_COMPONENT_TYPES = {"display"}
+
+
+@dataclass
+class ComponentOption:
+    """One component a blueprint can recommend, and the request keywords that select it"""
+
+    label: str
+    keywords: list[str]
+    description: str = ""
+
+
+@dataclass
+class Heuristics:
+    """Component options per component type, in priority order"""
+
+    options: dict[str, list[ComponentOption]] = field(default_factory=dict)
+
+    @classmethod
+    def from_table(cls, table: dict, descriptions: dict = None):
+        """
+        Build from a {type: [(label, keywords) | {"label", "keywords", ...}]} mapping.
+
+        Args:
+            table (dict): Component options per type, in priority order.
+            descriptions (dict): Label -> description for options that don't carry one.
+        """
+        descriptions = descriptions or {}
+        options = {}
+        for comp_type, entries in table.items():
+            options[comp_type] = [
+                ComponentOption(
+                    label=entry["label"],
+                    keywords=list(entry.get("keywords", [])),
+                    description=entry.get("description") or descriptions.get(entry["label"], ""),
+                )
+                if isinstance(entry, dict)
+                else ComponentOption(
+                    label=entry[0],
+                    keywords=list(entry[1]),
+                    description=descriptions.get(entry[0], ""),
+                )
+                for entry in entries
+            ]
+        return cls(options)
+
+
+def load_heuristics(path: str) -> Heuristics:
+    """Load a heuristics table from a JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return Heuristics.from_table(json.load(f))
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_keyword(text: str) -> str:
+    """Lowercase alphanumeric words of a keyword, space-joined; punctuation only separates"""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+class BlueprintMatcher:
+    """
+    Matches requests against every keyword of a heuristics table in one pass.
+
+    Keywords are compiled into a hash of normalized word sequences, so matching is a scan
+    over the request's words with constant-time lookups, independent of the table size.
+    Keywords only match whole words ("usb" not in "busbar"), optionally as a plural.
+    """
+
+    def __init__(self, heuristics: Heuristics):
+        self.heuristics = heuristics
+
+        # normalized keyword -> [(component type, option priority)]
+        self.keyword_targets = {}
+        for comp_type, options in heuristics.options.items():
+            for priority, option in enumerate(options):
+                for keyword in option.keywords:
+                    keyword = normalize_keyword(keyword)
+                    if keyword:
+                        self.keyword_targets.setdefault(keyword, []).append((comp_type, priority))
+
+        # Leading words of multi-word keywords, so a scan only extends a phrase while some
+        # keyword still starts with it
+        self.phrase_prefixes = set()
+        for keyword in self.keyword_targets:
+            words = keyword.split(" ")
+            for end in range(1, len(words)):
+                self.phrase_prefixes.add(" ".join(words[:end]))
+
+    def matched_keywords(self, request: str) -> set[str]:
+        """Normalized keywords occurring as whole words in the request"""
+        targets = self.keyword_targets
+        words = _WORD.findall(request.lower())
+        found = set()
+        for start, word in enumerate(words):
+            phrase = word
+            end = start
+            while True:
+                if phrase in targets:
+                    found.add(phrase)
+                # Plurals: "relays", "switches", "batteries" (but "gas" is not "ga")
+                if phrase.endswith("s") and len(words[end]) > 3:
+                    for singular in (phrase[:-1], phrase[:-2], phrase[:-3] + "y"):
+                        if singular in targets:
+                            found.add(singular)
+                end += 1
+                if end == len(words) or phrase not in self.phrase_prefixes:
+                    break
+                phrase = f"{phrase} {words[end]}"
+        return found
+
+    def match(self, request: str) -> dict:
+        """
+        Return {component type: label} for the types with a keyword hit, choosing the
+        highest-priority option whose keyword occurs in the request.
+        """
+        best = {}
+        for keyword in self.matched_keywords(request):
+            for comp_type, priority in self.keyword_targets[keyword]:
+                if priority < best.get(comp_type, len(self.heuristics.options[comp_type])):
+                    best[comp_type] = priority
+        return {
+            comp_type: self.heuristics.options[comp_type][priority].label
+            for comp_type, priority in best.items()
+        }
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_blueprint_matcher(default_table: dict, default_descriptions=None) -> BlueprintMatcher:
+    """
+    Process-wide matcher for the IOT_BLUEPRINT_HEURISTICS file, or for default_table (with
+    default_descriptions) when unset. A file is recompiled when its modification time changes.
+    """
+    path = os.getenv("IOT_BLUEPRINT_HEURISTICS", "")
+    key = (path, os.stat(path).st_mtime_ns) if path else ("", id(default_table))
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(key)
+            if matcher is None:
+                if path:
+                    heuristics = load_heuristics(path)
+                else:
+                    heuristics = Heuristics.from_table(default_table, default_descriptions)
+                matcher = BlueprintMatcher(heuristics)
+                _matchers.clear()
+                _matchers[key] = matcher
+    return matcher
@@ -0,0 +1,234 @@
+import re
+
+import numpy as np
+from langchain_core.tools import tool
+
+from .component_sourcing_tool import find_component_offers
+from .tool_output import dump_json, is_compact
+
+
+@tool
+def bom_quoting_tool(bill_of_materials: str, units: int = 1) -> str:
+    """
+    BOM Quoting Tool: This tool prices a complete bill of materials. For every line it picks
+    the cheapest vendor that can supply the full quantity, or the cheapest split across
+    vendors when no single vendor has enough stock, and returns the totals. Use it instead of
+    comparing Component Sourcing offers yourself when quantities or build sizes matter.
+
+    Args:
+        bill_of_materials: Comma-separated component names, each optionally with a quantity
+                           per unit, e.g. "ESP32-WROOM-32, DHT22 Temperature & Humidity
+                           Sensor x2, 3 x SG90 Micro Servo". Part numbers are accepted too.
+        units: Number of units to build (at least 1); every line quantity is multiplied by it.
+
+    Returns:
+        JSON string containing:
+        - lines (list): Per component (listing one twice adds up its quantities): component,
+          quantity (total required), status ("ok", "split", "short" if total stock is
+          insufficient, "not_found"), allocations ([{vendor, part_number, quantity,
+          unit_price, cost}]), cost and shortfall
+        - total_cost (float): Cost of all allocations in USD
+        - unit_cost (float): total_cost divided by units
+        - vendor_totals (dict): Cost per vendor
+        - fully_sourced (bool): True if every line is covered in full
+        In compact mode, each line's allocations are rows of the fields in "allocation_fields".
+    """
+    lines = parse_bill_of_materials(bill_of_materials)
+    try:
+        quote = quote_bom(lines, units=units)
+    except ValueError as e:
+        return dump_json({"error": str(e)})
+
+    if is_compact():
+        return dump_json(_compact_quote(quote))
+    return dump_json(quote)
+
+
+_QUANTITY_SUFFIX = re.compile(r"^(?P<name>.+?)\s*(?:[x×*]\s*|:\s*)(?P<quantity>\d+)$", re.I)
+_QUANTITY_PREFIX = re.compile(r"^(?P<quantity>\d+)\s*(?:[x×*]\s*)(?P<name>.+)$", re.I)
+
+
+def parse_bill_of_materials(text: str) -> list[tuple[str, int]]:
+    """Parse "name x2, 3 x name, name:4, name" into (name, quantity) pairs"""
+    lines = []
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        match = _QUANTITY_SUFFIX.match(entry) or _QUANTITY_PREFIX.match(entry)
+        if match:
+            lines.append((match.group("name").strip(), int(match.group("quantity"))))
+        else:
+            lines.append((entry, 1))
+    return lines
+
+
+def allocate(prices: np.ndarray, stocks: np.ndarray, required: np.ndarray, allow_split=True):
+    """
+    Choose how many units of each BOM line to buy from each offer.
+
+    Lines that some offer can fill alone go entirely to the cheapest such offer. Other lines
+    are split across offers in price order, which is the cheapest split since costs are
+    linear in quantity; whatever stock can't cover is left as a shortfall.
+
+    Args:
+        prices (np.ndarray): (lines, offers) unit prices, np.inf for padding/unpriced offers.
+        stocks (np.ndarray): (lines, offers) available stock, 0 for padding.
+        required (np.ndarray): (lines,) quantities to buy.
+        allow_split (bool): If False, lines no single offer can fill are not bought at all.
+
+    Returns:
+        np.ndarray: (lines, offers) quantities to buy.
+    """
+    line_count, offer_count = prices.shape
+    take = np.zeros((line_count, offer_count), dtype=np.int64)
+    if offer_count == 0:
+        return take
+    rows = np.arange(line_count)
+
+    priced = np.isfinite(prices)
+    feasible = priced & (stocks >= required[:, None])
+    single = feasible.any(axis=1) & (required > 0)
+    best = np.argmin(np.where(feasible, prices, np.inf), axis=1)
+    take[rows[single], best[single]] = required[single]
+
+    if allow_split:
+        split = ~single & (required > 0)
+        order = np.argsort(prices[split], axis=1, kind="stable")
+        sorted_stock = np.take_along_axis(np.where(priced[split], stocks[split], 0), order, 1)
+        before = np.cumsum(sorted_stock, axis=1) - sorted_stock
+        sorted_take = np.clip(required[split, None] - before, 0, sorted_stock)
+        split_take = np.zeros_like(sorted_take)
+        np.put_along_axis(split_take, order, sorted_take, axis=1)
+        take[split] = split_take
+    return take
+
+
+def quote_bom(lines, units: int = 1, offers=None, allow_split=True) -> dict:
+    """
+    Price a bill of materials across all vendor offers.
+
+    Args:
+        lines (list[tuple[str, int]]): (component name or part number, quantity per unit).
+        units (int): Number of units to build.
+        offers (dict): find_component_offers result to quote from; looked up if omitted.
+        allow_split (bool): Whether a line may be split across vendors.
+
+    Lines naming the same component are merged, so they draw on its stock together.
+
+    Raises:
+        ValueError: If units is less than 1.
+    """
+    units = int(units)
+    if units < 1:
+        raise ValueError(f"units must be at least 1, got {units}")
+    merged = {}
+    for name, quantity in lines:
+        merged[name] = merged.get(name, 0) + quantity
+    lines = list(merged.items())
+    if offers is None:
+        offers = find_component_offers([name for name, _ in lines])
+
+    line_offers = [offers.get(name, []) for name, _ in lines]
+    width = max((len(o) for o in line_offers), default=0)
+    prices = np.full((len(lines), width), np.inf)
+    stocks = np.zeros((len(lines), width), dtype=np.int64)
+    for i, candidates in enumerate(line_offers):
+        for j, offer in enumerate(candidates):
+            if offer.get("price") is not None:
+                prices[i, j] = offer["price"]
+            stocks[i, j] = offer.get("stock") or 0
+    required = np.array([quantity for _, quantity in lines], dtype=np.int64) * units
+
+    take = allocate(prices, stocks, required, allow_split=allow_split)
+    costs = np.where(take > 0, prices, 0.0) * take
+    line_costs = costs.sum(axis=1)
+    shortfall = required - take.sum(axis=1)
+
+    # Only the non-zero allocations are turned back into Python objects
+    allocations = [[] for _ in lines]
+    vendor_totals = {}
+    line_ids, offer_ids = np.nonzero(take)
+    for i, j, quantity, unit_price, cost in zip(
+        line_ids.tolist(),
+        offer_ids.tolist(),
+        take[line_ids, offer_ids].tolist(),
+        prices[line_ids, offer_ids].tolist(),
+        costs[line_ids, offer_ids].tolist(),
+    ):
+        offer = line_offers[i][j]
+        allocations[i].append(
+            {
+                "vendor": offer["vendor"],
+                "part_number": offer["part_number"],
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "cost": round(cost, 2),
+            }
+        )
+        vendor_totals[offer["vendor"]] = vendor_totals.get(offer["vendor"], 0.0) + cost
+
+    result_lines = []
+    for (name, _), candidates, line_allocations, quantity, cost, short in zip(
+        lines,
+        line_offers,
+        allocations,
+        required.tolist(),
+        line_costs.tolist(),
+        shortfall.tolist(),
+    ):
+        if not candidates:
+            status = "not_found"
+        elif short > 0:
+            status = "short"
+        else:
+            status = "split" if len(line_allocations) > 1 else "ok"
+        line = {
+            "component": name,
+            "quantity": quantity,
+            "status": status,
+            "allocations": line_allocations,
+            "cost": round(cost, 2),
+            "shortfall": short,
+        }
+        for offer in candidates:
+            if "matched_name" in offer:
+                line["matched_name"] = offer["matched_name"]
+                break
+        result_lines.append(line)
+
+    total_cost = float(line_costs.sum())
+    return {
+        "units": units,
+        "lines": result_lines,
+        "total_cost": round(total_cost, 2),
+        "unit_cost": round(total_cost / units, 2),
+        "vendor_totals": {vendor: round(total, 2) for vendor, total in vendor_totals.items()},
+        "fully_sourced": bool((shortfall == 0).all()) and all(line_offers),
+    }
+
+
+ALLOCATION_FIELDS = ["vendor", "part_number", "quantity", "unit_price"]
+
+
+def _compact_quote(quote):
+    """Write each line as [component, quantity, status, allocation rows, shortfall]"""
+    return {
+        "units": quote["units"],
+        "line_fields": ["component", "quantity", "status", "allocations", "shortfall"],
+        "allocation_fields": ALLOCATION_FIELDS,
+        "lines": [
+            [
+                line["component"],
+                line["quantity"],
+                line["status"],
+                [[a[field] for field in ALLOCATION_FIELDS] for a in line["allocations"]],
+                line["shortfall"],
+            ]
+            for line in quote["lines"]
+        ],
+        "total_cost": quote["total_cost"],
+        "unit_cost": quote["unit_cost"],
+        "vendor_totals": quote["vendor_totals"],
+        "fully_sourced": quote["fully_sourced"],
+    }
@@ -1,7 +1,18 @@
-from langchain.tools import tool
-from typing import List, Dict
-import os
-import json
+from langchain_core.tools import tool
+
+from rag.budget import current_budget, note_degradation
+from rag.single_flight import SingleFlight, coalescing_enabled
+
+from ..inventory.backends import (
+    CatalogBackend,
+    fetch_offers,
+    get_default_backends,
+    merge_offers,
+)
+from .tool_output import dump_json, is_compact
+
+# Identical lookups from concurrent runs query the configured vendors once
+_vendor_lookups = SingleFlight("vendor_lookup")
 
 
 @tool
@@ -15,6 +26,7 @@ def component_sourcing_tool(component_types: str) -> str:
         component_types: Comma-separated list of component names to search for.
                         These should be specific component names like "ESP32-WROOM-32",
                         "DHT22 Temperature & Humidity Sensor", "HC-SR501 PIR Motion Sensor".
+                        Vendor part numbers are accepted as well.
 
     Returns:
         JSON string containing vendor information for each component including:
@@ -24,48 +36,111 @@ def component_sourcing_tool(component_types: str) -> str:
         - stock (int): Available inventory quantity
         - technical_specs (dict): Current consumption (mA) and voltage requirements
         - part_number (str): Vendor-specific part number
+        - matched_name (str): Catalog name used when the requested name had no exact match
+        Names without an exact match also get ranked {"name", "score"} candidates under
+        "suggestions"; retry with one of those names if no offers were returned.
+        Vendors that failed or timed out are listed under "vendor_errors"; offers from the
+        remaining vendors are still returned.
+        In compact mode, vendor URLs are listed once under "vendors" and each offer is a row
+        of the fields named in "offer_fields".
     """
     component_list = [comp.strip() for comp in component_types.split(",") if comp.strip()]
+    results = find_component_offers(component_list)
+
+    if is_compact():
+        return dump_json(_compact_offers(results))
+    return dump_json(results)
+
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    root_dir = os.path.normpath(os.path.join(current_dir, "../../../"))
-    inventory_files = {
-        "Digi-Key": os.path.join(root_dir, "mock_inventory", "mock_digikey_inventory.json"),
-        "AliExpress": os.path.join(root_dir, "mock_inventory", "mock_aliexpress_inventory.json"),
-    }
-    vendor_urls = {
-        "Digi-Key": "https://www.digikey.com/",
-        "AliExpress": "https://www.aliexpress.com/",
-    }
-
-    inventories = {}
-    for vendor, path in inventory_files.items():
+def find_component_offers(component_list, catalog=None, backends=None):
+    """
+    Return {component name: [offer dicts]} for every vendor carrying each component.
+
+    Names without an exact (or part-number) match are looked up approximately. Their ranked
+    candidates are listed under "suggestions", and the offers of an unambiguous best
+    candidate are returned with a "matched_name" field. Vendors are queried concurrently;
+    any that failed or timed out are listed under "vendor_errors" and the rest are returned.
+    Within a request budget, vendors are only waited for until the deadline.
+
+    Args:
+        component_list (list[str]): Component names or part numbers.
+        catalog: Inventory to search instead of the configured vendor backends.
+        backends (list[VendorBackend]): Vendor backends to query (default: configured ones).
+    """
+    coalesce = False
+    if catalog is not None:
+        backends = [CatalogBackend(catalog)]
+    elif backends is None:
+        backends = get_default_backends()
+        coalesce = coalescing_enabled()
+
+    budget = current_budget()
+    timeout = budget.remaining() if budget is not None else None
+    if coalesce:
         try:
-            with open(path, "r") as f:
-                inventories[vendor] = json.load(f)
-        except Exception as e:
-            inventories[vendor] = {}
-
-    results = {}
-    for comp in component_list:
-        offers = []
-        for vendor, inv in inventories.items():
-            for category, items in inv.items():
-                for item in items:
-                    if item.get("name", "").strip().lower() == comp.strip().lower():
-                        offer = {
-                            "vendor": vendor,
-                            "vendor_url": vendor_urls[vendor],
-                            "price": item.get("price"),
-                            "stock": item.get("stock"),
-                            "technical_specs": {
-                                "mA": item.get("mA"),
-                                "voltage": item.get("voltage"),
-                            },
-                            "part_number": item.get("part_number"),
-                            "category": category,
-                        }
-                        offers.append(offer)
-        results[comp] = offers
-
-    return json.dumps(results, indent=2)
+            (responses, errors), _ = _vendor_lookups.do(
+                (tuple(component_list), tuple(backend.name for backend in backends)),
+                lambda: fetch_offers(backends, component_list, timeout=timeout),
+                timeout=timeout,
+                # Offers cut short by this request's deadline aren't shared with callers
+                # that have more time left; they look the vendors up themselves
+                share=lambda lookup: not _cut_by_deadline(backends, lookup[1], timeout),
+            )
+        except TimeoutError:
+            responses, errors = [], {b.name: "skipped: deadline passed" for b in backends}
+    else:
+        responses, errors = fetch_offers(backends, component_list, timeout=timeout)
+    if budget is not None and errors and budget.expired():
+        note_degradation("component_sourcing", f"no offers from {', '.join(errors)}")
+    results = merge_offers(responses, component_list)
+    if errors:
+        results["vendor_errors"] = errors
+    return results
+
+
+def _cut_by_deadline(backends, errors, timeout) -> bool:
+    """True if a vendor that failed was given less than its own timeout"""
+    return timeout is not None and any(
+        backend.name in errors and backend.timeout > timeout for backend in backends
+    )
+
+
+COMPACT_OFFER_FIELDS = ["vendor", "part_number", "price", "stock", "mA", "voltage", "category"]
+
+
+def _compact_offers(results):
+    """Move the per-offer vendor URL into a shared vendor table and write offers as rows"""
+    vendors = {}
+    matched = {}
+    compact_results = {}
+    for comp, offers in results.items():
+        if comp in ("suggestions", "vendor_errors"):
+            continue
+        compact_offers = []
+        for offer in offers:
+            vendors[offer["vendor"]] = offer["vendor_url"]
+            if "matched_name" in offer:
+                matched[comp] = offer["matched_name"]
+            compact_offers.append(
+                [
+                    offer["vendor"],
+                    offer["part_number"],
+                    offer["price"],
+                    offer["stock"],
+                    offer["technical_specs"]["mA"],
+                    offer["technical_specs"]["voltage"],
+                    offer["category"],
+                ]
+            )
+        compact_results[comp] = compact_offers
+    compact = {"vendors": vendors, "offer_fields": COMPACT_OFFER_FIELDS, "results": compact_results}
+    if matched:
+        compact["matched_names"] = matched
+    if "suggestions" in results:
+        compact["suggestions"] = {
+            comp: [[candidate["name"], candidate["score"]] for candidate in candidates]
+            for comp, candidates in results["suggestions"].items()
+        }
+    if "vendor_errors" in results:
+        compact["vendor_errors"] = results["vendor_errors"]
+    return compact
@@ -0,0 +1,86 @@
+from langchain_core.tools import tool
+
+from rag.budget import current_budget, note_degradation
+
+from .component_sourcing_tool import find_component_offers
+from .iot_blueprint_generator import generate_blueprint
+from .power_battery_estimator import estimate_power
+from .tool_output import dump_json
+
+
+@tool
+def design_pipeline_tool(user_request: str) -> str:
+    """
+    Design Pipeline Tool: Runs the Blueprint Generator, Component Sourcing and Power Battery
+    Estimator in one step. Use this instead of calling those three tools one after another;
+    call them individually only to refine a specific part of the design.
+
+    Args:
+        user_request: User's natural language request for an IoT system describing
+                     the desired functionality, environment, or specific requirements.
+
+    Returns:
+        JSON string containing:
+        - components (dict): For each component type, the chosen component with the best
+          in-stock offer (vendor, part_number, price, stock, mA, voltage), or no offer
+          fields if no vendor carries it
+        - total_price (float): Sum of the chosen offers' prices in USD
+        - power (dict): Power Battery Estimator output for the components with known
+          current and voltage
+        - skipped (list): Steps left out because the request's time budget ran low; the
+          components then only have names, and total_price and power are null
+    """
+    return dump_json(run_design_pipeline(user_request))
+
+
+def select_best_offer(offers):
+    """Cheapest offer that is in stock, falling back to the cheapest offer overall"""
+    priced = [offer for offer in offers if offer.get("price") is not None]
+    in_stock = [offer for offer in priced if (offer.get("stock") or 0) > 0]
+    candidates = in_stock or priced
+    return min(candidates, key=lambda offer: offer["price"]) if candidates else None
+
+
+def run_design_pipeline(user_request: str) -> dict:
+    """Blueprint -> sourcing -> power estimation, passing exact specs between the steps"""
+    blueprint = generate_blueprint(user_request)
+    budget = current_budget()
+    if budget is not None and budget.low():
+        # Sourcing waits on vendors; the blueprint alone still lets the agent answer
+        note_degradation("design_pipeline", "budget low; sourcing and power estimation skipped")
+        return {
+            "components": {comp_type: {"name": name} for comp_type, name in blueprint.items()},
+            "total_price": None,
+            "power": None,
+            "skipped": ["component_sourcing", "power_estimation"],
+        }
+    offers = find_component_offers(list(blueprint.values()))
+
+    components = {}
+    power_inputs = {}
+    total_price = 0.0
+    for comp_type, name in blueprint.items():
+        best = select_best_offer(offers.get(name, []))
+        if best is None:
+            components[comp_type] = {"name": name}
+            continue
+
+        specs = best["technical_specs"]
+        components[comp_type] = {
+            "name": name,
+            "vendor": best["vendor"],
+            "part_number": best["part_number"],
+            "price": best["price"],
+            "stock": best["stock"],
+        }
+        total_price += best["price"]
+        # Enclosures and power sources carry no load figures, so they don't enter the estimate
+        if specs["mA"] is not None and specs["voltage"] is not None:
+            components[comp_type].update(specs)
+            power_inputs[name] = {"voltage": specs["voltage"], "mA": specs["mA"]}
+
+    return {
+        "components": components,
+        "total_price": round(total_price, 2),
+        "power": estimate_power(power_inputs),
+    }
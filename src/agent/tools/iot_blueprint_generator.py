@@ -1,6 +1,11 @@
-from langchain.tools import tool
+from langchain_core.tools import tool
 
-# Static object for heuristics and component options
+from .blueprint_matcher import OPTIONAL_COMPONENT_TYPES, get_blueprint_matcher
+from .semantic_blueprint import MIN_OPTIONAL_SCORE, get_matching_mode, get_semantic_index
+from .tool_output import is_compact
+
+# Static object for heuristics and component options, in priority order per component type.
+# Replaced by the JSON file at IOT_BLUEPRINT_HEURISTICS when set (see blueprint_matcher).
 IOT_COMPONENT_HEURISTICS = {
     "microcontroller": [
         ("ESP32-WROOM-32", ["wifi", "wireless", "remote"]),
@@ -46,12 +51,55 @@ IOT_COMPONENT_HEURISTICS = {
     ],
 }
 
+# What each component is for, embedded together with its label and keywords when
+# IOT_BLUEPRINT_MATCHING=semantic
+IOT_COMPONENT_DESCRIPTIONS = {
+    "ESP32-WROOM-32": "Wi-Fi and Bluetooth microcontroller for connected, cloud-reporting devices",
+    "ESP32 Mini DevKit": "Compact ESP32 development board for small wireless prototypes",
+    "STM32F103C8T6": "Low-power ARM microcontroller for battery-powered and Bluetooth devices",
+    "STM32F103C8T6 Maple": "Maple-compatible STM32 board for hobby and prototyping projects",
+    "Nano V3.0 ATmega328P": "Simple 8-bit microcontroller board for wired, standalone controllers",
+    "HC-SR501 PIR Motion Sensor": "Detects people and animals moving, for security and occupancy",
+    "EKMB PIR Motion Detector": "Low-current motion detector for battery-powered occupancy sensing",
+    "DHT22 Temperature & Humidity Sensor": (
+        "Measures air temperature and relative humidity, for climate, weather, HVAC and "
+        "greenhouse monitoring"
+    ),
+    "AM2302 Temp & Humidity": "Wired temperature and humidity probe for indoor climate logging",
+    "SEN0193 Soil Moisture": (
+        "Capacitive probe measuring water content in soil, for plant watering and irrigation"
+    ),
+    "Songle SRD-05VDC-SL-C Relay": "Switches appliances, lights, pumps and heaters on and off",
+    "JQC-3FF-S-Z Relay": "Small signal relay for switching low-voltage loads",
+    "Firgelli L12 Linear Actuator": "Pushes and pulls to open windows, vents, hatches and doors",
+    "Actuonix L12 Mini Actuator": "Miniature linear actuator for small mechanical movements",
+    "DFRobot Solenoid Valve": "Opens and closes water flow for irrigation, sprinklers and pumps",
+    "Nextion NX3224T024 Touchscreen": "Touch screen user interface for control panels",
+    "Nextion 2.4in Touchscreen": "Small touch display for compact control panels",
+    "Waveshare 7inch HDMI LCD": "Large screen for dashboards and kiosks",
+    "Waveshare 7in HDMI LCD": "7-inch HDMI monitor for dashboards",
+    "Heltec 0.96in OLED": "Tiny screen showing readings and status on the device",
+    "Lithium Ion Battery Pack": "Rechargeable battery for portable and wireless devices",
+    "Keeppower 18650 Battery": "High-capacity 18650 cell for long battery life",
+    "USB Power Adapter": "Mains-powered USB supply for devices near an outlet",
+    "Anker USB Power Adapter": "Reliable USB wall charger for indoor devices",
+    "ALLPOWERS 5V Solar Panel": (
+        "Solar panel for off-grid outdoor devices in fields, farms and greenhouses"
+    ),
+    "IP65 Weatherproof Enclosure": "Sealed case protecting electronics outdoors from rain and dust",
+    "IP66 Outdoor Enclosure": "Heavy-duty outdoor case against water jets and humidity",
+    "Wall-Mount ABS Box": "Plastic box mounted on an indoor wall",
+    "SZOMK Wall-Mount Box": "Indoor wall-mounted project box",
+    "Hammond Clear Case": "Transparent desktop case for indoor prototypes",
+}
+
 
 @tool
 def iot_blueprint_generator(user_request: str) -> str:
     """
     IoT Blueprint Generator: This tool produces a starting component set by analyzing
-    keywords in the user's request and matching them to appropriate IoT components.
+    keywords (and, in semantic mode, the meaning) of the user's request and matching them
+    to appropriate IoT components.
 
     Args:
         user_request: User's natural language request for an IoT system describing
@@ -65,23 +113,12 @@ def iot_blueprint_generator(user_request: str) -> str:
         - Display (user interface, if applicable)
         - Power supply (power source)
         - Device case (enclosure/housing)
+        In compact mode, the same recommendations are returned on one "; "-separated line.
     """
-    req = user_request.lower()
-    components = {}
+    components = generate_blueprint(user_request)
 
-    for comp_type, options in IOT_COMPONENT_HEURISTICS.items():
-        found = False
-        for label, keywords in options:
-            if keywords and any(word in req for word in keywords):
-                components[comp_type] = label
-                found = True
-                break
-        if not found:
-            # For display, only add if a keyword matched
-            if comp_type == "display":
-                continue
-            # Otherwise, use the last (default) option
-            components[comp_type] = options[-1][0]
+    if is_compact():
+        return "; ".join(f"{comp_type}: {label}" for comp_type, label in components.items())
 
     # Format as bullet-pointed string
     bullet_points = [
@@ -89,3 +126,35 @@ def iot_blueprint_generator(user_request: str) -> str:
         for comp_type, label in components.items()
     ]
     return "\n".join(bullet_points)
+
+
+def generate_blueprint(user_request: str, mode: str = None) -> dict:
+    """
+    Return {component type: component label} matched from the request.
+
+    Keyword matches always win. In semantic mode (IOT_BLUEPRINT_MATCHING=semantic), the
+    remaining types get the option whose embedding is closest to the request instead of
+    the last (default) option; optional types only on a clear semantic match.
+    """
+    matcher = get_blueprint_matcher(IOT_COMPONENT_HEURISTICS, IOT_COMPONENT_DESCRIPTIONS)
+    matched = matcher.match(user_request)
+    semantic = {}
+    if (mode or get_matching_mode()) == "semantic" and len(matched) < len(
+        matcher.heuristics.options
+    ):
+        semantic = get_semantic_index(matcher).best_matches(user_request)
+    components = {}
+
+    for comp_type, options in matcher.heuristics.options.items():
+        if comp_type in matched:
+            components[comp_type] = matched[comp_type]
+        elif comp_type in semantic and (
+            comp_type not in OPTIONAL_COMPONENT_TYPES
+            or semantic[comp_type][1] >= MIN_OPTIONAL_SCORE
+        ):
+            components[comp_type] = semantic[comp_type][0]
+        elif comp_type not in OPTIONAL_COMPONENT_TYPES and options:
+            # Otherwise, use the last (default) option
+            components[comp_type] = options[-1].label
+
+    return components
@@ -1,10 +1,18 @@
-from langchain.tools import tool
-from typing import Dict, Any
+from langchain_core.tools import tool
 import json
 
+from .power_simulation import ComponentLoad, has_schedule, recommend_battery, simulate_power
+from .solar_sizing import size_solar
+from .tool_output import dump_json
+
+# Runtime the recommended battery must reach for duty-cycled loads
+DEFAULT_TARGET_DAYS = 30.0
+
 
 @tool
-def power_battery_estimator(components_json: str) -> str:
+def power_battery_estimator(
+    components_json: str, target_days: float = DEFAULT_TARGET_DAYS, solar: bool = False
+) -> str:
     """
     Power & Battery Estimator Tool: This tool calculates total power consumption, estimates daily
     energy usage, and recommends appropriate battery types and sizes for IoT devices. Use this tool
@@ -14,6 +22,12 @@ def power_battery_estimator(components_json: str) -> str:
     Args:
         components_json: JSON string containing component specifications with voltage and current values.
                         Format: '{"ESP32": {"voltage": 3.3, "mA": 120}, "DHT22": {"voltage": 3.3, "mA": 1.5}}'
+                        For components that sleep most of the time, add "sleep_mA" and a
+                        schedule: "active_s" out of every "period_s" seconds (or a
+                        "duty_cycle" fraction), e.g. {"voltage": 3.3, "mA": 120,
+                        "sleep_mA": 0.01, "active_s": 2, "period_s": 600}.
+        target_days: Runtime the recommended battery should reach when schedules are given.
+        solar: Also size a solar panel and battery for year-round outdoor operation.
 
     Returns:
         JSON string containing power analysis including:
@@ -23,6 +37,12 @@ def power_battery_estimator(components_json: str) -> str:
         - estimated_daily_consumption_Wh (float): Daily energy consumption in watt-hours
         - recommended_battery (str): Suggested battery type and capacity
         - estimated_runtime_hours (float): Expected runtime with recommended battery
+        When any component has a schedule, the loads are simulated instead and the result
+        contains average_power_W, peak_power_W, estimated_daily_consumption_Wh, duty_cycles,
+        rails (average power and regulator efficiency per voltage rail),
+        recommended_battery (chemistry, capacity_mAh, ...) and estimated_runtime_hours/days.
+        With solar, a "solar" entry holds the smallest panel_W and battery_Wh with zero
+        downtime_days over a year of hourly irradiance.
     """
 
     try:
@@ -30,6 +50,30 @@ def power_battery_estimator(components_json: str) -> str:
     except json.JSONDecodeError:
         return json.dumps({"error": "Invalid JSON format for components"})
 
+    try:
+        return dump_json(estimate_power(components, target_days=target_days, solar=solar))
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+
+
+def estimate_power(
+    components: dict, target_days: float = DEFAULT_TARGET_DAYS, solar: bool = False
+) -> dict:
+    """
+    Power analysis for {component: {"voltage": V, "mA": mA, ...}}.
+
+    Components draw continuously unless some component carries a duty-cycle schedule, in
+    which case the whole set is simulated (see estimate_duty_cycled_power). With solar, a
+    panel and battery are also sized over the configured irradiance profile.
+    """
+    if solar:
+        result = estimate_power(components, target_days)
+        result["solar"] = size_solar(hourly_load_w(components))
+        return result
+
+    if any(has_schedule(vals) for vals in components.values()):
+        return estimate_duty_cycled_power(components, target_days)
+
     # Calculate total current draw (mA) and power (W)
     total_current = 0.0
     voltage_set = set()
@@ -57,7 +101,7 @@ def power_battery_estimator(components_json: str) -> str:
         battery = "Large Li-Ion or external supply (>20000mAh 3.7V)"
         runtime_hr = (20 * 3.7) / total_power_watts if total_power_watts else 0
 
-    result = {
+    return {
         "total_current_mA": total_current,
         "voltage_V": voltage,
         "total_power_W": round(total_power_watts, 2),
@@ -66,4 +110,37 @@ def power_battery_estimator(components_json: str) -> str:
         "estimated_runtime_hours": round(runtime_hr, 2),
     }
 
-    return json.dumps(result, indent=2)
+
+def estimate_duty_cycled_power(components: dict, target_days: float = DEFAULT_TARGET_DAYS) -> dict:
+    """Simulate a day of duty-cycled loads and size a battery for target_days"""
+    loads = [ComponentLoad.from_spec(name, vals) for name, vals in components.items()]
+    profile = simulate_power(loads)
+    battery = recommend_battery(profile.average_w, target_days * 24)
+
+    return {
+        "average_power_W": round(profile.average_w, 6),
+        "peak_power_W": round(profile.peak_w, 3),
+        "estimated_daily_consumption_Wh": round(profile.daily_wh, 4),
+        "duty_cycles": {load.name: round(load.duty_cycle, 6) for load in loads},
+        "rails": {
+            f"{rail:g}V": {
+                "average_power_W": round(float(power.mean()), 6),
+                "regulator_efficiency": profile.rail_efficiency[rail],
+            }
+            for rail, power in profile.rail_power_w.items()
+        },
+        "recommended_battery": battery,
+        "estimated_runtime_hours": round(battery["runtime_hours"], 1),
+        "estimated_runtime_days": round(battery["runtime_hours"] / 24, 1),
+    }
+
+
+def hourly_load_w(components: dict):
+    """Battery-side load for solar sizing: a 24-hour profile for duty-cycled loads"""
+    if any(has_schedule(vals) for vals in components.values()):
+        loads = [ComponentLoad.from_spec(name, vals) for name, vals in components.items()]
+        return simulate_power(loads, step_s=3600).power_w
+    # Continuous draw at the highest voltage, as in the continuous estimate
+    total_ma = sum(vals.get("mA", 0) for vals in components.values())
+    voltage = max((vals.get("voltage", 0) for vals in components.values()), default=0)
+    return total_ma / 1000.0 * voltage
@@ -0,0 +1,247 @@
+"""
+Duty-cycle power simulation for battery-powered IoT devices.
+
+Components are described by their active and sleep currents, a periodic duty-cycle
+schedule (active for active_s out of every period_s) and the voltage rail they run on.
+Each rail is fed from the battery through a regulator with its own efficiency.
+
+The simulation evaluates every component on a common time grid at once: the fraction of
+each time step a component is active is computed exactly from its schedule (so a 20 ms
+radio burst is not lost in a 60 s step), giving a battery-side power profile. Battery
+runtimes are then swept over chemistries x capacities (x load configurations) in one
+broadcast expression instead of a loop per candidate.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Regulator efficiency per rail voltage (battery -> rail); other rails use the default
+DEFAULT_RAIL_EFFICIENCY = {1.8: 0.80, 3.3: 0.85, 5.0: 0.90, 12.0: 0.90}
+DEFAULT_REGULATOR_EFFICIENCY = 0.85
+
+# Duty-cycle period assumed when only a duty_cycle fraction is given
+DEFAULT_PERIOD_S = 60.0
+
+HOURS_PER_MONTH = 30 * 24
+
+
+@dataclass
+class ComponentLoad:
+    """A component's draw on its rail: active_ma for active_s of every period_s, else sleep_ma"""
+
+    name: str
+    voltage: float
+    active_ma: float
+    sleep_ma: float = 0.0
+    active_s: float = None  # None: always active
+    period_s: float = None
+    offset_s: float = 0.0
+
+    @classmethod
+    def from_spec(cls, name: str, spec: dict):
+        """
+        Build from a power estimator spec:
+            {"voltage": 3.3, "mA": 120, "sleep_mA": 0.01, "active_s": 2, "period_s": 600}
+        "duty_cycle" (0-1) may be given instead of active_s; the period then defaults to
+        DEFAULT_PERIOD_S.
+        """
+        period_s = spec.get("period_s")
+        active_s = spec.get("active_s")
+        if active_s is None and spec.get("duty_cycle") is not None:
+            period_s = period_s or DEFAULT_PERIOD_S
+            active_s = float(spec["duty_cycle"]) * period_s
+        if active_s is not None and not period_s:
+            raise ValueError(f"{name}: active_s requires period_s")
+        return cls(
+            name=name,
+            voltage=float(spec.get("voltage") or 0),
+            active_ma=float(spec.get("mA") or spec.get("active_mA") or 0),
+            sleep_ma=float(spec.get("sleep_mA") or 0),
+            active_s=None if active_s is None else min(float(active_s), float(period_s)),
+            period_s=None if period_s is None else float(period_s),
+            offset_s=float(spec.get("offset_s") or 0),
+        )
+
+    @property
+    def duty_cycle(self) -> float:
+        return 1.0 if self.active_s is None else self.active_s / self.period_s
+
+
+def has_schedule(spec: dict) -> bool:
+    """True if a power estimator spec describes a duty-cycled (not continuous) load"""
+    return any(key in spec for key in ("sleep_mA", "active_s", "period_s", "duty_cycle"))
+
+
+@dataclass
+class PowerProfile:
+    """Battery-side power over a time grid"""
+
+    step_s: float
+    power_w: np.ndarray  # (steps,) average battery-side power in each step
+    rail_power_w: dict  # rail voltage -> (steps,) power delivered on that rail
+    rail_efficiency: dict  # rail voltage -> regulator efficiency used
+    peak_w: float  # battery-side power with every component active at once
+
+    @property
+    def average_w(self) -> float:
+        return float(self.power_w.mean()) if self.power_w.size else 0.0
+
+    @property
+    def energy_wh(self) -> float:
+        return float(self.power_w.sum()) * self.step_s / 3600
+
+    @property
+    def daily_wh(self) -> float:
+        return self.average_w * 24
+
+
+def active_fractions(loads: list[ComponentLoad], edges: np.ndarray) -> np.ndarray:
+    """
+    Fraction of each time step [edges[i], edges[i + 1]) every component is active.
+
+    Uses the closed-form cumulative active time of a periodic schedule, so the result is
+    exact for any step size.
+
+    Returns:
+        np.ndarray: (components, steps) fractions in [0, 1].
+    """
+    always_on = np.array([load.active_s is None for load in loads])
+    period = np.array([1.0 if load.active_s is None else load.period_s for load in loads])
+    active = np.where(always_on, 1.0, [load.active_s or 0.0 for load in loads])
+    offset = np.array([load.offset_s for load in loads])
+
+    shifted = edges[None, :] - offset[:, None]
+    cycles = np.floor(shifted / period[:, None])
+    phase = shifted - cycles * period[:, None]
+    cumulative = cycles * active[:, None] + np.minimum(phase, active[:, None])
+    return np.diff(cumulative, axis=1) / np.diff(edges)[None, :]
+
+
+def simulate_power(
+    loads: list[ComponentLoad],
+    horizon_s: float = 24 * 3600,
+    step_s: float = 60.0,
+    rail_efficiency: dict = None,
+) -> PowerProfile:
+    """
+    Simulate the battery-side power of a set of loads over a time grid.
+
+    Args:
+        loads (list[ComponentLoad]): Components with their schedules.
+        horizon_s (float): Simulated duration in seconds.
+        step_s (float): Time grid resolution in seconds (energy is exact for any step).
+        rail_efficiency (dict): Regulator efficiency per rail voltage, overriding
+            DEFAULT_RAIL_EFFICIENCY.
+
+    Returns:
+        PowerProfile: Power per step, per rail, and the all-active peak.
+    """
+    efficiencies = {**DEFAULT_RAIL_EFFICIENCY, **(rail_efficiency or {})}
+    steps = max(1, int(np.ceil(horizon_s / step_s)))
+    if not loads:
+        return PowerProfile(step_s, np.zeros(steps), {}, {}, 0.0)
+
+    edges = np.arange(steps + 1) * float(step_s)
+    fractions = active_fractions(loads, edges)
+
+    voltage = np.array([load.voltage for load in loads])
+    active_ma = np.array([load.active_ma for load in loads])
+    sleep_ma = np.array([load.sleep_ma for load in loads])
+    current_ma = sleep_ma[:, None] + (active_ma - sleep_ma)[:, None] * fractions
+    rail_w = current_ma * voltage[:, None] / 1000.0
+
+    rails = sorted(set(voltage.tolist()))
+    rail_eff = {rail: efficiencies.get(rail, DEFAULT_REGULATOR_EFFICIENCY) for rail in rails}
+    efficiency = np.array([rail_eff[v] for v in voltage.tolist()])
+    power_w = (rail_w / efficiency[:, None]).sum(axis=0)
+
+    rail_power = {rail: rail_w[voltage == rail].sum(axis=0) for rail in rails}
+    peak_w = float((active_ma * voltage / 1000.0 / efficiency).sum())
+    return PowerProfile(step_s, power_w, rail_power, rail_eff, peak_w)
+
+
+@dataclass
+class BatteryChemistry:
+    """Usable energy characteristics of a battery chemistry"""
+
+    name: str
+    nominal_voltage: float
+    usable_fraction: float  # capacity usable before the cutoff voltage
+    self_discharge_per_month: float  # fraction of full capacity lost per month
+
+
+BATTERY_CHEMISTRIES = [
+    BatteryChemistry("Li-Ion", 3.7, 0.90, 0.02),
+    BatteryChemistry("LiPo", 3.7, 0.90, 0.05),
+    BatteryChemistry("LiFePO4", 3.2, 0.95, 0.03),
+    BatteryChemistry("NiMH 3xAA", 3.6, 0.85, 0.15),
+    BatteryChemistry("Alkaline 3xAA", 4.5, 0.80, 0.002),
+    BatteryChemistry("Li-SOCl2 primary", 3.6, 0.95, 0.001),
+]
+
+STANDARD_CAPACITIES_MAH = [500, 1000, 2000, 2600, 3400, 5000, 10000, 20000]
+
+
+def sweep_batteries(average_w, capacities_mah=None, chemistries=None) -> np.ndarray:
+    """
+    Runtime of every (load, chemistry, capacity) combination in one vectorized pass.
+
+    Self-discharge is modeled as a constant drain of the chemistry's monthly fraction of
+    the full capacity.
+
+    Args:
+        average_w (float | np.ndarray): Battery-side average power of one or more load
+            configurations.
+        capacities_mah (array-like): Battery capacities to evaluate.
+        chemistries (list[BatteryChemistry]): Chemistries to evaluate.
+
+    Returns:
+        np.ndarray: Runtime in hours with shape average_w.shape + (chemistries, capacities).
+    """
+    chemistries = chemistries or BATTERY_CHEMISTRIES
+    capacities = np.asarray(
+        STANDARD_CAPACITIES_MAH if capacities_mah is None else capacities_mah, dtype=float
+    )
+    load_w = np.asarray(average_w, dtype=float)[..., None, None]
+
+    nominal_v = np.array([c.nominal_voltage for c in chemistries])[:, None]
+    usable = np.array([c.usable_fraction for c in chemistries])[:, None]
+    self_discharge = np.array([c.self_discharge_per_month for c in chemistries])[:, None]
+
+    full_wh = capacities[None, :] / 1000.0 * nominal_v
+    drain_w = load_w + full_wh * self_discharge / HOURS_PER_MONTH
+    with np.errstate(divide="ignore"):
+        return np.where(drain_w > 0, full_wh * usable / drain_w, np.inf)
+
+
+def recommend_battery(
+    average_w: float, target_hours: float, capacities_mah=None, chemistries=None
+) -> dict:
+    """
+    Smallest-energy battery reaching target_hours, or the longest-lasting one if none does.
+
+    Returns:
+        dict: chemistry, capacity_mAh, energy_Wh, runtime_hours and meets_target.
+    """
+    chemistries = chemistries or BATTERY_CHEMISTRIES
+    capacities = np.asarray(
+        STANDARD_CAPACITIES_MAH if capacities_mah is None else capacities_mah, dtype=float
+    )
+    runtime = sweep_batteries(average_w, capacities, chemistries)
+    energy = (
+        capacities[None, :] / 1000.0 * np.array([c.nominal_voltage for c in chemistries])[:, None]
+    )
+
+    meets = runtime >= target_hours
+    if meets.any():
+        chem, cap = np.unravel_index(np.argmin(np.where(meets, energy, np.inf)), energy.shape)
+    else:
+        chem, cap = np.unravel_index(np.argmax(runtime), runtime.shape)
+    return {
+        "chemistry": chemistries[chem].name,
+        "capacity_mAh": int(capacities[cap]),
+        "energy_Wh": round(float(energy[chem, cap]), 2),
+        "runtime_hours": float(runtime[chem, cap]),
+        "meets_target": bool(meets[chem, cap]),
+    }
@@ -0,0 +1,204 @@
+"""
+Speculative research prefetch for the agent's first research_tool call.
+
+The system prompt tells the model to search the research database before answering, so
+its first tool call is almost always research_tool on something close to the user's
+query. While the first LLM call is in flight, a ResearchPrefetcher runs retrieval in a
+background thread on the raw query and on the request keywords the blueprint heuristics
+match. When research_tool is then called with a query whose terms match or closely
+overlap a prefetched one, it is served the prefetched results (waiting for them if the
+retrieval is still running) instead of searching again.
+
+Prefetch is on by default in process_query; set IOT_RESEARCH_PREFETCH=0 to turn it off.
+IOT_PREFETCH_MIN_OVERLAP (0-1, default 0.6) is the share of terms two queries must have
+in common (Jaccard) for a prefetched result to be served.
+"""
+
+import contextvars
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rag.budget import current_budget, note_degradation
+from rag.spans import span
+from rag.tool import rag_query
+
+from .blueprint_matcher import get_blueprint_matcher
+from .iot_blueprint_generator import IOT_COMPONENT_DESCRIPTIONS, IOT_COMPONENT_HEURISTICS
+
+# research_tool accepts up to 10 results, so prefetching 10 can serve any call
+PREFETCH_TOP_K = 10
+DEFAULT_MIN_OVERLAP = 0.6
+# Once a request's time budget runs low, any prefetched query on the topic is served
+LOW_BUDGET_MIN_OVERLAP = 0.2
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Words that don't change what a research query retrieves
+_STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "best", "by", "can", "do", "for",
+    "from", "how", "i", "in", "is", "it", "me", "my", "need", "of", "on", "or", "our",
+    "should", "that", "the", "to", "use", "want", "we", "what", "which", "with", "would",
+}  # fmt: skip
+
+_current_prefetcher = contextvars.ContextVar("research_prefetcher", default=None)
+
+
+def prefetch_enabled() -> bool:
+    return os.getenv("IOT_RESEARCH_PREFETCH", "1").strip().lower() not in ("0", "false", "off")
+
+
+def get_min_overlap() -> float:
+    return float(os.getenv("IOT_PREFETCH_MIN_OVERLAP") or DEFAULT_MIN_OVERLAP)
+
+
+def query_terms(text: str) -> frozenset:
+    """Lowercase words of a query that carry meaning, with simple plurals folded"""
+    terms = set()
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        terms.add(word[:-1] if len(word) > 3 and word.endswith("s") else word)
+    return frozenset(terms)
+
+
+def term_overlap(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two term sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def prefetch_queries(query: str) -> list[str]:
+    """The raw query, then the blueprint keywords it matches, without duplicates"""
+    matcher = get_blueprint_matcher(IOT_COMPONENT_HEURISTICS, IOT_COMPONENT_DESCRIPTIONS)
+    keywords = " ".join(sorted(matcher.matched_keywords(query)))
+    queries = [query]
+    if keywords and query_terms(keywords) != query_terms(query):
+        queries.append(keywords)
+    return [q for q in queries if query_terms(q)]
+
+
+class ResearchPrefetcher:
+    """Speculative retrievals for one agent run, and how many of them were used"""
+
+    def __init__(self, search=None, top_k: int = PREFETCH_TOP_K, min_overlap: float = None):
+        """
+        Args:
+            search (callable): (query, top_k) -> results; defaults to rag_query.
+            top_k (int): Results to prefetch per query.
+            min_overlap (float): Term overlap needed to serve a call from a prefetched query;
+                defaults to IOT_PREFETCH_MIN_OVERLAP.
+        """
+        self.search = search or rag_query
+        self.top_k = top_k
+        self.min_overlap = get_min_overlap() if min_overlap is None else min_overlap
+        # query -> {"terms", "future", "served", "seconds"}
+        self.prefetched = {}
+        self.lookups = []
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self, query: str):
+        """Start retrieving the prefetch queries for a user query in the background"""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="research-prefetch")
+        for candidate in prefetch_queries(query):
+            # Each retrieval runs in a copy of this context, so its spans join the run
+            context = contextvars.copy_context()
+            entry = {"terms": query_terms(candidate), "served": 0, "seconds": None}
+            entry["future"] = self._executor.submit(context.run, self._fetch, candidate, entry)
+            self.prefetched[candidate] = entry
+
+    def _fetch(self, query: str, entry: dict):
+        started = time.perf_counter()
+        try:
+            with span("research.prefetch", query=query):
+                return self.search(query, self.top_k)
+        finally:
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+
+    def lookup(self, query: str, max_results: int):
+        """
+        Prefetched results for a research_tool call, if a prefetched query overlaps it.
+
+        Returns:
+            list | None: The first max_results results of the closest prefetched query, or
+            None (search as usual) when none overlaps enough or its retrieval failed.
+        """
+        terms = query_terms(query)
+        budget = current_budget()
+        min_overlap = self.min_overlap
+        if budget is not None and budget.low():
+            min_overlap = min(min_overlap, LOW_BUDGET_MIN_OVERLAP)
+        best, best_overlap = None, 0.0
+        for candidate, entry in self.prefetched.items():
+            overlap = term_overlap(terms, entry["terms"])
+            if overlap > best_overlap:
+                best, best_overlap = candidate, overlap
+
+        results = None
+        if best is not None and best_overlap >= min_overlap and max_results <= self.top_k:
+            entry = self.prefetched[best]
+            try:
+                with span("research.prefetch_wait"):
+                    timeout = budget.remaining() if budget is not None else None
+                    results = entry["future"].result(timeout=timeout)[:max_results]
+            except Exception:
+                results = None
+            if results is not None:
+                with self._lock:
+                    entry["served"] += 1
+                if best_overlap < self.min_overlap:
+                    note_degradation("research_tool", f"budget low; served prefetched {best!r}")
+
+        with self._lock:
+            self.lookups.append(
+                {
+                    "query": query,
+                    "served_by": best if results is not None else None,
+                    "overlap": round(best_overlap, 3),
+                }
+            )
+        return results
+
+    def close(self):
+        """Drop retrievals that haven't started; a running one finishes in the background"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Hit rate (research calls served) and waste rate (prefetched queries never used)"""
+        with self._lock:
+            lookups = list(self.lookups)
+        hits = sum(1 for lookup in lookups if lookup["served_by"] is not None)
+        wasted = sum(1 for entry in self.prefetched.values() if not entry["served"])
+        return {
+            "prefetched_queries": [
+                {"query": query, "served": entry["served"], "seconds": entry["seconds"]}
+                for query, entry in self.prefetched.items()
+            ],
+            "research_calls": len(lookups),
+            "hits": hits,
+            "hit_rate": round(hits / len(lookups), 3) if lookups else None,
+            "wasted": wasted,
+            "waste_rate": round(wasted / len(self.prefetched), 3) if self.prefetched else None,
+            "lookups": lookups,
+        }
+
+
+def activate_prefetcher(prefetcher: ResearchPrefetcher):
+    """Make prefetcher current for research_tool calls; returns a token for deactivate"""
+    return _current_prefetcher.set(prefetcher)
+
+
+def deactivate_prefetcher(token):
+    try:
+        _current_prefetcher.reset(token)
+    except ValueError:
+        _current_prefetcher.set(None)
+
+
+def current_prefetcher() -> ResearchPrefetcher:
+    return _current_prefetcher.get()
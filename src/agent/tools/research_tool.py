@@ -1,10 +1,11 @@
-from langchain.tools import tool
-from typing import Optional, Literal
-import chromadb
-import json
+from langchain_core.tools import tool
 
+from rag.spans import span
 from rag.tool import rag_query
 
+from .research_prefetch import current_prefetcher
+from .tool_output import dump_json, is_compact
+
 
 @tool
 def research_tool(
@@ -33,13 +34,36 @@ def research_tool(
         - Relevant paper excerpts and technical details
         - Source citations and metadata (authors, year, section)
         - Relevance scores to help prioritize information
+        In compact mode, source files are listed once under "sources" and each result is a
+        [source index, excerpt] pair.
 
     IMPORTANT: Base your IoT recommendations primarily on the content returned by this tool.
     """
 
-    results = rag_query(query, max_results)
+    # Served from the speculative retrieval started with the run, when it overlaps the query
+    prefetcher = current_prefetcher()
+    results = prefetcher.lookup(query, max_results) if prefetcher is not None else None
+    if results is None:
+        results = rag_query(query, max_results)
+    with span("rag.serialize"):
+        return serialize_research_results(query, results)
+
+
+def serialize_research_results(query, results) -> str:
+    """Serialize QueryResult objects to JSON for LangChain compatibility and evaluation tracking"""
+    if is_compact():
+        sources = list(dict.fromkeys(r.metadata.source_file for r in results))
+        serialized_results = [
+            [sources.index(r.metadata.source_file), " ".join(r.document.split())]
+            for r in results
+        ]
+        return dump_json({
+            "query": query,
+            "num_results": len(serialized_results),
+            "sources": sources,
+            "results": serialized_results,
+        })
 
-    # Serialize QueryResult objects to JSON for LangChain compatibility and evaluation tracking
     serialized_results = [
         {
             "id": r.id,
@@ -49,8 +73,8 @@ def research_tool(
         for r in results
     ]
 
-    return json.dumps({
+    return dump_json({
         "query": query,
         "num_results": len(serialized_results),
         "results": serialized_results,
-    }, indent=2)
+    })
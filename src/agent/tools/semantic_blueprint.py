@@ -0,0 +1,120 @@
+"""
+Semantic component matching for blueprints.
+
+Every component option (label, description and keywords) is embedded once into a
+normalized matrix. A request is then embedded once and scored against all options with a
+single matrix-vector product; the best option per component type is picked with one
+argmax over a (types x options) layout.
+
+Enabled with IOT_BLUEPRINT_MATCHING=semantic ("keyword" is the default). Keyword hits
+still take precedence; semantic matches only fill the component types no keyword matched.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+MATCHING_MODES = ("keyword", "semantic")
+
+# Optional component types (e.g. displays) are only added on a clear semantic match
+MIN_OPTIONAL_SCORE = 0.45
+
+
+def get_matching_mode() -> str:
+    """Return the configured blueprint matching mode"""
+    mode = os.getenv("IOT_BLUEPRINT_MATCHING", "keyword").strip().lower()
+    return mode if mode in MATCHING_MODES else "keyword"
+
+
+def default_embedding_function():
+    """The embedding model the research vector store uses, so it is downloaded only once"""
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    return DefaultEmbeddingFunction()
+
+
+def option_text(option) -> str:
+    """Text embedded for a component option"""
+    parts = [option.label]
+    if option.description:
+        parts.append(option.description)
+    if option.keywords:
+        parts.append("Keywords: " + ", ".join(option.keywords))
+    return ". ".join(parts)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class SemanticBlueprintIndex:
+    """Precomputed option embeddings for one heuristics table"""
+
+    def __init__(self, heuristics, embedding_function=None):
+        """
+        Args:
+            heuristics (Heuristics): Component options per type.
+            embedding_function: Callable mapping a list of texts to a list of vectors;
+                defaults to the vector store's embedding model.
+        """
+        self.embedding_function = embedding_function or default_embedding_function()
+        self.comp_types = list(heuristics.options)
+        self.labels = []
+        texts = []
+        for options in heuristics.options.values():
+            for option in options:
+                self.labels.append(option.label)
+                texts.append(option_text(option))
+
+        self.matrix = (
+            _normalize_rows(np.asarray(self.embedding_function(texts), dtype=np.float32))
+            if texts
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+
+        # (types x max options) table of row indices into the matrix, -1 for padding
+        width = max((len(options) for options in heuristics.options.values()), default=0)
+        self.slots = np.full((len(self.comp_types), width), -1, dtype=np.int64)
+        row = 0
+        for i, options in enumerate(heuristics.options.values()):
+            self.slots[i, : len(options)] = np.arange(row, row + len(options))
+            row += len(options)
+
+    def best_matches(self, request: str) -> dict:
+        """
+        Score every option against the request at once.
+
+        Returns:
+            dict: {component type: (label, cosine similarity)} for every type with options.
+        """
+        if not self.labels:
+            return {}
+        query = _normalize_rows(np.asarray(self.embedding_function([request]), dtype=np.float32))[0]
+        scores = self.matrix @ query
+        per_type = np.where(self.slots >= 0, scores[self.slots], -np.inf)
+        best = np.argmax(per_type, axis=1)
+        return {
+            comp_type: (self.labels[self.slots[i, best[i]]], float(per_type[i, best[i]]))
+            for i, comp_type in enumerate(self.comp_types)
+            if self.slots[i, 0] >= 0
+        }
+
+
+_index_lock = threading.Lock()
+
+
+def get_semantic_index(matcher, embedding_function=None) -> SemanticBlueprintIndex:
+    """
+    Semantic index for a BlueprintMatcher's heuristics, built on first use and kept on the
+    matcher, so it is rebuilt only when the heuristics are reloaded.
+    """
+    index = getattr(matcher, "semantic_index", None)
+    if index is None:
+        with _index_lock:
+            index = getattr(matcher, "semantic_index", None)
+            if index is None:
+                index = SemanticBlueprintIndex(matcher.heuristics, embedding_function)
+                matcher.semantic_index = index
+    return index
@@ -0,0 +1,200 @@
+"""
+Solar panel and battery sizing over a year of hourly irradiance.
+
+The battery's state of charge follows soc = clip(soc + harvest - load, 0, capacity) every
+hour, which is inherently sequential. Instead of stepping 8760 hours for every candidate,
+the simulation uses the fact that compositions of clip(x + d, lo, hi) steps are again of
+that form: each day is reduced to one such function per (panel, battery) pair with 24
+array operations over all days and candidates at once, and the year is then chained with
+365 cheap steps. A day has downtime if its start-of-day charge is below the energy the
+day needs up front, which is computed per panel size independently of the battery.
+
+The bundled sample profile (solar_data/sample_irradiance.csv) is a synthetic typical year
+for a 38°N site, so sizing works offline. Set IOT_IRRADIANCE_FILE to a local hourly CSV
+with a ghi_W_m2 column (global horizontal irradiance) to size for a real location.
+"""
+
+import csv
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../../"))
+DEFAULT_IRRADIANCE_FILE = os.path.join(ROOT_DIR, "solar_data", "sample_irradiance.csv")
+
+# Panel output reaching the battery per rated W at 1000 W/m² (panel derating, charge
+# controller and battery charging losses)
+HARVEST_EFFICIENCY = 0.70
+
+# Share of the nominal battery energy usable before the cutoff voltage
+BATTERY_USABLE_FRACTION = 0.90
+
+DEFAULT_PANEL_SIZES_W = [0.5, 1, 2, 3, 5, 6, 10, 15, 20, 30, 50, 100]
+DEFAULT_BATTERY_SIZES_WH = [2, 4, 7.4, 10, 18.5, 37, 50, 74, 100, 150, 200, 300, 500]
+
+# Rough relative prices used to pick the smallest configuration that has no downtime
+PANEL_COST_PER_W = 1.0
+BATTERY_COST_PER_WH = 0.5
+
+
+_profiles = {}
+_profiles_lock = threading.Lock()
+
+
+def get_irradiance_file() -> str:
+    """Return the configured hourly irradiance CSV"""
+    return os.getenv("IOT_IRRADIANCE_FILE") or DEFAULT_IRRADIANCE_FILE
+
+
+def load_irradiance(path: str = None) -> np.ndarray:
+    """
+    Load an hourly irradiance profile, cached until the file's modification time changes.
+
+    Args:
+        path (str): CSV with a ghi_W_m2 column, one row per hour. Trailing hours that don't
+            make up a whole day are dropped.
+
+    Returns:
+        np.ndarray: (hours,) global horizontal irradiance in W/m².
+    """
+    path = path or get_irradiance_file()
+    key = (path, os.stat(path).st_mtime_ns)
+    profile = _profiles.get(key)
+    if profile is None:
+        with _profiles_lock:
+            profile = _profiles.get(key)
+            if profile is None:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    reader = csv.DictReader(f)
+                    if "ghi_W_m2" not in (reader.fieldnames or []):
+                        raise ValueError(f"{path}: missing ghi_W_m2 column")
+                    values = np.array([float(row["ghi_W_m2"]) for row in reader])
+                profile = values[: len(values) // 24 * 24]
+                profile.setflags(write=False)
+                _profiles[key] = profile
+    return profile
+
+
+@dataclass
+class SolarSimulation:
+    """Downtime per (panel size, battery size) candidate over an irradiance profile"""
+
+    panel_w: np.ndarray  # (panels,)
+    battery_wh: np.ndarray  # (batteries,) nominal capacities
+    downtime_days: np.ndarray  # (panels, batteries) days on which the battery ran empty
+    days: int
+
+
+def simulate_solar(
+    load_w, irradiance: np.ndarray, panel_w, battery_wh, harvest_efficiency=HARVEST_EFFICIENCY
+) -> SolarSimulation:
+    """
+    Simulate every panel x battery combination over the irradiance profile.
+
+    Batteries start the profile fully charged.
+
+    Args:
+        load_w (float | array-like): Battery-side load, constant or a 24-value hourly profile.
+        irradiance (np.ndarray): Hourly irradiance in W/m², a whole number of days.
+        panel_w (array-like): Rated panel powers to evaluate.
+        battery_wh (array-like): Nominal battery capacities to evaluate.
+        harvest_efficiency (float): Share of rated panel output that reaches the battery.
+
+    Returns:
+        SolarSimulation: Downtime days for every candidate.
+    """
+    panels = np.asarray(panel_w, dtype=float)
+    batteries = np.asarray(battery_wh, dtype=float)
+    capacity = batteries * BATTERY_USABLE_FRACTION
+    days = len(irradiance) // 24
+
+    load = np.broadcast_to(np.asarray(load_w, dtype=float), (24,))
+    sun = irradiance[: days * 24].reshape(days, 24) / 1000.0 * harvest_efficiency
+    # (days, hours, panels) net energy into the battery per hour
+    net = sun[:, :, None] * panels[None, None, :] - load[None, :, None]
+
+    # Each day as one clip(x + total, low, high): the days' end states from empty (low)
+    # and from full (high), for all days and candidates at once
+    low = np.zeros((days, len(panels), len(batteries)))
+    high = np.empty_like(low)
+    high[:] = capacity
+    for hour in range(24):
+        step = net[:, hour, :, None]
+        for state in (low, high):
+            state += step
+            np.maximum(state, 0, out=state)
+            np.minimum(state, capacity, out=state)
+    total = net.sum(axis=1)[:, :, None]
+
+    # Charge needed at the start of the day, and after every hour, to never run empty;
+    # only depends on the panel
+    required = np.zeros((days, len(panels)))
+    peak_required = np.zeros((days, len(panels)))
+    for hour in range(23, -1, -1):
+        required = np.maximum(required, 0) - net[:, hour]
+        if hour:
+            np.maximum(peak_required, required, out=peak_required)
+
+    # Chain the days
+    start = np.empty_like(low)
+    charge = np.empty((len(panels), len(batteries)))
+    charge[:] = capacity
+    for day in range(days):
+        start[day] = charge
+        charge = np.minimum(np.maximum(charge + total[day], low[day]), high[day])
+
+    downtime = (start < required[:, :, None] - 1e-9) | (peak_required[:, :, None] > capacity)
+    return SolarSimulation(panels, batteries, downtime.sum(axis=0), days)
+
+
+def size_solar(
+    load_w, irradiance: np.ndarray = None, panel_sizes_w=None, battery_sizes_wh=None
+) -> dict:
+    """
+    Smallest panel + battery with no downtime day over the irradiance profile.
+
+    "Smallest" is the lowest PANEL_COST_PER_W * W + BATTERY_COST_PER_WH * Wh. If no
+    candidate avoids downtime, the one with the fewest downtime days is returned.
+
+    Args:
+        load_w (float | array-like): Battery-side load, constant or a 24-value hourly profile.
+        irradiance (np.ndarray): Hourly irradiance; defaults to the configured profile.
+        panel_sizes_w (list): Panel sizes to evaluate (default DEFAULT_PANEL_SIZES_W).
+        battery_sizes_wh (list): Battery sizes to evaluate (default DEFAULT_BATTERY_SIZES_WH).
+
+    Returns:
+        dict: panel_W, battery_Wh, battery_mAh_at_3_7V, downtime_days, days_simulated,
+        average_daily_harvest_Wh and daily_load_Wh.
+    """
+    irradiance = load_irradiance() if irradiance is None else irradiance
+    simulation = simulate_solar(
+        load_w,
+        irradiance,
+        DEFAULT_PANEL_SIZES_W if panel_sizes_w is None else panel_sizes_w,
+        DEFAULT_BATTERY_SIZES_WH if battery_sizes_wh is None else battery_sizes_wh,
+    )
+
+    cost = (
+        simulation.panel_w[:, None] * PANEL_COST_PER_W
+        + simulation.battery_wh[None, :] * BATTERY_COST_PER_WH
+    )
+    downtime = simulation.downtime_days
+    # Fewest downtime days first, then cheapest
+    panel, battery = np.unravel_index(
+        np.lexsort((cost.ravel(), downtime.ravel()))[0], downtime.shape
+    )
+
+    panel_w = float(simulation.panel_w[panel])
+    battery_wh = float(simulation.battery_wh[battery])
+    daily_harvest = float(irradiance.sum()) / 1000 / simulation.days * HARVEST_EFFICIENCY
+    return {
+        "panel_W": panel_w,
+        "battery_Wh": battery_wh,
+        "battery_mAh_at_3_7V": round(battery_wh / 3.7 * 1000),
+        "downtime_days": int(downtime[panel, battery]),
+        "days_simulated": simulation.days,
+        "average_daily_harvest_Wh": round(daily_harvest * panel_w, 2),
+        "daily_load_Wh": round(float(np.mean(load_w)) * 24, 3),
+    }
@@ -0,0 +1,42 @@
+"""
+Output encoding shared by the agent tools.
+
+Tool outputs are fed back to the LLM on every later turn, so their size multiplies input
+tokens. The format is chosen with IOT_TOOL_OUTPUT_FORMAT:
+    - "pretty" (default): indented JSON, the original human-readable layout
+    - "compact": minified JSON with rounded numbers and de-duplicated repeated values
+"""
+
+import json
+import os
+
+OUTPUT_FORMATS = ("pretty", "compact")
+
+
+def get_output_format() -> str:
+    """Return the configured tool output format"""
+    output_format = os.getenv("IOT_TOOL_OUTPUT_FORMAT", "pretty").strip().lower()
+    return output_format if output_format in OUTPUT_FORMATS else "pretty"
+
+
+def is_compact() -> bool:
+    return get_output_format() == "compact"
+
+
+def round_numbers(value, digits: int = 2):
+    """Recursively round floats so they don't spend tokens on insignificant digits"""
+    if isinstance(value, float):
+        rounded = round(value, digits)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, dict):
+        return {key: round_numbers(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [round_numbers(item, digits) for item in value]
+    return value
+
+
+def dump_json(data) -> str:
+    """Serialize a tool result in the configured output format"""
+    if is_compact():
+        return json.dumps(round_numbers(data), separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=2)
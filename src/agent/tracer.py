@@ -1,8 +1,183 @@
-from phoenix.otel import register
+"""
+Opt-in OpenTelemetry tracing of the agent's LangChain runs.
 
-tracer_provider = register(
-    project_name="iot-planner-agent",
-    auto_instrument=True,
-    endpoint="http://localhost:6006/v1/traces",
+Tracing is off unless IOT_TRACING selects an exporter:
+    - "otlp": send spans to a collector such as Phoenix (IOT_TRACING_ENDPOINT, default
+      http://localhost:6006/v1/traces)
+    - "jsonl": append spans to a local file (IOT_TRACING_FILE, default results/traces.jsonl),
+      for capturing traces offline with no collector running
+
+Spans are queued and exported in batches by a background thread, so a traced call only
+pays for creating its spans. IOT_TRACING_SAMPLE_RATE (0-1, default 1) keeps that share of
+traces, decided once per trace at its root. Batching can be tuned with the standard
+OTEL_BSP_* variables (e.g. OTEL_BSP_SCHEDULE_DELAY, OTEL_BSP_MAX_EXPORT_BATCH_SIZE).
+The last batch is exported by shutdown_tracing, which the CLI and server call on the way
+out and which also runs at interpreter exit.
+"""
+
+import atexit
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+PROJECT_NAME = "iot-planner-agent"
+TRACING_MODES = ("off", "otlp", "jsonl")
+DEFAULT_ENDPOINT = "http://localhost:6006/v1/traces"
+DEFAULT_TRACES_FILE = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../results/traces.jsonl")
 )
-tracer = tracer_provider.get_tracer(__name__)
+
+
+@dataclass
+class TracingConfig:
+    mode: str = "off"
+    endpoint: str = DEFAULT_ENDPOINT
+    traces_file: str = DEFAULT_TRACES_FILE
+    sample_rate: float = 1.0
+
+
+def get_tracing_config() -> TracingConfig:
+    """Read the tracing configuration from the IOT_TRACING* environment variables"""
+    mode = (os.getenv("IOT_TRACING") or "off").strip().lower()
+    if mode not in TRACING_MODES:
+        raise ValueError(f"Unknown IOT_TRACING {mode!r}; expected one of {TRACING_MODES}")
+    sample_rate = float(os.getenv("IOT_TRACING_SAMPLE_RATE") or 1.0)
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"IOT_TRACING_SAMPLE_RATE must be between 0 and 1, got {sample_rate}")
+    return TracingConfig(
+        mode=mode,
+        endpoint=os.getenv("IOT_TRACING_ENDPOINT") or DEFAULT_ENDPOINT,
+        traces_file=os.getenv("IOT_TRACING_FILE") or DEFAULT_TRACES_FILE,
+        sample_rate=sample_rate,
+    )
+
+
+def _span_to_dict(span) -> dict:
+    context = span.get_span_context()
+    return {
+        "name": span.name,
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a JSON Lines file, one span per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        lines = "".join(json.dumps(_span_to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def build_tracer_provider(config: TracingConfig):
+    """
+    A tracer provider that samples and batch-exports spans as configured.
+
+    Args:
+        config (TracingConfig): An "otlp" or "jsonl" configuration.
+
+    Returns:
+        TracerProvider: Not registered globally, not instrumenting anything yet and not
+            shut down at exit (see shutdown_tracing).
+    """
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if config.mode == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter(endpoint=config.endpoint)
+    elif config.mode == "jsonl":
+        exporter = JsonlSpanExporter(config.traces_file)
+    else:
+        raise ValueError(f"Tracing mode {config.mode!r} has no exporter")
+
+    provider = TracerProvider(
+        resource=Resource({"openinference.project.name": PROJECT_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(config.sample_rate)),
+        shutdown_on_exit=False,
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def setup_tracing(config: TracingConfig = None):
+    """
+    Start tracing LangChain runs if configured; later calls return the same provider.
+
+    Args:
+        config (TracingConfig): Defaults to get_tracing_config().
+
+    Returns:
+        TracerProvider | None: The active provider, or None when tracing is off.
+    """
+    global _provider
+    if _provider is not None:
+        return _provider
+    config = config or get_tracing_config()
+    if config.mode == "off":
+        return None
+
+    with _provider_lock:
+        if _provider is None:
+            from openinference.instrumentation.langchain import LangChainInstrumentor
+            from opentelemetry import trace
+
+            provider = build_tracer_provider(config)
+            trace.set_tracer_provider(provider)
+            LangChainInstrumentor().instrument(tracer_provider=provider)
+            _provider = provider
+            atexit.register(shutdown_tracing)
+            print(f"🔭 Tracing enabled ({config.mode}, sample rate {config.sample_rate:g})")
+    return _provider
+
+
+def get_tracer(name: str = __name__):
+    """A tracer for manual spans; spans are dropped when tracing is off"""
+    from opentelemetry import trace
+
+    return trace.get_tracer(name)
+
+
+def shutdown_tracing():
+    """Export queued spans and stop tracing; safe to call more than once"""
+    global _provider
+    with _provider_lock:
+        provider, _provider = _provider, None
+    if provider is not None:
+        from openinference.instrumentation.langchain import LangChainInstrumentor
+
+        LangChainInstrumentor().uninstrument()
+        provider.shutdown()
+        atexit.unregister(shutdown_tracing)
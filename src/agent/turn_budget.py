@@ -0,0 +1,69 @@
+"""
+Turn caps and deadline-driven final answers for the agent.
+
+Within a request budget (see rag.budget), the agent's last allowed turn, or any turn once
+the time budget runs low, is made without tools and with an instruction to answer from
+what the earlier tool calls returned. The run therefore ends with an answer after at most
+max_turns LLM calls instead of calling tools for as long as the model wants.
+"""
+
+from langchain.agents.middleware import AgentMiddleware, ModelResponse
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from rag.budget import current_budget, note_degradation
+
+FINAL_ANSWER_INSTRUCTION = (
+    "TIME IS UP: Do not call any more tools. Answer the user now, using only the tool "
+    "results above, and say briefly which parts could not be researched."
+)
+
+
+def agent_turn(messages) -> int:
+    """Index of the next LLM turn: AI messages since the latest user message"""
+    turn = 0
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            turn = 0
+        elif isinstance(message, AIMessage):
+            turn += 1
+    return turn
+
+
+class TurnBudgetMiddleware(AgentMiddleware):
+    """Forces a final answer on the last allowed turn or when the time budget runs low"""
+
+    def wrap_model_call(self, request, handler):
+        budget = current_budget()
+        if budget is None:
+            return handler(request)
+
+        turn = agent_turn(request.messages)
+        if budget.max_turns is not None and turn >= budget.max_turns - 1:
+            reason = f"turn cap reached after {turn} turns; final answer forced"
+        elif budget.low():
+            reason = f"budget low after {turn} turns; final answer forced"
+        else:
+            return handler(request)
+
+        budget.forced_final_answer = True
+        note_degradation("agent", reason)
+        system_text = request.system_message.content if request.system_message else ""
+        response = handler(
+            request.override(
+                tools=[],
+                tool_choice=None,
+                system_message=SystemMessage(
+                    content=f"{system_text}\n\n{FINAL_ANSWER_INSTRUCTION}".strip()
+                ),
+            )
+        )
+        # Without tools bound the model can't call one, but a stand-in model might
+        return ModelResponse(
+            result=[
+                message.model_copy(update={"tool_calls": []})
+                if isinstance(message, AIMessage) and message.tool_calls
+                else message
+                for message in response.result
+            ],
+            structured_response=response.structured_response,
+        )
@@ -2,7 +2,6 @@
 Evaluation package for IoT Planner Agent performance monitoring.
 """
 
-from .evaluation_tracker import EvaluationTracker, EvaluationCallbackHandler
 from .evaluation_utils import save_evaluation_results, display_performance_summary
 
 __all__ = [
@@ -11,3 +10,12 @@ __all__ = [
     "save_evaluation_results",
     "display_performance_summary",
 ]
+
+
+def __getattr__(name):
+    # The tracker pulls in langchain_core, so only import it when it is actually used
+    if name in ("EvaluationTracker", "EvaluationCallbackHandler"):
+        from . import evaluation_tracker
+
+        return getattr(evaluation_tracker, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,192 @@
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_duration(text: str) -> float:
+    """Parse "90s", "15m", "6h", "1d" or "2w" into seconds"""
+    match = _DURATION.match(text.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {text!r} (e.g. 30m, 6h, 1d, 1w)")
+    return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def parse_range(text: str) -> tuple[float, float]:
+    """Parse "START..END" (ISO dates or times, e.g. 2025-01-01..2025-01-08) into Unix times"""
+    since, separator, until = text.partition("..")
+    try:
+        bounds = tuple(datetime.fromisoformat(bound).timestamp() for bound in (since, until))
+    except ValueError:
+        bounds = None
+    if not separator or bounds is None or bounds[0] >= bounds[1]:
+        raise argparse.ArgumentTypeError(f"Invalid range: {text!r} (e.g. 2025-01-01..2025-01-08)")
+    return bounds
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def _format_value(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    if metric.endswith("tokens"):
+        return f"{value:.0f}"
+    return f"{value:.3f}s"
+
+
+def build_report(
+    store,
+    window_s,
+    windows,
+    until,
+    compare,
+    threshold,
+    min_samples,
+    baseline=None,
+    candidate=None,
+) -> dict:
+    """
+    Per-window percentiles, oldest first, plus regressions of the last window.
+
+    With a baseline and/or candidate (since, until) range, the report instead holds those
+    two windows and the regressions between them. A missing candidate is the window_s
+    ending at until; a missing baseline is the window of the same length just before it.
+    """
+    from .metrics_store import compare_windows
+
+    report = {"windows": [], "regressions": []}
+    if baseline is not None or candidate is not None:
+        candidate = candidate or (until - window_s, until)
+        baseline = baseline or (2 * candidate[0] - candidate[1], candidate[0])
+        for since, end in (baseline, candidate):
+            report["windows"].append(
+                {"since": since, "until": end, **store.window_stats(since, end)}
+            )
+        report["regressions"] = compare_windows(*report["windows"], threshold, min_samples)
+        return report
+
+    for k in range(windows, 0, -1):
+        since = until - k * window_s
+        stats = store.window_stats(since, since + window_s)
+        report["windows"].append({"since": since, "until": since + window_s, **stats})
+
+    if compare:
+        candidate = report["windows"][-1]
+        baseline = (
+            report["windows"][-2]
+            if windows > 1
+            else store.window_stats(candidate["since"] - window_s, candidate["since"])
+        )
+        report["regressions"] = compare_windows(baseline, candidate, threshold, min_samples)
+    return report
+
+
+def print_report(report):
+    for window in report["windows"]:
+        print(
+            f"\n📅 {_format_time(window['since'])} → {_format_time(window['until'])}: "
+            f"{window['runs']} runs, {window['errors']} errors"
+        )
+        if not window["metrics"]:
+            continue
+        print(f"   {'metric':<36} {'n':>6} {'p50':>10} {'p95':>10} {'p99':>10}")
+        for metric, stats in window["metrics"].items():
+            values = " ".join(
+                f"{_format_value(metric, stats[p]):>10}" for p in ("p50", "p95", "p99")
+            )
+            print(f"   {metric:<36} {stats['count']:>6} {values}")
+
+    for regression in report["regressions"]:
+        print(
+            f"⚠️  Regression: {regression['metric']} {regression['percentile']} "
+            f"{_format_value(regression['metric'], regression['baseline'])} → "
+            f"{_format_value(regression['metric'], regression['candidate'])} "
+            f"(+{regression['change']:.0%})"
+        )
+
+
+def report_command(args):
+    from .metrics_store import MetricsStore
+
+    store = MetricsStore(args.db)
+    until = datetime.fromisoformat(args.until).timestamp() if args.until else time.time()
+    report = build_report(
+        store,
+        args.window,
+        args.windows,
+        until,
+        args.compare,
+        args.threshold,
+        args.min_samples,
+        baseline=args.baseline,
+        candidate=args.candidate,
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if args.baseline or args.candidate:
+            if not report["regressions"]:
+                print("\n✅ No regressions from the baseline to the candidate window")
+        elif args.compare and not report["regressions"]:
+            print("\n✅ No regressions in the last window")
+    return 1 if report["regressions"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="IoT Planner evaluation CLI - Report latency and token percentiles"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report_parser = subparsers.add_parser(
+        "report", help="p50/p95/p99 of runtime, tool runtimes and tokens per time window"
+    )
+    report_parser.add_argument(
+        "--db", default=None, help="Metrics database (default: IOT_METRICS_DB or results/)"
+    )
+    report_parser.add_argument(
+        "--window", type=parse_duration, default=parse_duration("1d"), help="Window length"
+    )
+    report_parser.add_argument("--windows", type=int, default=1, help="Number of windows")
+    report_parser.add_argument("--until", default=None, help="End of the last window (ISO)")
+    report_parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Flag regressions of the last window against the one before (exit code 1)",
+    )
+    report_parser.add_argument(
+        "--baseline",
+        type=parse_range,
+        default=None,
+        help="Compare this START..END range (ISO) with the candidate (exit code 1 on regressions)",
+    )
+    report_parser.add_argument(
+        "--candidate",
+        type=parse_range,
+        default=None,
+        help="Range compared with the baseline (default: the last --window before --until)",
+    )
+    report_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Relative p50/p95 increase to flag"
+    )
+    report_parser.add_argument(
+        "--min-samples", type=int, default=5, help="Minimum samples per window to compare"
+    )
+    report_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    report_parser.set_defaults(func=report_command)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Token prices for estimating the cost of LLM turns.
+
+Prices are USD per million tokens. Cached input tokens (prompt cache hits) are part of a
+turn's input tokens and billed at the cached rate instead of the input rate. Set
+IOT_LLM_PRICING to a JSON file to add or override models:
+
+    {"gemini-2.5-flash": {"input_per_m": 0.30, "cached_input_per_m": 0.075, "output_per_m": 2.50}}
+
+A model is priced by its exact name, or else by the longest configured name it starts with
+("gemini-2.5-flash-preview-09-2025" uses the "gemini-2.5-flash" prices).
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ModelPricing:
+    input_per_m: float
+    output_per_m: float
+    cached_input_per_m: float = None  # defaults to the input price
+
+    def cost(self, input_tokens: int, output_tokens: int, cached_input_tokens: int = 0) -> float:
+        """USD for one turn"""
+        cached_rate = (
+            self.input_per_m if self.cached_input_per_m is None else self.cached_input_per_m
+        )
+        cached = min(cached_input_tokens, input_tokens)
+        return (
+            (input_tokens - cached) * self.input_per_m
+            + cached * cached_rate
+            + output_tokens * self.output_per_m
+        ) / 1e6
+
+
+DEFAULT_PRICING = {
+    "gemini-2.5-flash": ModelPricing(input_per_m=0.30, output_per_m=2.50, cached_input_per_m=0.075),
+    "gemini-2.5-pro": ModelPricing(input_per_m=1.25, output_per_m=10.00, cached_input_per_m=0.31),
+    "gemini-2.5-flash-lite": ModelPricing(
+        input_per_m=0.10, output_per_m=0.40, cached_input_per_m=0.025
+    ),
+    # Offline scripted sessions cost nothing
+    "scripted": ModelPricing(input_per_m=0.0, output_per_m=0.0),
+}
+
+
+_pricing_files = {}
+_pricing_lock = threading.Lock()
+
+
+def _load_pricing_file(path: str) -> dict:
+    key = (path, os.stat(path).st_mtime_ns)
+    pricing = _pricing_files.get(key)
+    if pricing is None:
+        with _pricing_lock:
+            pricing = _pricing_files.get(key)
+            if pricing is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                pricing = {model: ModelPricing(**prices) for model, prices in raw.items()}
+                _pricing_files[key] = pricing
+    return pricing
+
+
+def get_pricing() -> dict:
+    """The default prices, overridden by the IOT_LLM_PRICING file if set"""
+    path = os.getenv("IOT_LLM_PRICING")
+    return {**DEFAULT_PRICING, **(_load_pricing_file(path) if path else {})}
+
+
+def find_pricing(model: str, pricing: dict = None) -> ModelPricing:
+    """
+    Prices for a model name.
+
+    Args:
+        model (str): Model name as reported by the provider ("models/" prefix allowed).
+        pricing (dict): {model: ModelPricing}; defaults to get_pricing().
+
+    Returns:
+        ModelPricing | None: None if the model isn't priced.
+    """
+    if not model:
+        return None
+    pricing = get_pricing() if pricing is None else pricing
+    name = model.removeprefix("models/")
+    if name in pricing:
+        return pricing[name]
+    prefixes = [known for known in pricing if name.startswith(known)]
+    return pricing[max(prefixes, key=len)] if prefixes else None
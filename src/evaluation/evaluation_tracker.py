@@ -2,20 +2,37 @@
 Evaluation tracking system for IoT Planner Agent performance monitoring.
 """
 
-import time
 import json
 import sys
-from datetime import datetime
+import time
 from collections import defaultdict
+from datetime import datetime
+
 from langchain_core.callbacks import BaseCallbackHandler
 
-from rag.vector_store import QueryResult
+from rag.spans import (
+    SpanRecorder,
+    activate,
+    current_recorder,
+    current_span,
+    deactivate,
+    enter_span,
+    exit_span,
+)
+
+from .cost_model import find_pricing
+from .memory import MemoryProfiler
 
 
 class EvaluationTracker:
     """Class to track agent evaluation metrics"""
 
-    def __init__(self):
+    def __init__(self, memory_profile=False):
+        """
+        Args:
+            memory_profile (bool): Also record RSS and tracemalloc peaks per phase and the
+                top allocation sites (slows allocation-heavy code).
+        """
         self.metrics = {
             "start_time": None,
             "end_time": None,
@@ -24,20 +41,43 @@ class EvaluationTracker:
             "tool_calls": [],
             "rag_queries": [],
             "rag_chunks_retrieved": 0,
-            "tokens_used": {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+            "tokens_used": {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "total_tokens": 0,
+                "cached_input_tokens": 0,
+            },
+            "llm_turns": [],
+            "prefetch": None,
+            "budget": None,
             "error_count": 0,
             "errors": [],
         }
+        # Phase spans (LLM calls, tools, RAG and ingestion phases) recorded during the run
+        self.memory = MemoryProfiler() if memory_profile else None
+        self.spans = SpanRecorder(on_boundary=self.memory.sample if self.memory else None)
+        self.root_span = None
+        self._span_tokens = None
 
     def start_tracking(self):
-        """Start tracking execution time"""
+        """Start tracking execution time and make this run's span recorder current"""
         self.metrics["start_time"] = time.time()
+        if self.memory is not None:
+            self.memory.start()
+        self.root_span = self.spans.start("agent_run")
+        self._span_tokens = activate(self.spans, self.root_span)
 
     def end_tracking(self):
         """End tracking and calculate total runtime"""
         self.metrics["end_time"] = time.time()
-        if self.metrics["start_time"]:
+        if self.root_span is not None:
+            self.spans.end(self.root_span)
+            deactivate(self._span_tokens)
+            self.metrics["total_runtime"] = self.root_span.duration_ns / 1e9
+        elif self.metrics["start_time"]:
             self.metrics["total_runtime"] = self.metrics["end_time"] - self.metrics["start_time"]
+        if self.memory is not None:
+            self.memory.stop()
 
     def track_tool_call(self, tool_name, start_time, end_time, result=None):
         """Track individual tool call metrics"""
@@ -57,6 +97,51 @@ class EvaluationTracker:
 
         self.metrics["tool_calls"].append(call_info)
 
+    def track_llm_turn(
+        self,
+        model,
+        input_tokens,
+        output_tokens,
+        cached_input_tokens=0,
+        latency=None,
+        tool_calls=None,
+        tier=None,
+    ):
+        """Record one LLM call and add its tokens to the run's totals"""
+        pricing = find_pricing(model)
+        turn = {
+            "turn": len(self.metrics["llm_turns"]),
+            "model": model,
+            "tier": tier,
+            "input_tokens": input_tokens,
+            "cached_input_tokens": cached_input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "latency_seconds": round(latency, 3) if latency is not None else None,
+            "tool_calls": tool_calls or [],
+            "cost_usd": (
+                round(pricing.cost(input_tokens, output_tokens, cached_input_tokens), 6)
+                if pricing
+                else None
+            ),
+        }
+        self.metrics["llm_turns"].append(turn)
+
+        tokens = self.metrics["tokens_used"]
+        tokens["input_tokens"] += input_tokens
+        tokens["output_tokens"] += output_tokens
+        tokens["cached_input_tokens"] += cached_input_tokens
+        tokens["total_tokens"] = tokens["input_tokens"] + tokens["output_tokens"]
+        return turn
+
+    def track_prefetch(self, stats):
+        """Record how the run's speculative research prefetch was used"""
+        self.metrics["prefetch"] = stats
+
+    def track_budget(self, stats):
+        """Record the request's deadline, turn cap and the steps degraded to meet them"""
+        self.metrics["budget"] = stats
+
     def track_error(self, error):
         """Track errors that occur during execution"""
         self.metrics["error_count"] += 1
@@ -77,7 +162,7 @@ class EvaluationTracker:
                 "total_runtime": sum(runtimes),
             }
 
-        return {
+        summary = {
             "execution_summary": {
                 "total_runtime_seconds": round(self.metrics["total_runtime"], 3),
                 "start_time": datetime.fromtimestamp(self.metrics["start_time"]).isoformat()
@@ -96,11 +181,77 @@ class EvaluationTracker:
                 / max(len(self.metrics["rag_queries"]), 1),
             },
             "token_usage": self.metrics["tokens_used"],
+            "llm_turns": self.metrics["llm_turns"],
+            "cost": self._cost_summary(),
             "errors": {
                 "error_count": self.metrics["error_count"],
                 "errors": self.metrics["errors"],
             },
             "detailed_tool_calls": self.metrics["tool_calls"],
+            "phase_breakdown": self.spans.breakdown(),
+            "critical_path": self.spans.critical_path(),
+        }
+        tiers = self._tier_summary()
+        if tiers:
+            summary["model_tiers"] = tiers
+        coalescing = self._coalescing_summary()
+        if coalescing:
+            summary["coalescing"] = coalescing
+        if self.metrics["budget"] is not None:
+            summary["budget"] = self.metrics["budget"]
+        if self.metrics["prefetch"] is not None:
+            summary["prefetch"] = self.metrics["prefetch"]
+        if self.memory is not None:
+            summary["memory_profile"] = self.memory.summary(self.spans.spans())
+        return summary
+
+    def _tier_summary(self):
+        # Tokens, latency and cost per model tier, when the agent routes turns (model_routing)
+        tiers = {}
+        for turn in self.metrics["llm_turns"]:
+            if turn["tier"] is None:
+                continue
+            tier = tiers.setdefault(
+                turn["tier"],
+                {
+                    "turns": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "latency_seconds": 0.0,
+                    "cost_usd": 0.0,
+                    "answered_turns": 0,
+                },
+            )
+            tier["turns"] += 1
+            tier["input_tokens"] += turn["input_tokens"]
+            tier["output_tokens"] += turn["output_tokens"]
+            tier["latency_seconds"] = round(
+                tier["latency_seconds"] + (turn["latency_seconds"] or 0), 3
+            )
+            tier["cost_usd"] = round(tier["cost_usd"] + (turn["cost_usd"] or 0), 6)
+            # Tool-tier turns that answered instead of calling a tool were escalated
+            tier["answered_turns"] += not turn["tool_calls"]
+        return tiers
+
+    def _coalescing_summary(self):
+        # Calls of this run that waited for an identical call of another run (single_flight)
+        shared = {}
+        for recorded in self.spans.spans():
+            if recorded.name == "coalesced_wait":
+                flight = recorded.attributes.get("flight")
+                shared[flight] = shared.get(flight, 0) + 1
+        if not shared:
+            return {}
+        return {"served_by_coalescing": False, "coalesced_calls": shared}
+
+    def _cost_summary(self):
+        turns = self.metrics["llm_turns"]
+        unpriced = sorted({str(t["model"]) for t in turns if t["cost_usd"] is None})
+        return {
+            "total_usd": round(sum(t["cost_usd"] or 0 for t in turns), 6),
+            "per_turn_max_usd": max((t["cost_usd"] or 0 for t in turns), default=0),
+            # Totals leave these models' turns out
+            "unpriced_models": unpriced,
         }
 
 
@@ -111,6 +262,8 @@ class EvaluationCallbackHandler(BaseCallbackHandler):
         super().__init__()
         self.tracker = evaluation_tracker
         self.tool_call_stack = []  # Stack to handle multiple concurrent tool calls
+        self.open_spans = {}  # run_id -> (span, token) of running tools and LLM calls
+        self.llm_starts = {}  # run_id -> (perf_counter_ns, model name) of running LLM calls
 
     def on_tool_start(self, serialized, input_str, **kwargs):
         """Called when a tool starts running"""
@@ -146,8 +299,15 @@ class EvaluationCallbackHandler(BaseCallbackHandler):
         start_time = time.time()
 
         # Push to stack to handle concurrent/nested tool calls
-        call_info = {"tool_name": tool_name, "start_time": start_time, "input": input_str}
+        call_info = {
+            "tool_name": tool_name,
+            "start_time": start_time,
+            "start_ns": time.perf_counter_ns(),
+            "input": input_str,
+        }
         self.tool_call_stack.append(call_info)
+        # The tool body runs in a copy of this context, so its phases nest under this span
+        self.open_spans[kwargs.get("run_id")] = enter_span(f"tool.{tool_name}")
 
         # Log tool start
         print(f"🔧 Starting tool: {tool_name}")
@@ -161,7 +321,8 @@ class EvaluationCallbackHandler(BaseCallbackHandler):
         call_info = self.tool_call_stack.pop()
         tool_name = call_info["tool_name"]
         start_time = call_info["start_time"]
-        end_time = time.time()
+        end_time = start_time + (time.perf_counter_ns() - call_info["start_ns"]) / 1e9
+        exit_span(*self.open_spans.pop(kwargs.get("run_id"), (None, None)))
 
         # Track the tool call
         self.tracker.track_tool_call(tool_name, start_time, end_time, output)
@@ -200,34 +361,78 @@ class EvaluationCallbackHandler(BaseCallbackHandler):
             call_info = self.tool_call_stack.pop()
             tool_name = call_info["tool_name"]
             start_time = call_info["start_time"]
-            end_time = time.time()
+            end_time = start_time + (time.perf_counter_ns() - call_info["start_ns"]) / 1e9
             self.tracker.track_tool_call(tool_name, start_time, end_time)
+        exit_span(*self.open_spans.pop(kwargs.get("run_id"), (None, None)))
 
         print(f"❌ Tool error: {error}")
 
     def on_llm_start(self, serialized, prompts, **kwargs):
         """Called when the LLM starts processing"""
+        run_id = kwargs.get("run_id")
+        metadata = kwargs.get("metadata") or {}
+        recorder = current_recorder()
+        if recorder is not None:
+            attributes = {"tier": metadata["model_tier"]} if "model_tier" in metadata else {}
+            self.open_spans[run_id] = (recorder.start("llm", current_span(), **attributes), None)
+        self.llm_starts[run_id] = (
+            time.perf_counter_ns(),
+            metadata.get("ls_model_name"),
+            metadata.get("model_tier"),
+        )
         print("🤖 LLM processing...")
 
     def on_llm_end(self, response, **kwargs):
-        """Called when LLM finishes - extract accurate token usage from response"""
+        """Called when LLM finishes - record the turn's tokens, latency and tool calls"""
+        run_id = kwargs.get("run_id")
+        self._end_llm_span(run_id)
+        start_ns, model, tier = self.llm_starts.pop(run_id, (None, None, None))
+        latency = (time.perf_counter_ns() - start_ns) / 1e9 if start_ns is not None else None
         try:
-            # Try to extract usage metadata from the LLM response
-            # This is model-specific, but most modern LLMs provide this info
-            if hasattr(response, "llm_output") and response.llm_output:
-                usage = response.llm_output.get("token_usage", {})
+            llm_output = getattr(response, "llm_output", None) or {}
+            input_tokens = output_tokens = cached_tokens = 0
+            tool_calls = []
+            found_usage = False
+            for generation in response.generations[0] if response.generations else []:
+                message = getattr(generation, "message", None)
+                if message is None:
+                    continue
+                model = (getattr(message, "response_metadata", None) or {}).get(
+                    "model_name", model
+                )
+                tool_calls += [call["name"] for call in getattr(message, "tool_calls", None) or []]
+                usage = getattr(message, "usage_metadata", None)
                 if usage:
-                    # Accumulate tokens (multiple LLM calls may occur)
-                    self.tracker.metrics["tokens_used"]["input_tokens"] += usage.get(
-                        "prompt_tokens", 0
-                    )
-                    self.tracker.metrics["tokens_used"]["output_tokens"] += usage.get(
-                        "completion_tokens", 0
-                    )
-                    self.tracker.metrics["tokens_used"]["total_tokens"] = (
-                        self.tracker.metrics["tokens_used"]["input_tokens"]
-                        + self.tracker.metrics["tokens_used"]["output_tokens"]
-                    )
-        except Exception as e:
+                    found_usage = True
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+                    cached_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0)
+
+            # Models without usage metadata on the message may still report it here
+            if not found_usage:
+                usage = llm_output.get("token_usage") or {}
+                input_tokens = usage.get("prompt_tokens", 0)
+                output_tokens = usage.get("completion_tokens", 0)
+
+            self.tracker.track_llm_turn(
+                llm_output.get("model_name", model),
+                input_tokens,
+                output_tokens,
+                cached_input_tokens=cached_tokens,
+                latency=latency,
+                tool_calls=tool_calls,
+                tier=tier,
+            )
+        except Exception:
             # If token extraction fails, continue without erroring
             pass
+
+    def on_llm_error(self, error, **kwargs):
+        """Called when an LLM call fails"""
+        self._end_llm_span(kwargs.get("run_id"))
+        self.llm_starts.pop(kwargs.get("run_id"), None)
+
+    def _end_llm_span(self, run_id):
+        llm_span, _ = self.open_spans.pop(run_id, (None, None))
+        if llm_span is not None:
+            self.tracker.spans.end(llm_span)
@@ -48,6 +48,7 @@ def save_evaluation_results(query, evaluation_summary, base_filename, script_dir
             json.dump(evaluation_data, f, indent=2, default=str)
 
         print(f"\n📊 Evaluation results saved to: {eval_file_path}")
+        record_evaluation_metrics(query, evaluation_summary)
         return eval_file_path
 
     except Exception as e:
@@ -55,6 +56,16 @@ def save_evaluation_results(query, evaluation_summary, base_filename, script_dir
         return None
 
 
+def record_evaluation_metrics(query, evaluation_summary):
+    """Append a run's summary to the metrics store used by `eval report`"""
+    try:
+        from .metrics_store import get_metrics_store
+
+        get_metrics_store().record(query, evaluation_summary)
+    except Exception as e:
+        print(f"\n⚠️ Warning: Could not record evaluation metrics: {e}")
+
+
 def display_performance_summary(evaluation_summary):
     """Display key performance metrics in a user-friendly format"""
     if not evaluation_summary:
@@ -74,6 +85,102 @@ def display_performance_summary(evaluation_summary):
         f"   🎯 Tokens Used: {token_usage.get('total_tokens', 0)} (in: {token_usage.get('input_tokens', 0)}, out: {token_usage.get('output_tokens', 0)})"
     )
 
+    # Tokens, latency and cost of each LLM turn
+    turns = evaluation_summary.get("llm_turns", [])
+    if turns:
+        cost = evaluation_summary.get("cost", {})
+        unpriced = cost.get("unpriced_models")
+        print(
+            f"   💰 Estimated Cost: ${cost.get('total_usd', 0):.4f} over {len(turns)} LLM turns"
+            + (f" (unpriced: {', '.join(unpriced)})" if unpriced else "")
+        )
+        for turn in turns:
+            line = (
+                f"      #{turn['turn']:<3} in {turn['input_tokens']:>7} "
+                f"(cached {turn['cached_input_tokens']:>6}) out {turn['output_tokens']:>6}"
+            )
+            if turn["latency_seconds"] is not None:
+                line += f" {turn['latency_seconds']:>7.2f}s"
+            if turn["cost_usd"] is not None:
+                line += f" ${turn['cost_usd']:.4f}"
+            if turn.get("tier"):
+                line += f" [{turn['tier']}]"
+            if turn["tool_calls"]:
+                line += f"  → {', '.join(turn['tool_calls'])}"
+            print(line)
+        for name, tier in evaluation_summary.get("model_tiers", {}).items():
+            print(
+                f"      {name:<10} {tier['turns']} turns, in {tier['input_tokens']} "
+                f"out {tier['output_tokens']}, {tier['latency_seconds']:.2f}s, "
+                f"${tier['cost_usd']:.4f}"
+            )
+
+    # Speculative research retrieval: calls it served and prefetched queries it wasted
+    prefetch = evaluation_summary.get("prefetch")
+    if prefetch and prefetch["prefetched_queries"]:
+        print(
+            f"   ⚡ Research Prefetch: {prefetch['hits']}/{prefetch['research_calls']} research"
+            f" calls served, {prefetch['wasted']}/{len(prefetch['prefetched_queries'])}"
+            " prefetched queries wasted"
+        )
+
+    # Deadline and turn cap, and what was cut short to meet them
+    budget = evaluation_summary.get("budget")
+    if budget and (budget["budget_s"] is not None or budget["degradations"]):
+        line = f"   ⏳ Budget: {budget['elapsed_s']:.2f}s"
+        if budget["budget_s"] is not None:
+            line += f" of {budget['budget_s']:.2f}s"
+        if budget["forced_final_answer"]:
+            line += ", final answer forced"
+        print(line)
+        for degradation in budget["degradations"]:
+            print(f"      {degradation['step']}: {degradation['detail']}")
+
+    coalescing = evaluation_summary.get("coalescing")
+    if coalescing:
+        if coalescing["served_by_coalescing"]:
+            print(
+                "   🔗 Coalesced: shared an identical request already in flight"
+                f" (waited {coalescing['waited_seconds']:.2f}s)"
+            )
+        if coalescing.get("coalesced_calls"):
+            calls = ", ".join(f"{n} x {name}" for name, n in coalescing["coalesced_calls"].items())
+            print(f"   🔗 Coalesced calls: {calls}")
+
+    # Where the time went: slowest phases by total time, and the critical path
+    phases = evaluation_summary.get("phase_breakdown", {})
+    if phases:
+        print("   🧭 Phases (total / self):")
+        for name, phase in list(phases.items())[:8]:
+            print(
+                f"      {name:<24} {phase['total_ms']:>10.1f} ms {phase['self_ms']:>10.1f} ms"
+                f"  x{phase['count']}"
+            )
+    critical_path = evaluation_summary.get("critical_path", [])
+    if len(critical_path) > 1:
+        print("   🛤️  Critical path:")
+        for step in critical_path:
+            print(f"      {'  ' * step['depth']}{step['name']} ({step['duration_ms']:.1f} ms)")
+
+    # Memory per phase, when the run was profiled (--memprofile)
+    memory = evaluation_summary.get("memory_profile")
+    if memory:
+        print(
+            f"   🧠 Memory: peak RSS {memory['peak_rss_mb']:.1f} MB "
+            f"({memory['rss_start_mb']:.1f} → {memory['rss_end_mb']:.1f} MB), "
+            f"peak traced {memory['peak_traced_mb']:.1f} MB"
+        )
+        print(f"      {'phase':<24} {'peak RSS':>12} {'peak traced':>12} {'growth':>10}")
+        for name, phase in list(memory["phases"].items())[:8]:
+            print(
+                f"      {name:<24} {phase['peak_rss_mb']:>9.1f} MB"
+                f" {phase['peak_traced_mb']:>9.1f} MB {phase['traced_growth_mb']:>7.1f} MB"
+            )
+        if memory["top_allocations"]:
+            print("   📍 Top allocation sites:")
+            for site in memory["top_allocations"][:5]:
+                print(f"      {site['size_kb']:>10.1f} KB  {site['site']}")
+
     # Show any errors
     errors = evaluation_summary.get("errors", {})
     if errors.get("error_count", 0) > 0:
@@ -0,0 +1,210 @@
+"""
+Optional per-phase memory profiling for tracked runs.
+
+While a MemoryProfiler runs, a background thread samples the process RSS and the memory
+traced by tracemalloc every few milliseconds, and the run's SpanRecorder adds a sample at
+every span start and end. Each phase (span) then gets the peak RSS and traced memory seen
+while it was open and how much traced memory it left behind, and the run gets the top
+allocation sites by growth since profiling started.
+
+tracemalloc slows allocation-heavy Python code noticeably, so profiling is off unless
+requested (EvaluationTracker(memory_profile=True), or --memprofile on the agent and rag
+CLIs).
+
+tracemalloc is process-wide, so profilers running at the same time (e.g. concurrent
+requests on the planner server) share one tracing session: it starts with the first of them
+and stops with the last, and each profiler sees every peak since its own previous sample.
+Traced memory and allocation sites then include the other runs' allocations.
+"""
+
+import bisect
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+
+def rss_bytes() -> int:
+    """Current resident set size (the process high-water mark where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _mb(size) -> float:
+    return round(size / 2**20, 2)
+
+
+_tracing_lock = threading.Lock()
+# Profilers currently using tracemalloc, and whether one of them started it
+_tracing_profilers = set()
+_started_tracemalloc = False
+
+
+def _start_tracing(profiler):
+    global _started_tracemalloc
+    with _tracing_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        _tracing_profilers.add(profiler)
+
+
+def _stop_tracing(profiler):
+    """Stop tracemalloc once no profiler uses it, unless it was started by someone else"""
+    global _started_tracemalloc
+    with _tracing_lock:
+        _tracing_profilers.discard(profiler)
+        if not _tracing_profilers and _started_tracemalloc:
+            tracemalloc.stop()
+            _started_tracemalloc = False
+
+
+def _traced_memory(profiler) -> tuple[int, int]:
+    """Traced bytes now and at their peak since the profiler's previous call"""
+    with _tracing_lock:
+        if not tracemalloc.is_tracing():
+            return 0, 0
+        traced, peak = tracemalloc.get_traced_memory()
+        # reset_peak is global: the peak it discards is kept for every other profiler too
+        tracemalloc.reset_peak()
+        for other in _tracing_profilers:
+            other._pending_peak = max(other._pending_peak, peak)
+        peak = max(profiler._pending_peak, peak)
+        profiler._pending_peak = 0
+        return traced, peak
+
+
+class MemoryProfiler:
+    """RSS and tracemalloc samples over a run, with per-phase and allocation-site views"""
+
+    def __init__(self, interval_s: float = 0.005, top_n: int = 10):
+        """
+        Args:
+            interval_s (float): Background sampling interval.
+            top_n (int): Number of allocation sites to report.
+        """
+        self.interval_s = interval_s
+        self.top_n = top_n
+        # (perf_counter_ns, rss, traced, traced peak since the previous sample) in bytes
+        self.samples = []
+        self.top_allocations = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._baseline = None
+        # Highest traced peak seen by other profilers' samples since this one's last sample
+        self._pending_peak = 0
+
+    def sample(self):
+        """Record RSS and traced memory, now and at its peak since the previous sample"""
+        rss = rss_bytes()
+        with self._lock:
+            traced, peak = _traced_memory(self)
+            self.samples.append((time.perf_counter_ns(), rss, traced, peak))
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def start(self):
+        _start_tracing(self)
+        self._baseline = tracemalloc.take_snapshot()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="memory-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+
+        ignored = (tracemalloc.__file__, __file__)
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, path) for path in ignored]
+        )
+        self.top_allocations = [
+            {
+                "site": str(stat.traceback[0]),
+                "size_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(self._baseline, "lineno")[: self.top_n]
+            if stat.size_diff > 0
+        ]
+        self._baseline = None
+        _stop_tracing(self)
+
+    def window(self, start_ns: int, end_ns: int) -> dict:
+        """
+        Memory over [start_ns, end_ns], from the last sample at or before start_ns to the last
+        sample at or before end_ns (spans sample at both ends, so these are exact).
+
+        Returns:
+            dict: peak_rss and peak_traced in bytes, and traced_growth, the traced memory at
+            the end minus at the start.
+        """
+        with self._lock:
+            samples = list(self.samples)
+        times = [s[0] for s in samples]
+        first = max(0, bisect.bisect_right(times, start_ns) - 1)
+        last = max(first, bisect.bisect_right(times, end_ns) - 1)
+        return {
+            "peak_rss": max(s[1] for s in samples[first : last + 1]),
+            "peak_traced": max([samples[first][2]] + [s[3] for s in samples[first + 1 : last + 1]]),
+            "traced_growth": samples[last][2] - samples[first][2],
+        }
+
+    def breakdown(self, spans) -> dict:
+        """
+        Memory per span name, highest peak RSS first.
+
+        Args:
+            spans: Finished spans, e.g. SpanRecorder.spans().
+
+        Returns:
+            dict: {name: {"count", "peak_rss_mb", "peak_traced_mb", "traced_growth_mb"}}, with
+            peaks as the maximum over the name's spans and growth summed over them.
+        """
+        phases = {}
+        for recorded in spans:
+            if recorded.end_ns is None:
+                continue
+            stats = self.window(recorded.start_ns, recorded.end_ns)
+            phase = phases.setdefault(
+                recorded.name, {"count": 0, "peak_rss": 0, "peak_traced": 0, "traced_growth": 0}
+            )
+            phase["count"] += 1
+            phase["peak_rss"] = max(phase["peak_rss"], stats["peak_rss"])
+            phase["peak_traced"] = max(phase["peak_traced"], stats["peak_traced"])
+            phase["traced_growth"] += stats["traced_growth"]
+        return {
+            name: {
+                "count": phase["count"],
+                "peak_rss_mb": _mb(phase["peak_rss"]),
+                "peak_traced_mb": _mb(phase["peak_traced"]),
+                "traced_growth_mb": _mb(phase["traced_growth"]),
+            }
+            for name, phase in sorted(phases.items(), key=lambda item: -item[1]["peak_rss"])
+        }
+
+    def summary(self, spans) -> dict:
+        """Run-level peaks, the per-phase breakdown and the top allocation sites"""
+        if not self.samples:
+            return {}
+        return {
+            "rss_start_mb": _mb(self.samples[0][1]),
+            "rss_end_mb": _mb(self.samples[-1][1]),
+            "peak_rss_mb": _mb(max(s[1] for s in self.samples)),
+            "peak_traced_mb": _mb(max(s[3] for s in self.samples)),
+            "phases": self.breakdown(spans),
+            "top_allocations": self.top_allocations,
+        }
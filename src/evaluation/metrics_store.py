@@ -0,0 +1,218 @@
+"""
+Append-only SQLite store of evaluation summaries, for percentiles across many runs.
+
+Every tracked run appends one row to runs (timestamp, total runtime, tokens, errors) and
+one row per tool call to tool_calls. Both are indexed by timestamp, so a report over a
+time window reads only that window's rows instead of parsing every per-query JSON file.
+
+The database defaults to results/metrics.db; set IOT_METRICS_DB to use another file.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_METRICS_DB = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../results/metrics.db")
+)
+
+PERCENTILES = (50, 95, 99)
+
+# Run-level metrics (columns of runs)
+RUN_METRICS = ("total_runtime_s", "input_tokens", "output_tokens", "total_tokens")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    query TEXT,
+    total_runtime_s REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    total_tokens INTEGER,
+    error_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+CREATE TABLE IF NOT EXISTS tool_calls (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    timestamp REAL NOT NULL,
+    tool TEXT NOT NULL,
+    runtime_s REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tool_calls_timestamp ON tool_calls (timestamp, tool);
+"""
+
+
+def get_metrics_db_path() -> str:
+    """Return the configured metrics database"""
+    return os.getenv("IOT_METRICS_DB") or DEFAULT_METRICS_DB
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values: list) -> dict:
+    """Sample count and p50/p95/p99 of a list of values"""
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        **{f"p{pct}": percentile(ordered, pct) for pct in PERCENTILES},
+    }
+
+
+class MetricsStore:
+    """Append-only run metrics with per-window percentile queries"""
+
+    def __init__(self, db_path: str = None):
+        """
+        Args:
+            db_path (str): SQLite database file, created if missing (default:
+                IOT_METRICS_DB or results/metrics.db).
+        """
+        self.db_path = db_path or get_metrics_db_path()
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def record(self, query: str, summary: dict, timestamp: float = None) -> int:
+        """
+        Append an EvaluationTracker summary.
+
+        Args:
+            query (str): The run's query.
+            summary (dict): EvaluationTracker.get_summary() output.
+            timestamp (float): Unix time of the run (default: now).
+
+        Returns:
+            int: The new run's id.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        execution = summary.get("execution_summary", {})
+        tokens = summary.get("token_usage", {})
+        errors = summary.get("errors", {})
+        connection = self._connect()
+        with connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (timestamp, query, total_runtime_s, input_tokens, "
+                "output_tokens, total_tokens, error_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    timestamp,
+                    query,
+                    execution.get("total_runtime_seconds"),
+                    tokens.get("input_tokens", 0),
+                    tokens.get("output_tokens", 0),
+                    tokens.get("total_tokens", 0),
+                    errors.get("error_count", 0),
+                ),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO tool_calls (run_id, timestamp, tool, runtime_s) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, timestamp, call["tool"], call["runtime"])
+                    for call in summary.get("detailed_tool_calls", [])
+                ],
+            )
+        return run_id
+
+    def window_stats(self, since: float, until: float) -> dict:
+        """
+        Percentiles of every metric for runs in [since, until).
+
+        Returns:
+            dict: {"runs", "errors", "metrics": {name: {"count", "p50", "p95", "p99"}}},
+            with one metric per run-level column and one "tool:<name>" per tool.
+        """
+        connection = self._connect()
+        rows = connection.execute(
+            f"SELECT error_count, {', '.join(RUN_METRICS)} FROM runs "
+            "WHERE timestamp >= ? AND timestamp < ?",
+            (since, until),
+        ).fetchall()
+        metrics = {}
+        for i, name in enumerate(RUN_METRICS, start=1):
+            values = [row[i] for row in rows if row[i] is not None]
+            if values:
+                metrics[name] = summarize(values)
+
+        tool_runtimes = {}
+        for tool, runtime in connection.execute(
+            "SELECT tool, runtime_s FROM tool_calls WHERE timestamp >= ? AND timestamp < ?",
+            (since, until),
+        ):
+            tool_runtimes.setdefault(tool, []).append(runtime)
+        for tool in sorted(tool_runtimes):
+            metrics[f"tool:{tool}"] = summarize(tool_runtimes[tool])
+
+        return {
+            "runs": len(rows),
+            "errors": sum(row[0] or 0 for row in rows),
+            "metrics": metrics,
+        }
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+def compare_windows(baseline: dict, candidate: dict, threshold=0.2, min_samples=5) -> list[dict]:
+    """
+    Metrics whose p50 or p95 grew by more than threshold from baseline to candidate.
+
+    Args:
+        baseline (dict): window_stats of the earlier window.
+        candidate (dict): window_stats of the later window.
+        threshold (float): Relative increase that counts as a regression (0.2 = +20%).
+        min_samples (int): Metrics with fewer samples in either window are not compared.
+
+    Returns:
+        list[dict]: {"metric", "percentile", "baseline", "candidate", "change"} per regression.
+    """
+    regressions = []
+    for name, after in candidate["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None or min(before["count"], after["count"]) < min_samples:
+            continue
+        for key in ("p50", "p95"):
+            if before[key] and after[key] > before[key] * (1 + threshold):
+                regressions.append(
+                    {
+                        "metric": name,
+                        "percentile": key,
+                        "baseline": before[key],
+                        "candidate": after[key],
+                        "change": round(after[key] / before[key] - 1, 3),
+                    }
+                )
+    return regressions
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(db_path: str = None) -> MetricsStore:
+    """Process-wide MetricsStore for db_path (default: the configured database)"""
+    db_path = db_path or get_metrics_db_path()
+    store = _stores.get(db_path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(db_path)
+            if store is None:
+                store = _stores[db_path] = MetricsStore(db_path)
+    return store
@@ -0,0 +1,129 @@
+"""
+Per-request latency budgets, propagated to every tool and retrieval call.
+
+A RequestBudget holds a request's deadline (a time budget in seconds from its start) and
+its cap on agent turns. While it is current (see budget_scope), any code can ask how much
+time is left:
+
+    budget = current_budget()
+    if budget is not None and budget.low():
+        top_k = min(top_k, LOW_BUDGET_TOP_K)
+
+The budget is a context variable, so it reaches tool calls and background retrievals that
+run in a copied context (as LangChain runs tools). Steps that cut their work short call
+note_degradation, and the request's evaluation summary lists what was degraded.
+
+Defaults come from IOT_REQUEST_BUDGET_S (unset: no deadline) and IOT_MAX_AGENT_TURNS
+(default 8); the agent CLI, the planner server and the client can set both per request.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_MAX_TURNS = 8
+# Share of the budget under which steps start to degrade (and the agent stops calling
+# tools), leaving time for the final answer
+LOW_BUDGET_FRACTION = 0.25
+
+_current_budget = contextvars.ContextVar("request_budget", default=None)
+
+
+class RequestBudget:
+    """Deadline and turn cap of one request, and the steps degraded to meet them"""
+
+    def __init__(self, budget_s: float = None, max_turns: int = None):
+        """
+        Args:
+            budget_s (float): Seconds the request may take; None for no deadline.
+            max_turns (int): Most LLM turns the agent may take; None for no cap.
+        """
+        if budget_s is not None and budget_s <= 0:
+            raise ValueError(f"budget_s must be positive, got {budget_s}")
+        if max_turns is not None and max_turns < 1:
+            raise ValueError(f"max_turns must be at least 1, got {max_turns}")
+        self.budget_s = budget_s
+        self.max_turns = max_turns
+        self.started = time.monotonic()
+        self.deadline = self.started + budget_s if budget_s is not None else None
+        self.forced_final_answer = False
+        self.degradations = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (0 once passed), or None without a deadline"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def low(self) -> bool:
+        """Whether less than LOW_BUDGET_FRACTION of the time budget is left"""
+        return self.deadline is not None and (
+            self.remaining() < self.budget_s * LOW_BUDGET_FRACTION
+        )
+
+    def cap(self, timeout: float = None) -> float:
+        """The smaller of timeout and the time left (either may be None for no limit)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def note(self, step: str, detail: str):
+        with self._lock:
+            self.degradations.append(
+                {
+                    "step": step,
+                    "detail": detail,
+                    "at_seconds": round(time.monotonic() - self.started, 3),
+                }
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            degradations = list(self.degradations)
+        remaining = self.remaining()
+        return {
+            "budget_s": self.budget_s,
+            "max_turns": self.max_turns,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "remaining_s": round(remaining, 3) if remaining is not None else None,
+            "deadline_exceeded": self.expired(),
+            "forced_final_answer": self.forced_final_answer,
+            "degradations": degradations,
+        }
+
+
+def get_default_budget(budget_s: float = None, max_turns: int = None) -> RequestBudget:
+    """A budget with IOT_REQUEST_BUDGET_S and IOT_MAX_AGENT_TURNS filling unset values"""
+    if budget_s is None and os.getenv("IOT_REQUEST_BUDGET_S"):
+        budget_s = float(os.getenv("IOT_REQUEST_BUDGET_S"))
+    if max_turns is None:
+        max_turns = int(os.getenv("IOT_MAX_AGENT_TURNS") or DEFAULT_MAX_TURNS)
+    return RequestBudget(budget_s=budget_s, max_turns=max_turns)
+
+
+@contextmanager
+def budget_scope(budget: RequestBudget):
+    """Make budget current for the enclosed block"""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> RequestBudget:
+    return _current_budget.get()
+
+
+def note_degradation(step: str, detail: str):
+    """Record on the current budget (if any) that a step cut its work short"""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.note(step, detail)
@@ -32,9 +32,28 @@ def main():
         default=False,
         help="Enable verbose output for debugging purposes.",
     )
+    parser.add_argument(
+        "--memprofile",
+        action="store_true",
+        help="Record peak RSS and allocations per phase (indexing, embedding, search).",
+    )
     args = parser.parse_args()
-    results = rag_query(args.query, args.top_k, args.verbose)
+
+    if not args.memprofile:
+        results = rag_query(args.query, args.top_k, args.verbose)
+        pretty_print_query_result(results)
+        return
+
+    from evaluation import EvaluationTracker, display_performance_summary
+
+    tracker = EvaluationTracker(memory_profile=True)
+    tracker.start_tracking()
+    try:
+        results = rag_query(args.query, args.top_k, args.verbose)
+    finally:
+        tracker.end_tracking()
     pretty_print_query_result(results)
+    display_performance_summary(tracker.get_summary())
 
 
 if __name__ == "__main__":
@@ -1,7 +1,5 @@
-import pymupdf
 import re
 from dataclasses import dataclass
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
 @dataclass
@@ -18,6 +16,7 @@ def extract_text_from_pdf(pdf_path: str):
     """
     Extracts text from a PDF file.
     """
+    import pymupdf
 
     try:
         doc = pymupdf.open(pdf_path)
@@ -43,6 +42,8 @@ def get_text_chunks(pdf_text: str, source_file: str, chunk_size=1000, chunk_over
     Returns:
         List[str]: A list of text chunks.
     """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
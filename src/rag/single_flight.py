@@ -0,0 +1,121 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+When several threads make the same call at the same moment (many users asking the same
+popular question, or batch workers retrieving the same chunks), only the first runs it and
+the others wait for and share its result. Nothing is cached: once the call finishes, the
+next identical call runs again.
+
+    flight = SingleFlight("rag_query")
+    results, shared = flight.do((query_text, top_k), lambda: store.query(query_text, top_k))
+
+An exception raised by the call is raised in every waiter too. A waiter that gives up
+(timeout) stops waiting without affecting the call or the other waiters. If the running
+call is interrupted instead of failing (KeyboardInterrupt, SystemExit), or its result is
+one the caller marks as not shareable (e.g. cut short by its own deadline), the waiters
+retry and one of them runs the call in its place.
+
+Waiters record their wait as a "coalesced_wait" span (with a "flight" attribute), so a
+tracked run's summary shows which of its calls were shared. Set IOT_COALESCE=0 to run
+every call on its own.
+"""
+
+import contextvars
+import os
+import threading
+
+from .spans import span
+
+# (flight name, key) of the calls running in the current context, so a call that repeats
+# itself runs directly instead of waiting on itself
+_running_keys = contextvars.ContextVar("single_flight_keys", default=frozenset())
+
+
+def coalescing_enabled() -> bool:
+    return os.getenv("IOT_COALESCE", "1").strip().lower() not in ("0", "false", "off")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome with concurrent callers"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Label for this kind of call in spans and summaries.
+        """
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout: float = None, share=None):
+        """
+        Run fn, or wait for the identical call already running under key.
+
+        Args:
+            key: Hashable identity of the call.
+            fn (callable): The call, taking no arguments.
+            timeout (float): Longest time to wait for another caller's call, in seconds.
+            share (callable): Predicate on this call's result; when it returns False the
+                waiters don't receive the result and run the call again instead.
+
+        Returns:
+            tuple: (result, shared), where shared is True if another caller ran the call.
+
+        Raises:
+            TimeoutError: The running call didn't finish within timeout.
+        """
+        if (self.name, key) in _running_keys.get():
+            return fn(), False
+
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+            if leader:
+                return self._run(key, call, fn, share), False
+
+            with span("coalesced_wait", flight=self.name):
+                finished = call.done.wait(timeout)
+            if not finished:
+                raise TimeoutError(f"{self.name} call still running after {timeout}s")
+            if call.abandoned:
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+    def _run(self, key, call: _Call, fn, share):
+        token = _running_keys.set(_running_keys.get() | {(self.name, key)})
+        try:
+            result = fn()
+            if share is None or share(result):
+                call.result = result
+            else:
+                call.abandoned = True
+            return result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            _running_keys.reset(token)
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of calls currently running"""
+        with self._lock:
+            return len(self._calls)
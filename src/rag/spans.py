@@ -0,0 +1,275 @@
+"""
+Hierarchical latency spans for breaking a run down into phases.
+
+A SpanRecorder collects the spans of one tracked run. While it is active (see
+EvaluationTracker.start_tracking), any code can time a phase with
+
+    with span("rag.search", top_k=5):
+        ...
+
+or decorate a function with @traced("rag.embed"). Spans nest under the span that is open
+in the current context, including across threads started with a copied context (as
+LangChain does for tool calls). When no recorder is active, span() only does a context
+variable lookup, so instrumented code costs nothing outside tracked runs.
+
+Timestamps come from time.perf_counter_ns, so durations are monotonic and exact.
+"""
+
+import contextvars
+import functools
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+_current_recorder = contextvars.ContextVar("span_recorder", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """One timed phase and the phases nested in it"""
+
+    name: str
+    start_ns: int
+    end_ns: int = None
+    parent: "Span" = field(default=None, repr=False)
+    children: list = field(default_factory=list, repr=False)
+    attributes: dict = field(default_factory=dict)
+    id: int = field(default_factory=lambda: next(_span_ids))
+
+    @property
+    def duration_ns(self) -> int:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return end - self.start_ns
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    @property
+    def self_ns(self) -> int:
+        """Time not covered by any child span"""
+        return max(0, self.duration_ns - _covered_ns(self.children))
+
+
+def _covered_ns(spans) -> int:
+    """Length of the union of the spans' intervals (children may run in parallel)"""
+    covered = 0
+    cursor = None
+    for child in sorted(spans, key=lambda s: s.start_ns):
+        end = child.start_ns + child.duration_ns
+        if cursor is None or child.start_ns >= cursor:
+            covered += end - child.start_ns
+            cursor = end
+        elif end > cursor:
+            covered += end - cursor
+            cursor = end
+    return covered
+
+
+class SpanRecorder:
+    """Collects the span tree of one run"""
+
+    def __init__(self, on_boundary=None):
+        """
+        Args:
+            on_boundary (callable): Called with no arguments right before a span starts and
+                ends (e.g. MemoryProfiler.sample).
+        """
+        self.roots = []
+        self.on_boundary = on_boundary
+        self._lock = threading.Lock()
+
+    def start(self, name: str, parent: Span = None, **attributes) -> Span:
+        """Open a span under parent (a root span if None)"""
+        if self.on_boundary is not None:
+            self.on_boundary()
+        new_span = Span(name, time.perf_counter_ns(), parent=parent, attributes=attributes)
+        with self._lock:
+            (parent.children if parent is not None else self.roots).append(new_span)
+        return new_span
+
+    def end(self, ended: Span):
+        if ended.end_ns is None:
+            if self.on_boundary is not None:
+                self.on_boundary()
+            ended.end_ns = time.perf_counter_ns()
+
+    def spans(self):
+        """All recorded spans, depth first"""
+        stack = list(reversed(self.roots))
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current.children))
+
+    def breakdown(self) -> dict:
+        """
+        Time per span name, slowest first.
+
+        Returns:
+            dict: {name: {"count", "total_ms", "self_ms"}}, where self_ms excludes time
+            covered by nested spans.
+        """
+        phases = {}
+        for recorded in self.spans():
+            phase = phases.setdefault(recorded.name, {"count": 0, "total_ns": 0, "self_ns": 0})
+            phase["count"] += 1
+            phase["total_ns"] += recorded.duration_ns
+            phase["self_ns"] += recorded.self_ns
+        return {
+            name: {
+                "count": phase["count"],
+                "total_ms": round(phase["total_ns"] / 1e6, 3),
+                "self_ms": round(phase["self_ns"] / 1e6, 3),
+            }
+            for name, phase in sorted(phases.items(), key=lambda item: -item[1]["total_ns"])
+        }
+
+    def critical_path(self) -> list[dict]:
+        """
+        The chain of spans that determined the run's duration.
+
+        Walking back from each span's end, the child that finished last before the cursor
+        is on the path; the cursor then moves to that child's start. Chosen children are
+        expanded the same way.
+
+        Returns:
+            list[dict]: {"name", "depth", "start_ms", "duration_ms"} in start order, with
+            start_ms relative to the first root span.
+        """
+        if not self.roots:
+            return []
+        origin = min(root.start_ns for root in self.roots)
+        path = []
+
+        def walk(current: Span, depth: int):
+            path.append(
+                {
+                    "name": current.name,
+                    "depth": depth,
+                    "start_ms": round((current.start_ns - origin) / 1e6, 3),
+                    "duration_ms": round(current.duration_ms, 3),
+                }
+            )
+            cursor = current.start_ns + current.duration_ns
+            chosen = []
+            for child in sorted(
+                current.children, key=lambda s: s.start_ns + s.duration_ns, reverse=True
+            ):
+                if child.start_ns + child.duration_ns <= cursor:
+                    chosen.append(child)
+                    cursor = child.start_ns
+            for child in reversed(chosen):
+                walk(child, depth + 1)
+
+        walk(max(self.roots, key=lambda root: root.duration_ns), 0)
+        return path
+
+    def to_dict(self) -> list[dict]:
+        """The span tree as nested dicts"""
+
+        def convert(current: Span) -> dict:
+            return {
+                "name": current.name,
+                "duration_ms": round(current.duration_ms, 3),
+                **({"attributes": current.attributes} if current.attributes else {}),
+                **(
+                    {"children": [convert(c) for c in current.children]} if current.children else {}
+                ),
+            }
+
+        return [convert(root) for root in self.roots]
+
+
+def activate(recorder: SpanRecorder, root: Span = None):
+    """Make recorder (and root as the open span) current; returns tokens for deactivate"""
+    return _current_recorder.set(recorder), _current_span.set(root)
+
+
+def deactivate(tokens):
+    """Undo activate; falls back to clearing when called from a different context"""
+    recorder_token, span_token = tokens
+    try:
+        _current_span.reset(span_token)
+        _current_recorder.reset(recorder_token)
+    except ValueError:
+        _current_span.set(None)
+        _current_recorder.set(None)
+
+
+def current_recorder() -> SpanRecorder:
+    return _current_recorder.get()
+
+
+def current_span() -> Span:
+    return _current_span.get()
+
+
+def enter_span(name: str, parent: Span = None, **attributes):
+    """
+    Open a span and make it current, for code that can't use a with block (callbacks).
+
+    Returns:
+        tuple: (span, token) to pass to exit_span, or (None, None) when not recording.
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return None, None
+    opened = recorder.start(
+        name, parent if parent is not None else _current_span.get(), **attributes
+    )
+    return opened, _current_span.set(opened)
+
+
+def exit_span(opened: Span, token):
+    """Close a span opened with enter_span and restore the previously current span"""
+    if opened is None:
+        return
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.end(opened)
+    else:
+        opened.end_ns = opened.end_ns or time.perf_counter_ns()
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        _current_span.set(opened.parent)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a child of the current span; a no-op when not recording"""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield None
+        return
+    opened = recorder.start(name, _current_span.get(), **attributes)
+    token = _current_span.set(opened)
+    try:
+        yield opened
+    finally:
+        _current_span.reset(token)
+        recorder.end(opened)
+
+
+def traced(name: str = None):
+    """Decorator timing every call of a function as a span (named after it by default)"""
+
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_recorder.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
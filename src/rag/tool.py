@@ -1,27 +1,104 @@
 import os
+import threading
+from functools import lru_cache
 
+from .budget import current_budget, note_degradation
 from .parser import extract_text_from_pdf, get_text_chunks
+from .single_flight import SingleFlight, coalescing_enabled
+from .spans import span, traced
 from .vector_store import VectorStore
 
+# Results per query once a request's time budget runs low (see budget)
+LOW_BUDGET_TOP_K = 2
 
+# Serializes first-time indexing when several threads query a cold store at once
+_index_lock = threading.Lock()
+# Identical searches running at the same time embed and search once
+_searches = SingleFlight("rag_query")
+# Indexing started for a request with a deadline, which doesn't wait for it, per db_path
+_background_indexes = {}
+_background_index_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_vector_store(db_path="./chroma_db") -> VectorStore:
+    """Returns a VectorStore for db_path, reusing the open client across calls."""
+    return VectorStore(db_path=db_path)
+
+
+def index_assets(store: VectorStore, log=None):
+    """Index the PDF files in 'assets' into the store, unless another thread already did"""
+    log = log or (lambda message: None)
+    with _index_lock, span("ingest"):
+        if not store.get_or_create_collection().count():
+            log("No existing vector store found. Indexing PDF files in 'assets' directory...")
+            for file in os.listdir("assets"):
+                if file.endswith(".pdf"):
+                    log(f"Processing {file}...")
+                    with span("ingest.extract", file=file):
+                        pdf_text = extract_text_from_pdf(os.path.join("assets", file))
+                    with span("ingest.chunk", file=file):
+                        chunks = get_text_chunks(pdf_text, source_file=file)
+                    store.add_chunks(chunks)
+                    log(f"Added {len(chunks)} chunks from {file} to the vector store.")
+
+
+def _index_in_background(store: VectorStore, db_path: str):
+    with _background_index_lock:
+        thread = _background_indexes.get(db_path)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(
+                target=index_assets, args=(store,), name=f"rag-index:{db_path}", daemon=True
+            )
+            _background_indexes[db_path] = thread
+            thread.start()
+
+
+@traced("rag_query")
 def rag_query(query_text: str, top_k=5, verbose=False, db_path="./chroma_db"):
-    """Runs the RAG query against the vector store."""
+    """
+    Runs the RAG query against the vector store.
+
+    Within a request budget, returns fewer results once the budget runs low and none once
+    it has run out or while a cold store is being indexed, rather than exceeding it.
+    """
 
     def log(message: str):
         """Utility function for logging messages when verbose mode is enabled."""
         if verbose:
             print(message)
 
+    budget = current_budget()
+    if budget is not None and budget.expired():
+        note_degradation("rag_query", "deadline passed; search skipped")
+        return []
+
     # Index vector store if it doesn't already exist
-    store = VectorStore(db_path=db_path)
-    if not store.get_or_create_collection().count():
-        log("No existing vector store found. Indexing PDF files in 'assets' directory...")
-        for file in os.listdir("assets"):
-            if file.endswith(".pdf"):
-                log(f"Processing {file}...")
-                pdf_text = extract_text_from_pdf(os.path.join("assets", file))
-                chunks = get_text_chunks(pdf_text, source_file=file)
-                store.add_chunks(chunks)
-                log(f"Added {len(chunks)} chunks from {file} to the vector store.")
-
-    return store.query(query_text=query_text, top_k=top_k)
+    with span("rag.open_store"):
+        store = get_vector_store(db_path)
+        empty = not store.get_or_create_collection().count()
+    if empty:
+        if budget is not None and budget.deadline is not None:
+            # A first-time index build takes far longer than any request budget
+            _index_in_background(store, db_path)
+            note_degradation("rag_query", "vector store is still being indexed; no results")
+            return []
+        index_assets(store, log)
+
+    if budget is not None and budget.low() and top_k > LOW_BUDGET_TOP_K:
+        note_degradation("rag_query", f"budget low; {LOW_BUDGET_TOP_K} results instead of {top_k}")
+        top_k = LOW_BUDGET_TOP_K
+
+    if not coalescing_enabled():
+        return store.query(query_text=query_text, top_k=top_k)
+    try:
+        results, _ = _searches.do(
+            (query_text, top_k, db_path),
+            lambda: store.query(query_text=query_text, top_k=top_k),
+            timeout=budget.remaining() if budget is not None else None,
+        )
+    except TimeoutError:
+        note_degradation("rag_query", "deadline passed waiting for an identical search")
+        return []
+    # Waiters share the results, so each caller gets its own list
+    return list(results)
@@ -1,10 +1,10 @@
 """ChromaDB Vector Store for IoT RAG"""
 
-import chromadb
 from dataclasses import dataclass
 from pathlib import Path
 
 from .parser import PDFChunk
+from .spans import span
 
 
 @dataclass
@@ -29,8 +29,13 @@ class VectorStore:
         Args:
             db_path (str): Path to the ChromaDB database directory. Defaults to "./chroma_db".
         """
+        import chromadb
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
         self.client = chromadb.PersistentClient(path=db_path)
         self.collection_name = "iot"
+        # The collection's default model, held here so embedding and search can be timed apart
+        self.embedding_function = DefaultEmbeddingFunction()
 
     def get_or_create_collection(self):
         """
@@ -39,7 +44,9 @@ class VectorStore:
         Returns:
             chromadb.Collection: The ChromaDB collection for IoT data.
         """
-        return self.client.get_or_create_collection(name=self.collection_name)
+        return self.client.get_or_create_collection(
+            name=self.collection_name, embedding_function=self.embedding_function
+        )
 
     def add_chunks(self, chunks: list[PDFChunk], batch_size: int = 100):
         """
@@ -56,7 +63,12 @@ class VectorStore:
             texts = [chunk.text for chunk in batch_chunks]
             metadata = [{"source_file": chunk.source_file} for chunk in batch_chunks]
 
-            collection.add(ids=ids, documents=texts, metadatas=metadata)
+            with span("ingest.embed", chunks=len(texts)):
+                embeddings = self.embedding_function(texts)
+            with span("ingest.write", chunks=len(texts)):
+                collection.add(
+                    ids=ids, documents=texts, metadatas=metadata, embeddings=embeddings
+                )
 
     def clear(self):
         """
@@ -78,7 +90,10 @@ class VectorStore:
             top_k (int): The number of top results to return. Defaults to 5.
         """
         collection = self.get_or_create_collection()
-        results = collection.query(query_texts=[query_text], n_results=top_k)
+        with span("rag.embed"):
+            query_embeddings = self.embedding_function([query_text])
+        with span("rag.search", top_k=top_k):
+            results = collection.query(query_embeddings=query_embeddings, n_results=top_k)
 
         # Ensure that the results are in the expected format and handle cases where there are no results
         return [
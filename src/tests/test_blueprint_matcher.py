@@ -0,0 +1,60 @@
+"""Unit tests for the compiled blueprint keyword matcher."""
+
+import json
+
+from agent.tools.blueprint_matcher import BlueprintMatcher, Heuristics
+from agent.tools.iot_blueprint_generator import generate_blueprint
+
+TABLE = {
+    "power supply": [
+        ("USB Power Adapter", ["usb"]),
+        ("Battery Pack", ["battery", "li-ion"]),
+        ("Solar Panel", []),
+    ],
+    "display": [
+        ("Nextion Basic", ["nextion"]),
+        ("Nextion 2.4in", ["nextion 2.4in"]),
+        ("HDMI LCD", ["hdmi lcd"]),
+    ],
+    "microcontroller": [("STM32", ["bt", "bluetooth"]), ("Nano", [])],
+}
+
+
+def test_keywords_match_whole_words_only():
+    matcher = BlueprintMatcher(Heuristics.from_table(TABLE))
+
+    assert matcher.match("busbar monitoring with a subtle indicator") == {}
+    assert matcher.match("USB-powered BT beacon") == {
+        "power supply": "USB Power Adapter",
+        "microcontroller": "STM32",
+    }
+    assert matcher.match("runs on batteries") == {"power supply": "Battery Pack"}
+    assert matcher.match("Li-Ion cell") == {"power supply": "Battery Pack"}
+
+
+def test_option_priority_and_overlapping_keywords():
+    matcher = BlueprintMatcher(Heuristics.from_table(TABLE))
+
+    # "nextion 2.4in" also contains "nextion", whose option comes first
+    assert matcher.match("a nextion 2.4in panel")["display"] == "Nextion Basic"
+    assert matcher.matched_keywords("a nextion 2.4in panel") == {"nextion", "nextion 2 4in"}
+    assert matcher.match("an hdmi lcd")["display"] == "HDMI LCD"
+
+
+def test_heuristics_file_replaces_builtin_table(tmp_path, monkeypatch):
+    path = tmp_path / "heuristics.json"
+    path.write_text(
+        json.dumps(
+            {
+                "sensor": [
+                    {"label": "CO2 Sensor", "keywords": ["co2", "air quality"]},
+                    ["Generic Sensor", []],
+                ],
+                "display": [["E-Ink", ["e-ink"]]],
+            }
+        )
+    )
+    monkeypatch.setenv("IOT_BLUEPRINT_HEURISTICS", str(path))
+
+    assert generate_blueprint("indoor air quality monitor") == {"sensor": "CO2 Sensor"}
+    assert generate_blueprint("thermostat") == {"sensor": "Generic Sensor"}
@@ -0,0 +1,84 @@
+"""Unit tests for batch BOM quoting."""
+
+import json
+
+import numpy as np
+import pytest
+
+from agent.tools.bom_quoting_tool import (
+    allocate,
+    bom_quoting_tool,
+    parse_bill_of_materials,
+    quote_bom,
+)
+
+
+def test_parse_bill_of_materials_quantities():
+    assert parse_bill_of_materials("ESP32-WROOM-32, DHT22 x2, 3 x SG90 Servo, Relay: 4, ") == [
+        ("ESP32-WROOM-32", 1),
+        ("DHT22", 2),
+        ("SG90 Servo", 3),
+        ("Relay", 4),
+    ]
+
+
+def test_allocate_prefers_single_vendor_then_cheapest_split():
+    prices = np.array([[2.0, 1.0, 3.0], [2.0, 1.0, np.inf], [5.0, 4.0, np.inf]])
+    stocks = np.array([[100, 5, 100], [6, 5, 0], [1, 2, 0]])
+    required = np.array([10, 10, 10])
+
+    take = allocate(prices, stocks, required)
+
+    # Line 0: the cheapest offer lacks stock, so the cheapest offer that can fill it wins
+    assert take[0].tolist() == [10, 0, 0]
+    # Line 1: no single offer suffices, so buy cheapest-first across offers
+    assert take[1].tolist() == [5, 5, 0]
+    # Line 2: total stock falls short; buy everything available
+    assert take[2].tolist() == [1, 2, 0]
+    assert allocate(prices, stocks, required, allow_split=False)[1].tolist() == [0, 0, 0]
+
+
+def test_quote_bom_totals_and_statuses():
+    offers = {
+        "A": [
+            {"vendor": "V1", "part_number": "A-1", "price": 1.5, "stock": 10},
+            {"vendor": "V2", "part_number": "A-2", "price": 1.0, "stock": 4},
+        ],
+        "B": [{"vendor": "V2", "part_number": "B-2", "price": 2.0, "stock": None}],
+    }
+    quote = quote_bom([("A", 2), ("B", 1), ("C", 1)], units=5, offers=offers)
+
+    a, b, c = quote["lines"]
+    assert (a["status"], a["quantity"], a["cost"]) == ("ok", 10, 15.0)
+    assert a["allocations"][0]["part_number"] == "A-1"
+    assert (b["status"], b["shortfall"]) == ("short", 5)
+    assert c["status"] == "not_found"
+    assert quote["total_cost"] == 15.0
+    assert quote["unit_cost"] == 3.0
+    assert quote["vendor_totals"] == {"V1": 15.0}
+    assert quote["fully_sourced"] is False
+
+    split = quote_bom([("A", 1)], units=12, offers=offers)
+    assert split["lines"][0]["status"] == "split"
+    assert split["total_cost"] == 4 * 1.0 + 8 * 1.5
+
+
+def test_repeated_components_share_their_stock():
+    offers = {"X": [{"vendor": "a", "part_number": "X-1", "price": 1.0, "stock": 5}]}
+
+    quote = quote_bom([("X", 4), ("X", 4)], offers=offers)
+
+    (line,) = quote["lines"]
+    assert (line["quantity"], line["status"], line["shortfall"]) == (8, "short", 3)
+    assert line["allocations"][0]["quantity"] == 5
+    assert quote["fully_sourced"] is False
+
+
+def test_units_below_one_are_rejected():
+    offers = {"X": [{"vendor": "a", "part_number": "X-1", "price": 1.0, "stock": 5}]}
+    for units in (0, -3):
+        with pytest.raises(ValueError):
+            quote_bom([("X", 1)], units=units, offers=offers)
+
+    result = json.loads(bom_quoting_tool.invoke({"bill_of_materials": "X", "units": 0}))
+    assert "units" in result["error"]
@@ -0,0 +1,25 @@
+"""Unit tests for the composite design pipeline tool."""
+
+from agent.tools.design_pipeline_tool import run_design_pipeline, select_best_offer
+
+
+def test_select_best_offer_prefers_cheapest_in_stock():
+    offers = [
+        {"price": 1.0, "stock": 0},
+        {"price": 3.0, "stock": 10},
+        {"price": 2.0, "stock": 5},
+    ]
+    assert select_best_offer(offers) == {"price": 2.0, "stock": 5}
+    assert select_best_offer([{"price": 4.0, "stock": 0}]) == {"price": 4.0, "stock": 0}
+    assert select_best_offer([]) is None
+
+
+def test_run_design_pipeline_feeds_sourced_specs_into_power_estimate():
+    """The estimate should use the exact mA/voltage of the sourced offers."""
+    result = run_design_pipeline("wifi temperature monitor with a relay")
+
+    components = result["components"]
+    assert components["microcontroller"]["name"] == "ESP32-WROOM-32"
+    loads = [c for c in components.values() if "mA" in c]
+    assert result["power"]["total_current_mA"] == sum(c["mA"] for c in loads)
+    assert result["total_price"] == round(sum(c.get("price", 0) for c in components.values()), 2)
@@ -0,0 +1,29 @@
+"""Unit tests for trigram-based fuzzy component lookup."""
+
+from agent.inventory.fuzzy import TrigramIndex, trigrams
+from agent.tools.component_sourcing_tool import find_component_offers
+
+
+def test_trigrams_ignore_case_and_in_word_separators():
+    assert trigrams("DHT-22") == trigrams("dht22")
+
+
+def test_trigram_index_ranks_closest_key_first():
+    keys = ["DHT22 Temperature Sensor", "BMP280 Pressure Sensor", "HC-SR501 PIR Motion Sensor"]
+    index = TrigramIndex(keys)
+
+    results = index.search("pir sensor")
+
+    assert keys[results[0][0]] == "HC-SR501 PIR Motion Sensor"
+    assert all(0 < score <= 1 for _, score in results)
+    assert [score for _, score in results] == sorted((s for _, s in results), reverse=True)
+    assert index.search("zzz") == []
+
+
+def test_sourcing_resolves_unambiguous_fuzzy_names():
+    """Approximate names should get ranked suggestions and, when unambiguous, offers."""
+    results = find_component_offers(["DHT-22", "ESP32-WROOM-32"])
+
+    assert results["DHT-22"][0]["matched_name"] == "DHT22 Temperature & Humidity Sensor"
+    assert results["suggestions"]["DHT-22"][0]["name"] == "DHT22 Temperature & Humidity Sensor"
+    assert "ESP32-WROOM-32" not in results["suggestions"]
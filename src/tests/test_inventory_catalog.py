@@ -0,0 +1,50 @@
+"""Unit tests for the indexed inventory catalog."""
+
+import json
+import os
+
+from agent.inventory.catalog import InventoryCatalog
+
+
+def _write_inventory(path, items, mtime=None):
+    path.write_text(json.dumps({"sensor": items}))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_catalog_indexes_names_part_numbers_and_categories(tmp_path):
+    inventory = tmp_path / "vendor.json"
+    _write_inventory(
+        inventory,
+        [
+            {"name": "DHT22  Sensor", "part_number": "PN-1", "price": 3.0, "stock": 5, "mA": 2},
+            {"name": "BMP280", "part_number": "PN-2", "price": 1.0, "stock": 0, "mA": 1},
+        ],
+    )
+    catalog = InventoryCatalog({"Vendor": str(inventory)}, {"Vendor": "https://vendor/"})
+
+    assert len(catalog) == 2
+    [offer] = catalog.find_by_name("dht22 sensor")
+    assert offer.part_number == "PN-1"
+    assert offer.to_dict()["vendor_url"] == "https://vendor/"
+    assert catalog.find_by_part_number("pn-2")[0].name == "BMP280"
+    assert len(catalog.find_by_category("Sensor")) == 2
+    assert catalog.find_by_name("missing") == []
+
+
+def test_catalog_reloads_only_when_mtime_changes(tmp_path):
+    inventory = tmp_path / "vendor.json"
+    _write_inventory(inventory, [{"name": "A", "part_number": "1"}], mtime=1_000_000_000)
+    catalog = InventoryCatalog({"Vendor": str(inventory)}, check_interval=0)
+
+    assert catalog.refresh() is False
+
+    _write_inventory(inventory, [{"name": "B", "part_number": "2"}], mtime=2_000_000_000)
+    assert catalog.refresh() is True
+    assert catalog.find_by_name("A") == []
+    assert catalog.find_by_name("B")[0].part_number == "2"
+
+
+def test_catalog_treats_unreadable_files_as_empty(tmp_path):
+    catalog = InventoryCatalog({"Vendor": str(tmp_path / "missing.json")})
+    assert len(catalog) == 0
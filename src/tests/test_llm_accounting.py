@@ -0,0 +1,80 @@
+"""Unit tests for per-LLM-turn token, latency and cost accounting."""
+
+import json
+
+from langchain_core.tools import tool
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.scripted_llm import ScriptedChatModel
+from evaluation.cost_model import ModelPricing, find_pricing
+
+
+@tool
+def lookup_tool(text: str) -> str:
+    """Look the given text up."""
+    return f"found: {text}"
+
+
+def _run(turns, model_name="scripted"):
+    llm = ScriptedChatModel(turns=turns, model_name=model_name)
+    agent = create_iot_agent([lookup_tool], llm=llm)
+    return process_query(agent, "hello")
+
+
+def test_every_turn_is_recorded_and_totalled():
+    _, summary = _run(
+        [
+            {
+                "tool_calls": [{"name": "lookup_tool", "args": {"text": "a"}}],
+                "usage": {"input_tokens": 1000, "output_tokens": 20},
+            },
+            {
+                "tool_calls": [{"name": "lookup_tool", "args": {"text": "b"}}],
+                "usage": {"input_tokens": 1200, "output_tokens": 30, "cached_input_tokens": 800},
+            },
+            {"content": "Done", "usage": {"input_tokens": 1500, "output_tokens": 50}},
+        ]
+    )
+
+    turns = summary["llm_turns"]
+    assert [t["input_tokens"] for t in turns] == [1000, 1200, 1500]
+    assert [t["cached_input_tokens"] for t in turns] == [0, 800, 0]
+    assert [t["tool_calls"] for t in turns] == [["lookup_tool"], ["lookup_tool"], []]
+    assert all(t["latency_seconds"] >= 0 for t in turns)
+    assert summary["token_usage"] == {
+        "input_tokens": 3700,
+        "output_tokens": 100,
+        "total_tokens": 3800,
+        "cached_input_tokens": 800,
+    }
+    # Offline scripted sessions are priced at zero
+    assert summary["cost"] == {"total_usd": 0, "per_turn_max_usd": 0, "unpriced_models": []}
+
+
+def test_cost_model_prices_cached_input_and_reports_unpriced_models(tmp_path, monkeypatch):
+    pricing = ModelPricing(input_per_m=1.0, output_per_m=10.0, cached_input_per_m=0.25)
+    assert pricing.cost(1_000_000, 100_000, cached_input_tokens=400_000) == 0.6 + 0.1 + 1.0
+
+    prices = tmp_path / "prices.json"
+    prices.write_text(
+        json.dumps({"house-model": {"input_per_m": 2.0, "output_per_m": 8.0}}), encoding="utf-8"
+    )
+    monkeypatch.setenv("IOT_LLM_PRICING", str(prices))
+    assert find_pricing("models/gemini-2.5-flash-preview-09-2025").input_per_m == 0.30
+    assert find_pricing("house-model-v2").output_per_m == 8.0
+    assert find_pricing("unknown") is None
+
+    _, summary = _run(
+        [{"content": "Done", "usage": {"input_tokens": 500_000, "output_tokens": 1000}}],
+        model_name="house-model",
+    )
+    assert summary["cost"]["total_usd"] == 1.008
+    assert summary["llm_turns"][0]["model"] == "house-model"
+
+    _, summary = _run(
+        [{"content": "Done", "usage": {"input_tokens": 10, "output_tokens": 1}}],
+        model_name="mystery",
+    )
+    assert summary["cost"]["unpriced_models"] == ["mystery"]
+    assert summary["llm_turns"][0]["cost_usd"] is None
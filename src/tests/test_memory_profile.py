@@ -0,0 +1,74 @@
+"""Unit tests for per-phase memory profiling in the evaluation tracker."""
+
+import tracemalloc
+
+from evaluation.evaluation_tracker import EvaluationTracker
+from evaluation.evaluation_utils import display_performance_summary
+from evaluation.memory import MemoryProfiler
+from rag.spans import span
+
+MB = 2**20
+
+
+def _allocate(size_mb):
+    return [bytearray(MB) for _ in range(size_mb)]
+
+
+def test_memory_profile_is_off_by_default():
+    tracker = EvaluationTracker()
+    tracker.start_tracking()
+    tracker.end_tracking()
+    assert "memory_profile" not in tracker.get_summary()
+
+
+def test_phase_peaks_growth_and_allocation_sites(capsys):
+    tracker = EvaluationTracker(memory_profile=True)
+    tracker.start_tracking()
+    retained = None
+    try:
+        with span("ingest"):
+            # Freed before the phase ends: shows in the peak, not in the growth
+            _allocate(8)
+        with span("rag_query"):
+            retained = _allocate(4)
+    finally:
+        tracker.end_tracking()
+
+    memory = tracker.get_summary()["memory_profile"]
+    ingest = memory["phases"]["ingest"]
+    query = memory["phases"]["rag_query"]
+
+    assert ingest["peak_traced_mb"] >= 8
+    assert abs(ingest["traced_growth_mb"]) < 1
+    assert 4 <= query["traced_growth_mb"] < 5
+    assert memory["peak_traced_mb"] >= 8
+    assert memory["peak_rss_mb"] >= memory["rss_start_mb"]
+    assert any(
+        "test_memory_profile.py" in site["site"] and site["size_kb"] >= 4 * 1024
+        for site in memory["top_allocations"]
+    )
+    assert len(retained) == 4
+    # The tracker stops tracemalloc it started itself
+    assert not tracemalloc.is_tracing()
+
+    display_performance_summary(tracker.get_summary())
+    output = capsys.readouterr().out
+    assert "Memory: peak RSS" in output
+    assert "rag_query" in output
+
+
+def test_concurrent_profilers_share_tracemalloc():
+    """Overlapping profilers keep each other's peaks, and tracing outlives the first to stop."""
+    first, second = MemoryProfiler(), MemoryProfiler()
+    first.start()
+    second.start()
+    _allocate(8)
+    # The second profiler's sample resets tracemalloc's peak before the first one samples
+    second.sample()
+    first.stop()
+
+    assert first.summary([])["peak_traced_mb"] >= 8
+    assert tracemalloc.is_tracing()
+    second.stop()
+    assert second.summary([])["peak_traced_mb"] >= 8
+    assert not tracemalloc.is_tracing()
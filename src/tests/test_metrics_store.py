@@ -0,0 +1,91 @@
+"""Unit tests for the evaluation metrics store and `eval report`."""
+
+import argparse
+from datetime import datetime
+
+import pytest
+
+from evaluation.cli import build_report, parse_duration, parse_range
+from evaluation.metrics_store import MetricsStore, compare_windows, percentile
+
+DAY = 86400.0
+
+
+def summary(runtime, tokens, tools):
+    return {
+        "execution_summary": {"total_runtime_seconds": runtime},
+        "token_usage": {"input_tokens": tokens, "output_tokens": 0, "total_tokens": tokens},
+        "errors": {"error_count": 0},
+        "detailed_tool_calls": [{"tool": tool, "runtime": t} for tool, t in tools],
+    }
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (50, 95, 99)] == [50, 95, 99]
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_window_stats_and_regression_report(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    for i in range(20):
+        # Day 0: research_tool ~1s; day 1: ~2s, total runtime unchanged
+        store.record("q", summary(10.0, 1000 + i, [("research_tool", 1.0)]), timestamp=i)
+        store.record("q", summary(10.0, 1000 + i, [("research_tool", 2.0)]), timestamp=DAY + i)
+    store.record("late", summary(99.0, 5, []), timestamp=2 * DAY + 1)
+
+    assert len(store) == 41
+    day0 = store.window_stats(0, DAY)
+    assert day0["runs"] == 20
+    assert day0["metrics"]["total_tokens"]["p95"] == 1018
+    assert day0["metrics"]["tool:research_tool"] == {
+        "count": 20,
+        "p50": 1.0,
+        "p95": 1.0,
+        "p99": 1.0,
+    }
+
+    regressions = compare_windows(day0, store.window_stats(DAY, 2 * DAY))
+    assert {(r["metric"], r["percentile"]) for r in regressions} == {
+        ("tool:research_tool", "p50"),
+        ("tool:research_tool", "p95"),
+    }
+    assert regressions[0]["change"] == 1.0
+
+    report = build_report(store, DAY, 2, 2 * DAY, True, 0.2, 5)
+    assert [window["runs"] for window in report["windows"]] == [20, 20]
+    assert report["regressions"] == regressions
+    # Too few samples in the window to compare
+    assert build_report(store, DAY, 1, 3 * DAY, True, 0.2, 5)["regressions"] == []
+
+
+def test_parse_duration():
+    assert parse_duration("90s") == 90
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("1w") == 7 * DAY
+
+
+def test_report_compares_any_two_ranges(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    for day, runtime in enumerate([1.0, 5.0, 1.0]):
+        for i in range(10):
+            store.record("q", summary(10.0, 1000, [("research_tool", runtime)]), DAY * day + i)
+
+    # Day 2 against day 0, skipping the slow day in between
+    report = build_report(store, DAY, 1, 3 * DAY, False, 0.2, 5, (0, DAY), (2 * DAY, 3 * DAY))
+    assert [(w["since"], w["runs"]) for w in report["windows"]] == [(0, 10), (2 * DAY, 10)]
+    assert report["regressions"] == []
+    # Without a baseline, the candidate is compared with the range of equal length before it
+    report = build_report(store, DAY, 1, 3 * DAY, False, 0.2, 5, candidate=(DAY, 2 * DAY))
+    assert report["windows"][0]["since"] == 0
+    assert {r["metric"] for r in report["regressions"]} == {"tool:research_tool"}
+
+
+def test_parse_range():
+    since, until = parse_range("2025-01-01..2025-01-08T12:00")
+    assert until - since == 7.5 * DAY
+    assert since == datetime(2025, 1, 1).timestamp()
+    for text in ("2025-01-01", "2025-01-08..2025-01-01", "yesterday..today"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_range(text)
@@ -0,0 +1,101 @@
+"""Unit tests for tiered model routing between tool-calling and final-answer turns."""
+
+import json
+
+import pytest
+from langchain_core.tools import tool
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.llm_provider import TOOL_TIER_SETTINGS, create_tool_model
+from agent.model_routing import get_routing_policy
+from agent.scripted_llm import ScriptedChatModel
+
+ANSWER = "Use an ESP32 with a DHT22 sensor and a weatherproof enclosure."
+TURNS = [
+    {"tool_calls": [{"name": "echo_tool", "args": {"text": "{query}"}}]},
+    {"content": ANSWER},
+]
+
+
+@tool
+def echo_tool(text: str) -> str:
+    """Echo the given text back."""
+    return f"echo: {text}"
+
+
+def test_tool_turns_use_the_tool_tier_and_answers_the_full_model():
+    full = ScriptedChatModel(turns=TURNS, model_name="scripted-full")
+    lite = ScriptedChatModel(turns=TURNS, model_name="scripted-lite", max_output_tokens=4)
+    agent = create_iot_agent([echo_tool], llm=full, tool_llm=lite, routing="tiered")
+
+    response, summary = process_query(agent, "greenhouse monitor")
+
+    # The lite model's truncated answer is discarded and re-written by the full model
+    assert response == ANSWER
+    assert [call["turn"] for call in lite.call_log] == [0, 1]
+    assert [call["turn"] for call in full.call_log] == [1]
+    assert [(t["tier"], t["model"]) for t in summary["llm_turns"]] == [
+        ("tool", "scripted-lite"),
+        ("tool", "scripted-lite"),
+        ("synthesis", "scripted-full"),
+    ]
+    tiers = summary["model_tiers"]
+    assert (tiers["tool"]["turns"], tiers["tool"]["answered_turns"]) == (2, 1)
+    assert tiers["synthesis"]["turns"] == 1
+    output_tokens = tiers["tool"]["output_tokens"] + tiers["synthesis"]["output_tokens"]
+    assert output_tokens == summary["token_usage"]["output_tokens"]
+
+
+def test_single_policy_uses_one_model_for_every_turn():
+    full = ScriptedChatModel(turns=TURNS)
+    lite = ScriptedChatModel(turns=TURNS)
+    agent = create_iot_agent([echo_tool], llm=full, tool_llm=lite, routing="single")
+
+    response, summary = process_query(agent, "greenhouse monitor")
+
+    assert response == ANSWER
+    assert len(full.call_log) == 2 and not lite.call_log
+    assert "model_tiers" not in summary
+
+
+def test_tiered_routing_costs_one_short_extra_turn_over_single(monkeypatch):
+    long_answer = " ".join([ANSWER] * 40)
+    turns = [TURNS[0], {"content": long_answer}]
+    cap = TOOL_TIER_SETTINGS["gemini"]["max_output_tokens"]
+
+    def run(routing):
+        full = ScriptedChatModel(turns=turns)
+        lite = ScriptedChatModel(turns=turns, max_output_tokens=cap)
+        agent = create_iot_agent([echo_tool], llm=full, tool_llm=lite, routing=routing)
+        response, summary = process_query(agent, "greenhouse monitor")
+        assert response == long_answer
+        return summary
+
+    single, tiered = run("single"), run("tiered")
+
+    # The only extra turn is the tool tier's discarded answer, capped at the tool tier limit
+    assert len(tiered["llm_turns"]) == len(single["llm_turns"]) + 1
+    answer_tokens = single["llm_turns"][-1]["output_tokens"]
+    assert answer_tokens > cap
+    extra_tokens = tiered["token_usage"]["output_tokens"] - single["token_usage"]["output_tokens"]
+    assert 0 < extra_tokens <= cap
+    assert tiered["llm_turns"][-1]["output_tokens"] == answer_tokens
+
+    monkeypatch.delenv("IOT_MODEL_ROUTING", raising=False)
+    assert get_routing_policy() == "single"
+
+
+def test_tool_model_settings_come_from_the_environment(monkeypatch, tmp_path):
+    script = tmp_path / "session.json"
+    script.write_text(json.dumps({"turns": TURNS}))
+    monkeypatch.setenv("IOT_LLM_SCRIPT", str(script))
+    monkeypatch.setenv("IOT_TOOL_MODEL", "scripted-lite")
+    monkeypatch.setenv("IOT_TOOL_MAX_OUTPUT_TOKENS", "8")
+
+    model = create_tool_model("scripted")
+
+    assert (model.model_name, model.max_output_tokens) == ("scripted-lite", 8)
+    monkeypatch.setenv("IOT_MODEL_ROUTING", "cheapest")
+    with pytest.raises(ValueError):
+        get_routing_policy()
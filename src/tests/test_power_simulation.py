@@ -0,0 +1,66 @@
+"""Unit tests for the duty-cycle power simulation."""
+
+import numpy as np
+import pytest
+
+from agent.tools.power_battery_estimator import estimate_power
+from agent.tools.power_simulation import (
+    BatteryChemistry,
+    ComponentLoad,
+    active_fractions,
+    recommend_battery,
+    simulate_power,
+    sweep_batteries,
+)
+
+
+def test_active_fractions_are_exact_for_coarse_steps():
+    burst = ComponentLoad("radio", 3.3, 100, active_s=0.02, period_s=10, offset_s=5)
+    always = ComponentLoad("led", 3.3, 1)
+    fractions = active_fractions([burst, always], np.arange(0, 121, 60.0))
+
+    assert fractions[0] == pytest.approx([0.002, 0.002])
+    assert fractions[1].tolist() == [1.0, 1.0]
+    # A step that ends in the middle of a burst gets only the part it covers
+    assert active_fractions([burst], np.array([0.0, 5.01]))[0, 0] == pytest.approx(0.01 / 5.01)
+
+
+def test_simulate_power_applies_rail_efficiency():
+    loads = [
+        ComponentLoad.from_spec(
+            "mcu", {"voltage": 3.3, "mA": 120, "sleep_mA": 0.01, "active_s": 2, "period_s": 600}
+        ),
+        ComponentLoad.from_spec("sensor", {"voltage": 5, "mA": 1.5}),
+    ]
+    profile = simulate_power(loads, rail_efficiency={5: 0.5})
+
+    mcu_w = 3.3 * (120 * 2 + 0.01 * 598) / 600 / 1000
+    assert profile.average_w == pytest.approx(mcu_w / 0.85 + 5 * 1.5 / 1000 / 0.5)
+    assert profile.energy_wh == pytest.approx(profile.daily_wh)
+    assert profile.rail_efficiency == {3.3: 0.85, 5.0: 0.5}
+    assert float(profile.rail_power_w[5.0].mean()) == pytest.approx(0.0075)
+
+
+def test_sweep_and_recommendation():
+    chemistries = [BatteryChemistry("A", 4.0, 1.0, 0.0), BatteryChemistry("B", 2.0, 0.5, 0.0)]
+    runtime = sweep_batteries(np.array([0.1, 0.2]), [1000, 2000], chemistries)
+
+    assert runtime.shape == (2, 2, 2)
+    assert runtime[0].tolist() == [[40.0, 80.0], [10.0, 20.0]]
+    assert runtime[1, 0, 1] == 40.0
+
+    assert recommend_battery(0.1, 8, [1000, 2000], chemistries)["chemistry"] == "B"
+    best = recommend_battery(0.1, 1000, [1000, 2000], chemistries)
+    assert (best["chemistry"], best["capacity_mAh"], best["meets_target"]) == ("A", 2000, False)
+
+
+def test_estimator_simulates_only_scheduled_loads():
+    continuous = {"ESP32": {"voltage": 3.3, "mA": 120}}
+    assert estimate_power(continuous)["estimated_daily_consumption_Wh"] == 9.5
+
+    duty_cycled = {"ESP32": {"voltage": 3.3, "mA": 120, "sleep_mA": 0.01, "duty_cycle": 0.001}}
+    result = estimate_power(duty_cycled, target_days=365)
+    assert result["duty_cycles"] == {"ESP32": 0.001}
+    assert result["estimated_daily_consumption_Wh"] < 0.05
+    assert result["estimated_runtime_days"] >= 365
+    assert result["recommended_battery"]["meets_target"]
@@ -0,0 +1,130 @@
+"""Unit tests for request deadlines, graceful tool degradation and agent turn caps."""
+
+import threading
+import time
+
+from langchain_core.tools import tool
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.inventory.backends import VendorBackend, fetch_offers
+from agent.scripted_llm import ScriptedChatModel
+from agent.tools.design_pipeline_tool import run_design_pipeline
+from rag import tool as rag_tool
+from rag.budget import RequestBudget, budget_scope
+from rag.tool import rag_query
+
+LOOPING_TURNS = [
+    {
+        "content": "Partial answer from the research so far.",
+        "tool_calls": [{"name": "echo_tool", "args": {"text": "{query}"}}],
+    }
+] * 20
+
+
+@tool
+def echo_tool(text: str) -> str:
+    """Echo the given text back."""
+    return f"echo: {text}"
+
+
+class SlowBackend(VendorBackend):
+    name = "slow"
+    timeout = 5.0
+
+    def find_offers(self, component_list):
+        time.sleep(0.5)
+        return {}
+
+
+def test_turn_cap_forces_a_final_answer():
+    llm = ScriptedChatModel(turns=LOOPING_TURNS)
+    agent = create_iot_agent([echo_tool], llm=llm)
+
+    response, summary = process_query(agent, "greenhouse monitor", max_turns=3)
+
+    assert response == "Partial answer from the research so far."
+    assert len(llm.call_log) == 3
+    assert summary["tool_performance"]["echo_tool"]["call_count"] == 2
+    assert summary["budget"]["forced_final_answer"] is True
+    assert summary["budget"]["degradations"][0]["step"] == "agent"
+
+
+def test_low_time_budget_forces_a_final_answer():
+    llm = ScriptedChatModel(turns=LOOPING_TURNS, delay_s=0.2)
+    agent = create_iot_agent([echo_tool], llm=llm)
+
+    _, summary = process_query(agent, "greenhouse monitor", budget_s=0.5)
+
+    assert len(llm.call_log) == 3
+    assert summary["budget"]["forced_final_answer"] is True
+    assert summary["execution_summary"]["total_runtime_seconds"] < 1.0
+
+
+def test_a_single_vendor_is_held_to_the_deadline():
+    started = time.perf_counter()
+    responses, errors = fetch_offers([SlowBackend()], ["ESP32"], timeout=0.05)
+
+    assert time.perf_counter() - started < 0.4
+    assert not responses and errors == {"slow": "timed out after 0.05s"}
+
+
+def test_stuck_vendor_calls_only_hold_up_that_vendor():
+    stuck = SlowBackend()
+    stuck.timeout, stuck.concurrency = 0.05, 1
+    fast = SlowBackend()
+    fast.name, fast.find_offers = "fast", lambda component_list: {"ESP32": []}
+
+    # No request deadline: the vendor's own timeout still applies
+    assert fetch_offers([stuck], ["ESP32"]) == ([], {"slow": "timed out after 0.05s"})
+
+    # Its abandoned call is still running, so the next one is refused instead of queued
+    started = time.perf_counter()
+    responses, errors = fetch_offers([stuck, fast], ["ESP32"])
+    assert time.perf_counter() - started < 0.2
+    assert errors["slow"].startswith("busy") and [b.name for b, _ in responses] == ["fast"]
+
+
+def test_each_store_gets_its_own_background_index(monkeypatch):
+    release = threading.Event()
+    indexed = []
+
+    def index_assets(store):
+        indexed.append(store)
+        release.wait(5)
+
+    monkeypatch.setattr(rag_tool, "index_assets", index_assets)
+    monkeypatch.setattr(rag_tool, "_background_indexes", {})
+    try:
+        rag_tool._index_in_background("store-a", "./db-a")
+        rag_tool._index_in_background("store-a", "./db-a")
+        rag_tool._index_in_background("store-b", "./db-b")
+        threads = dict(rag_tool._background_indexes)
+    finally:
+        release.set()
+    for thread in threads.values():
+        thread.join(1)
+
+    # A second cold store isn't left unindexed behind the first one's thread
+    assert sorted(indexed) == ["store-a", "store-b"]
+    assert set(threads) == {"./db-a", "./db-b"}
+
+
+def test_tools_degrade_as_the_deadline_passes():
+    budget = RequestBudget(budget_s=0.05)
+    with budget_scope(budget):
+        started = time.perf_counter()
+        responses, errors = fetch_offers([SlowBackend(), SlowBackend()], ["ESP32"], timeout=0.05)
+        assert time.perf_counter() - started < 0.4
+        assert not responses and set(errors) == {"slow"}
+
+        time.sleep(0.05)
+        # Past the deadline: no search, and the pipeline leaves out vendor sourcing
+        assert rag_query("LoRaWAN range") == []
+        pipeline = run_design_pipeline("battery powered greenhouse humidity monitor")
+        assert pipeline["skipped"] == ["component_sourcing", "power_estimation"]
+        assert pipeline["components"]["sensor"]["name"].startswith("DHT22")
+
+    steps = [degradation["step"] for degradation in budget.stats()["degradations"]]
+    assert steps == ["rag_query", "design_pipeline"]
+    assert budget.stats()["deadline_exceeded"] is True
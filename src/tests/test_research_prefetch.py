@@ -0,0 +1,73 @@
+"""Unit tests for the speculative research prefetch."""
+
+import json
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.scripted_llm import ScriptedChatModel
+from agent.tools import research_prefetch, research_tool
+from agent.tools.research_prefetch import ResearchPrefetcher, prefetch_queries
+from rag.vector_store import QueryMetadata, QueryResult
+
+QUERY = "Monitor greenhouse humidity and soil moisture"
+
+
+def _fake_search(calls):
+    def search(query, top_k=5):
+        calls.append(query)
+        return [
+            QueryResult(id=f"{query}-{i}", document=f"{query} {i}", metadata=QueryMetadata("a.pdf"))
+            for i in range(top_k)
+        ]
+
+    return search
+
+
+def test_prefetch_queries_add_blueprint_keywords():
+    assert prefetch_queries(QUERY) == [QUERY, "humidity moisture soil"]
+    # No keyword query when it adds nothing
+    assert prefetch_queries("humidity") == ["humidity"]
+
+
+def test_overlapping_calls_are_served_and_unused_queries_are_wasted():
+    calls = []
+    prefetcher = ResearchPrefetcher(search=_fake_search(calls))
+    prefetcher.start(QUERY)
+
+    served = prefetcher.lookup("greenhouse humidity soil moisture monitoring", 3)
+    missed = prefetcher.lookup("LoRaWAN gateway range", 5)
+    prefetcher.close()
+
+    assert [r.id for r in served] == [f"{QUERY}-{i}" for i in range(3)]
+    assert missed is None
+    # The keyword query is cancelled by close() if it hasn't started yet
+    assert calls[0] == QUERY
+    stats = prefetcher.stats()
+    assert (stats["research_calls"], stats["hits"], stats["hit_rate"]) == (2, 1, 0.5)
+    assert (stats["wasted"], stats["waste_rate"]) == (1, 0.5)
+
+
+def test_process_query_serves_first_research_call_from_prefetch(monkeypatch):
+    prefetched, searched = [], []
+    monkeypatch.setattr(research_prefetch, "rag_query", _fake_search(prefetched))
+    monkeypatch.setattr(research_tool, "rag_query", _fake_search(searched))
+    llm = ScriptedChatModel(
+        turns=[
+            {"tool_calls": [{"name": "research_tool", "args": {"query": "{query}"}}]},
+            {"tool_calls": [{"name": "research_tool", "args": {"query": "solar power"}}]},
+            {"content": "Done"},
+        ]
+    )
+    agent = create_iot_agent([research_tool.research_tool], llm=llm)
+
+    response, summary = process_query(agent, QUERY, prefetch=True)
+
+    assert response == "Done"
+    assert searched == ["solar power"]
+    assert summary["prefetch"]["hits"] == 1
+    assert summary["prefetch"]["research_calls"] == 2
+    assert summary["rag_performance"]["total_chunks_retrieved"] == 10
+    assert json.dumps(summary)
+
+    _, summary = process_query(agent, QUERY, prefetch=False)
+    assert "prefetch" not in summary
@@ -0,0 +1,41 @@
+"""Unit tests for the offline scripted chat model and provider selection."""
+
+import pytest
+from langchain_core.tools import tool
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.llm_provider import create_chat_model
+from agent.scripted_llm import ScriptedChatModel
+
+
+@tool
+def echo_tool(text: str) -> str:
+    """Echo the given text back."""
+    return f"echo: {text}"
+
+
+def test_scripted_model_replays_tool_calls():
+    """The agent should run the scripted tool call and finish with the scripted answer."""
+    llm = ScriptedChatModel(
+        turns=[
+            {"tool_calls": [{"name": "echo_tool", "args": {"text": "{query}"}}]},
+            {"content": "Done", "usage": {"input_tokens": 30, "output_tokens": 5}},
+        ]
+    )
+    agent = create_iot_agent([echo_tool], llm=llm)
+
+    response, summary = process_query(agent, "hello")
+
+    assert response == "Done"
+    assert summary["tool_performance"]["echo_tool"]["call_count"] == 1
+    assert [call["turn"] for call in llm.call_log] == [0, 1]
+    # Every turn counts, not just the final message
+    assert summary["token_usage"]["output_tokens"] == sum(
+        call["output_tokens"] for call in llm.call_log
+    )
+
+
+def test_create_chat_model_rejects_unknown_provider():
+    with pytest.raises(ValueError):
+        create_chat_model("nonexistent")
@@ -0,0 +1,76 @@
+"""Unit tests for semantic blueprint matching, with a deterministic bag-of-words embedding."""
+
+import json
+import re
+
+import numpy as np
+
+from agent.tools.blueprint_matcher import BlueprintMatcher, Heuristics
+from agent.tools.iot_blueprint_generator import generate_blueprint
+from agent.tools.semantic_blueprint import SemanticBlueprintIndex, get_semantic_index
+
+VOCABULARY = ["climate", "air", "soil", "water", "door", "screen", "wall", "outdoor"]
+
+
+def bag_of_words(texts):
+    vectors = np.zeros((len(texts), len(VOCABULARY)))
+    for i, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            if word in VOCABULARY:
+                vectors[i, VOCABULARY.index(word)] += 1
+    return vectors
+
+
+TABLE = {
+    "sensor": [
+        {"label": "DHT22", "keywords": ["temperature"], "description": "air climate"},
+        {"label": "Soil Probe", "keywords": ["moisture"], "description": "soil water"},
+    ],
+    "display": [{"label": "OLED", "keywords": ["oled"], "description": "screen"}],
+    "device case": [
+        {"label": "IP65 Box", "keywords": [], "description": "outdoor water"},
+        {"label": "Wall Box", "keywords": [], "description": "wall"},
+    ],
+}
+
+
+def test_best_match_per_type():
+    index = SemanticBlueprintIndex(Heuristics.from_table(TABLE), bag_of_words)
+
+    best = index.best_matches("greenhouse climate control with outdoor air")
+    assert best["sensor"][0] == "DHT22"
+    assert best["device case"][0] == "IP65 Box"
+    assert best["display"][1] == 0.0
+
+
+def test_keywords_win_and_semantic_fills_the_rest(tmp_path, monkeypatch):
+    matcher = BlueprintMatcher(Heuristics.from_table(TABLE))
+    index = get_semantic_index(matcher, bag_of_words)
+    assert get_semantic_index(matcher) is index
+
+    path = tmp_path / "heuristics.json"
+    path.write_text(json.dumps(TABLE))
+    monkeypatch.setenv("IOT_BLUEPRINT_HEURISTICS", str(path))
+    monkeypatch.setattr(
+        "agent.tools.semantic_blueprint.default_embedding_function", lambda: bag_of_words
+    )
+
+    request = "greenhouse climate with soil moisture, mounted on a wall"
+    assert generate_blueprint(request, mode="keyword") == {
+        "sensor": "Soil Probe",
+        "device case": "Wall Box",
+    }
+    request = "greenhouse climate and air, by the wall"
+    assert generate_blueprint(request, mode="keyword")["sensor"] == "Soil Probe"
+    assert generate_blueprint(request, mode="semantic") == {
+        "sensor": "DHT22",
+        "device case": "Wall Box",
+    }
+    # Keyword hits take precedence over the closer embedding
+    assert generate_blueprint("air climate moisture", mode="semantic")["sensor"] == "Soil Probe"
+    # Optional types only on a clear match
+    assert generate_blueprint("outdoor screen for soil", mode="semantic") == {
+        "sensor": "Soil Probe",
+        "display": "OLED",
+        "device case": "IP65 Box",
+    }
@@ -0,0 +1,70 @@
+"""Unit tests for the long-running planner server in the agent.server module."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from langchain_core.messages import AIMessage
+
+from agent.server import PlannerServer
+from rag.vector_store import QueryMetadata, QueryResult
+
+
+class FakePlanner:
+    def invoke(self, inputs, config=None):
+        return {"messages": [AIMessage(content="Use an ESP32.")]}
+
+
+def _request(url, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_server_serves_plan_and_rag_requests(monkeypatch, tmp_path):
+    """The server should report readiness only after warm-up and then answer requests."""
+    monkeypatch.setenv("IOT_METRICS_DB", str(tmp_path / "metrics.db"))
+
+    def mock_rag_query(query_text, top_k=5, verbose=False, db_path="./chroma_db"):
+        return [
+            QueryResult(id="a_0", document="IoT text", metadata=QueryMetadata(source_file="a.pdf"))
+        ][:top_k]
+
+    monkeypatch.setattr("rag.tool.rag_query", mock_rag_query)
+
+    server = PlannerServer(("127.0.0.1", 0), planner_factory=FakePlanner)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        assert _request(base_url + "/healthz") == (200, {"status": "ok"})
+        assert _request(base_url + "/readyz")[0] == 503
+
+        server.warm_up()
+        assert _request(base_url + "/readyz") == (200, {"status": "ready"})
+
+        status, body = _request(base_url + "/plan", {"query": "greenhouse monitor"})
+        assert status == 200
+        assert body["response"] == "Use an ESP32."
+        assert "execution_summary" in body["evaluation_summary"]
+
+        status, body = _request(base_url + "/rag", {"query": "IoT", "top_k": 1})
+        assert status == 200
+        assert body["results"][0]["metadata"]["source_file"] == "a.pdf"
+
+        assert _request(base_url + "/plan", {})[0] == 400
+        assert _request(base_url + "/plan", {"query": 5})[0] == 400
+        assert _request(base_url + "/plan", {"query": None})[0] == 400
+        assert _request(base_url + "/rag", ["query"])[0] == 400
+        assert _request(base_url + "/plan", {"query": "x", "budget_s": -1})[0] == 400
+        for top_k in ("abc", None, 2.5e9, 0, -1, True):
+            status, body = _request(base_url + "/rag", {"query": "IoT", "top_k": top_k})
+            assert (status, body["error"]) == (400, "'top_k' must be a positive integer")
+    finally:
+        server.shutdown()
+        server.server_close()
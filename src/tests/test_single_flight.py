@@ -0,0 +1,143 @@
+"""Unit tests for single-flight coalescing of identical in-flight calls."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent.agent import process_query
+from agent.base_agent import create_iot_agent
+from agent.inventory.backends import VendorBackend
+from agent.scripted_llm import ScriptedChatModel
+from agent.tools import component_sourcing_tool
+from agent.tools.component_sourcing_tool import find_component_offers
+from rag.budget import RequestBudget, budget_scope
+from rag.single_flight import SingleFlight
+
+
+def _slow(calls, result="done", delay=0.2, error=None):
+    def call():
+        calls.append(threading.current_thread().name)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return call
+
+
+def test_concurrent_identical_calls_run_once():
+    flight, calls = SingleFlight("test"), []
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outcomes = list(pool.map(lambda _: flight.do("key", _slow(calls)), range(4)))
+
+    assert len(calls) == 1
+    assert [result for result, _ in outcomes] == ["done"] * 4
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+    assert flight.in_flight() == 0
+    # Nothing is cached once the call finished
+    assert flight.do("key", _slow(calls, delay=0)) == ("done", False)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    flight, calls = SingleFlight("test"), []
+    error = ValueError("vendor down")
+
+    def call(_):
+        with pytest.raises(ValueError, match="vendor down"):
+            flight.do("key", _slow(calls, error=error))
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(call, range(3)))
+    assert len(calls) == 1
+
+
+def test_waiters_retry_an_abandoned_call_and_can_time_out():
+    flight, calls = SingleFlight("test"), []
+
+    def abandoned():
+        with pytest.raises(KeyboardInterrupt):
+            flight.do("key", _slow(calls, error=KeyboardInterrupt()))
+
+    leader = threading.Thread(target=abandoned)
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(TimeoutError):
+        flight.do("key", _slow(calls), timeout=0.01)
+    # The waiter runs the call itself once the leader gives up
+    assert flight.do("key", _slow(calls)) == ("done", False)
+    leader.join()
+    assert len(calls) == 2
+
+
+def test_identical_planner_requests_share_one_run():
+    llm = ScriptedChatModel(turns=[{"content": "Use an ESP32."}], delay_s=0.2)
+    agent = create_iot_agent([], llm=llm)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(process_query, agent, "Greenhouse monitor?")
+        time.sleep(0.05)
+        second = pool.submit(process_query, agent, "  greenhouse   MONITOR ")
+        responses = [first.result(), second.result()]
+
+    assert [response for response, _ in responses] == ["Use an ESP32."] * 2
+    assert len(llm.call_log) == 1
+    assert "coalescing" not in responses[0][1]
+    assert responses[1][1]["coalescing"]["served_by_coalescing"] is True
+
+    _, summary = process_query(agent, "greenhouse monitor", coalesce=False)
+    assert len(llm.call_log) == 2
+    assert "coalescing" not in summary
+
+
+def test_planner_waiters_stop_waiting_at_their_own_deadline():
+    llm = ScriptedChatModel(turns=[{"content": "Use an ESP32."}], delay_s=0.5)
+    agent = create_iot_agent([], llm=llm)
+
+    def query_within_deadline():
+        with budget_scope(RequestBudget(budget_s=0.1)):
+            return process_query(agent, "Greenhouse monitor?")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(process_query, agent, "Greenhouse monitor?")
+        time.sleep(0.05)
+        second = pool.submit(query_within_deadline)
+        responses = [first.result(), second.result()]
+
+    # The waiter gave up on the shared run and ran the query itself
+    assert [response for response, _ in responses] == ["Use an ESP32."] * 2
+    assert len(llm.call_log) == 2
+    assert "coalescing" not in responses[1][1]
+
+
+class SlowVendor(VendorBackend):
+    timeout = 5.0
+
+    def __init__(self, name):
+        self.name = name
+
+    def find_offers(self, component_list):
+        time.sleep(0.3)
+        return {comp: [{"vendor": self.name}] for comp in component_list}
+
+
+def test_vendor_lookups_cut_by_a_deadline_are_not_shared(monkeypatch):
+    backends = [SlowVendor("a"), SlowVendor("b")]
+    monkeypatch.setattr(component_sourcing_tool, "get_default_backends", lambda: backends)
+
+    def hurried():
+        with budget_scope(RequestBudget(budget_s=0.1)):
+            return find_component_offers(["ESP32"])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(hurried)
+        time.sleep(0.05)
+        second = pool.submit(find_component_offers, ["ESP32"])
+        cut, complete = first.result(), second.result()
+
+    assert set(cut["vendor_errors"]) == {"a", "b"}
+    # The caller without a deadline looked the offers up itself instead of sharing the cut result
+    assert complete["ESP32"] == [{"vendor": "a"}, {"vendor": "b"}]
+    assert "vendor_errors" not in complete
@@ -0,0 +1,74 @@
+"""Unit tests for solar panel and battery sizing."""
+
+import numpy as np
+
+from agent.tools.power_battery_estimator import estimate_power
+from agent.tools.solar_sizing import (
+    BATTERY_USABLE_FRACTION,
+    HARVEST_EFFICIENCY,
+    load_irradiance,
+    simulate_solar,
+    size_solar,
+)
+
+
+def hourly_reference(load_w, irradiance, panels, batteries):
+    """Step every hour for every candidate"""
+    downtime = np.zeros((len(panels), len(batteries)), dtype=int)
+    for i, panel in enumerate(panels):
+        for j, battery in enumerate(batteries):
+            capacity = battery * BATTERY_USABLE_FRACTION
+            charge, empty_days = capacity, set()
+            for hour, ghi in enumerate(irradiance):
+                charge += ghi / 1000 * HARVEST_EFFICIENCY * panel - load_w[hour % 24]
+                if charge < -1e-9:
+                    empty_days.add(hour // 24)
+                charge = min(max(charge, 0), capacity)
+            downtime[i, j] = len(empty_days)
+    return downtime
+
+
+def test_simulation_matches_hourly_stepping():
+    rng = np.random.default_rng(0)
+    days = 30
+    daylight = np.clip(np.sin((np.arange(24) - 6) / 12 * np.pi), 0, None)
+    irradiance = (daylight * 900 * rng.uniform(0.05, 1, (days, 1))).ravel()
+    load = np.where(np.arange(24) < 8, 0.2, 1.0)
+    panels, batteries = [1, 5, 10, 20], [5, 20, 50, 100]
+
+    simulation = simulate_solar(load, irradiance, panels, batteries)
+
+    assert simulation.days == days
+    assert simulation.downtime_days.tolist() == (
+        hourly_reference(load, irradiance, panels, batteries).tolist()
+    )
+    # More panel or more battery never adds downtime
+    assert (np.diff(simulation.downtime_days, axis=0) <= 0).all()
+    assert (np.diff(simulation.downtime_days, axis=1) <= 0).all()
+
+
+def test_size_solar_picks_cheapest_zero_downtime_configuration():
+    irradiance = np.tile(np.r_[np.zeros(12), np.full(12, 1000.0)], 10)
+
+    # 0.35 W for 24 h: 12 h of night needs 4.2 Wh usable, the day needs 1.2 W of panel
+    sized = size_solar(0.35, irradiance, [0.5, 1, 2], [2, 5, 10])
+    assert (sized["panel_W"], sized["battery_Wh"], sized["downtime_days"]) == (1.0, 5.0, 0)
+    assert sized["daily_load_Wh"] == 8.4
+
+    undersized = size_solar(0.35, irradiance, [0.5], [2])
+    assert undersized["downtime_days"] == 10
+
+
+def test_bundled_profile_and_estimator(tmp_path, monkeypatch):
+    assert load_irradiance().shape == (365 * 24,)
+
+    path = tmp_path / "irradiance.csv"
+    path.write_text("timestamp,ghi_W_m2\n" + "".join(f"t,{h % 24 * 40}\n" for h in range(50)))
+    monkeypatch.setenv("IOT_IRRADIANCE_FILE", str(path))
+    assert load_irradiance().shape == (48,)
+
+    result = estimate_power(
+        {"ESP32": {"voltage": 3.3, "mA": 120, "sleep_mA": 0.01, "duty_cycle": 0.01}}, solar=True
+    )
+    assert result["solar"]["days_simulated"] == 2
+    assert result["solar"]["downtime_days"] == 0
@@ -0,0 +1,98 @@
+"""Unit tests for hierarchical latency spans and their use in the evaluation tracker."""
+
+import contextvars
+import threading
+import time
+import uuid
+
+from evaluation.evaluation_tracker import EvaluationCallbackHandler, EvaluationTracker
+from rag.spans import SpanRecorder, activate, deactivate, span, traced
+
+
+def test_spans_are_noops_without_a_recorder():
+    with span("idle") as opened:
+        assert opened is None
+
+
+def test_nesting_breakdown_and_critical_path():
+    recorder = SpanRecorder()
+    root = recorder.start("run")
+    tokens = activate(recorder, root)
+
+    @traced("embed")
+    def embed():
+        time.sleep(0.01)
+
+    try:
+        with span("tool", tool="research_tool"):
+            embed()
+            with span("search"):
+                time.sleep(0.02)
+
+        # A span opened in a thread with a copied context nests under the open span
+        def worker():
+            with span("background"):
+                time.sleep(0.005)
+
+        with span("parallel"):
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+            thread.start()
+            thread.join()
+    finally:
+        recorder.end(root)
+        deactivate(tokens)
+
+    tree = recorder.to_dict()[0]
+    assert [child["name"] for child in tree["children"]] == ["tool", "parallel"]
+    assert [c["name"] for c in tree["children"][0]["children"]] == ["embed", "search"]
+    assert tree["children"][1]["children"][0]["name"] == "background"
+
+    breakdown = recorder.breakdown()
+    assert list(breakdown)[0] == "run"
+    assert breakdown["search"]["total_ms"] >= 20
+    assert breakdown["tool"]["self_ms"] < breakdown["tool"]["total_ms"] - 25
+
+    path = [(step["name"], step["depth"]) for step in recorder.critical_path()]
+    assert path == [
+        ("run", 0),
+        ("tool", 1),
+        ("embed", 2),
+        ("search", 2),
+        ("parallel", 1),
+        ("background", 2),
+    ]
+
+
+def test_tracker_records_tool_and_llm_spans():
+    tracker = EvaluationTracker()
+    handler = EvaluationCallbackHandler(tracker)
+    tracker.start_tracking()
+
+    llm_run, tool_run = uuid.uuid4(), uuid.uuid4()
+    handler.on_llm_start({}, ["prompt"], run_id=llm_run)
+    handler.on_llm_end(None, run_id=llm_run)
+    handler.on_tool_start({"name": "research_tool"}, "greenhouse", run_id=tool_run)
+    with span("rag.search"):
+        pass
+    handler.on_tool_end("{}", run_id=tool_run)
+    with span("after_tool"):
+        pass
+    tracker.end_tracking()
+
+    summary = tracker.get_summary()
+    assert set(summary["phase_breakdown"]) == {
+        "agent_run",
+        "llm",
+        "tool.research_tool",
+        "rag.search",
+        "after_tool",
+    }
+    run = tracker.spans.to_dict()[0]
+    names = [child["name"] for child in run["children"]]
+    assert names == ["llm", "tool.research_tool", "after_tool"]
+    assert run["children"][1]["children"][0]["name"] == "rag.search"
+    assert summary["tool_performance"]["research_tool"]["call_count"] == 1
+
+    # Spans are no longer recorded once tracking ends
+    with span("untracked") as opened:
+        assert opened is None
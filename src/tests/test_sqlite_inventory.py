@@ -0,0 +1,83 @@
+"""Unit tests for the SQLite inventory store."""
+
+import json
+
+from agent.inventory.backends import FUZZY_ACCEPT_SCORE, CatalogBackend
+from agent.inventory.catalog import DEFAULT_INVENTORY_FILES, InventoryCatalog
+from agent.inventory.sqlite_store import SQLiteInventory, iter_inventory_items
+from agent.tools.component_sourcing_tool import find_component_offers
+
+
+def test_streaming_parser_matches_json_load(tmp_path):
+    path = tmp_path / "vendor.json"
+    inventory = {
+        "sensor": [{"name": 'DHT22 "Pro"', "price": 3.25, "stock": 10}] * 50,
+        "empty": [],
+        "display": [{"name": "OLED", "price": 12345.678}],
+    }
+    path.write_text(json.dumps(inventory, indent=2))
+
+    expected = [(category, item) for category, items in inventory.items() for item in items]
+    # A tiny chunk size forces values and numbers to straddle chunk boundaries
+    assert list(iter_inventory_items(str(path), chunk_size=7)) == expected
+
+
+def test_sqlite_store_matches_in_memory_catalog(tmp_path):
+    store = SQLiteInventory(str(tmp_path / "inventory.db"))
+    for vendor, path in DEFAULT_INVENTORY_FILES.items():
+        store.import_json(vendor, path, batch_size=16)
+    catalog = InventoryCatalog()
+
+    assert len(store) == len(catalog)
+    assert store.find_by_name("ESP32-WROOM-32") == catalog.find_by_name("ESP32-WROOM-32")
+    assert store.find_by_category("sensor") == catalog.find_by_category("sensor")
+    assert store.search("dht-22")[0][0] == catalog.search("dht-22")[0][0]
+
+    results = find_component_offers(["ESP32-WROOM-32", "DHT-22"], store)
+    assert results["ESP32-WROOM-32"] == [
+        offer.to_dict() for offer in store.find_by_name("ESP32-WROOM-32")
+    ]
+    assert results["DHT-22"][0]["matched_name"] == "DHT22 Temperature & Humidity Sensor"
+
+
+def test_reimport_replaces_only_that_vendor(tmp_path):
+    store = SQLiteInventory(str(tmp_path / "inventory.db"))
+    first = tmp_path / "a.json"
+    first.write_text(json.dumps({"sensor": [{"name": "A", "part_number": "1"}]}))
+    second = tmp_path / "b.json"
+    second.write_text(json.dumps({"sensor": [{"name": "B", "part_number": "2"}]}))
+
+    store.import_json("Vendor A", str(first))
+    store.import_json("Vendor B", str(second))
+    first.write_text(json.dumps({"sensor": [{"name": "C", "part_number": "3"}]}))
+    store.import_json("Vendor A", str(first))
+
+    assert len(store) == 2
+    assert store.find_by_name("A") == []
+    assert store.find_by_name("B")[0].vendor == "Vendor B"
+    assert store.search("C", min_score=0.5) == []
+    assert store.find_by_part_number("3")[0].name == "C"
+
+
+def test_fuzzy_matches_agree_with_in_memory_catalog(tmp_path):
+    """Both backends weight trigrams alike, so they accept the same approximate matches."""
+    store = SQLiteInventory(str(tmp_path / "inventory.db"))
+    for vendor, path in DEFAULT_INVENTORY_FILES.items():
+        store.import_json(vendor, path, batch_size=16)
+    # Re-importing a vendor must leave the trigram statistics as they were
+    vendor, path = next(iter(DEFAULT_INVENTORY_FILES.items()))
+    store.import_json(vendor, path)
+    catalog = InventoryCatalog()
+
+    names = sorted({offer.name for offers in catalog.by_name.values() for offer in offers})
+    queries = ["dht-22", "ESP32", "PIR sensor", "bmp 280", "lora module", "zzz"]
+    queries += [name[: len(name) // 2 + 2] for name in names]
+    for query in queries:
+        best = store.search(query, limit=1, min_score=FUZZY_ACCEPT_SCORE)
+        assert best == catalog.search(query, limit=1, min_score=FUZZY_ACCEPT_SCORE), query
+
+    def accepted(backend):
+        results = backend.find_offers(queries)
+        return {q: results[q][0]["matched_name"] for q in queries if results[q]}
+
+    assert accepted(CatalogBackend(store)) == accepted(CatalogBackend(catalog))
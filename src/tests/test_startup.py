@@ -0,0 +1,21 @@
+"""Checks that CLI entry points don't eagerly import heavy dependencies."""
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["chromadb", "pymupdf", "langchain_core", "langchain_google_genai"]
+
+
+@pytest.mark.parametrize(
+    "module", ["rag.cli", "agent.cli", "agent.client", "evaluation", "evaluation.cli"]
+)
+def test_entry_point_imports_are_lazy(module):
+    """Importing a CLI module should not load the vector store, PDF or LLM libraries."""
+    code = f"import sys, {module}; print(','.join(sorted(sys.modules)))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    loaded = set(completed.stdout.strip().split(","))
+    assert not loaded & set(HEAVY_MODULES)
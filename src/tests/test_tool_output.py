@@ -0,0 +1,37 @@
+"""Unit tests for the compact tool output encoding."""
+
+import json
+
+from agent.tools.component_sourcing_tool import component_sourcing_tool
+from agent.tools.research_tool import serialize_research_results
+from agent.tools.tool_output import round_numbers
+from rag.vector_store import QueryMetadata, QueryResult
+
+
+def test_round_numbers():
+    assert round_numbers({"a": 1.23456, "b": [2.0, 3]}) == {"a": 1.23, "b": [2, 3]}
+
+
+def test_compact_sourcing_output_lists_vendor_urls_once(monkeypatch):
+    """Compact mode should move vendor URLs into one table and emit offers as rows."""
+    monkeypatch.setenv("IOT_TOOL_OUTPUT_FORMAT", "compact")
+    output = component_sourcing_tool.invoke({"component_types": "ESP32-WROOM-32"})
+
+    assert "\n" not in output
+    data = json.loads(output)
+    assert data["vendors"] == {"Digi-Key": "https://www.digikey.com/"}
+    offer = dict(zip(data["offer_fields"], data["results"]["ESP32-WROOM-32"][0]))
+    assert offer["part_number"] == "1528-ESP32-WROOM-32"
+
+
+def test_compact_research_output_deduplicates_sources(monkeypatch):
+    monkeypatch.setenv("IOT_TOOL_OUTPUT_FORMAT", "compact")
+    results = [
+        QueryResult(id=f"a.pdf_{i}", document="IoT  text\n", metadata=QueryMetadata("a.pdf"))
+        for i in range(3)
+    ]
+
+    data = json.loads(serialize_research_results("IoT", results))
+
+    assert data["sources"] == ["a.pdf"]
+    assert data["results"] == [[0, "IoT text"]] * 3
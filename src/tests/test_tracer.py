@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from agent import tracer
+from agent.tracer import (
+    TracingConfig,
+    build_tracer_provider,
+    get_tracing_config,
+    setup_tracing,
+    shutdown_tracing,
+)
+
+
+def _emit(provider, traces):
+    tracer = provider.get_tracer("test")
+    for i in range(traces):
+        with tracer.start_as_current_span("agent", attributes={"run": i}):
+            with tracer.start_as_current_span("tool"):
+                pass
+    provider.force_flush()
+
+
+def _read_spans(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_tracing_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("IOT_TRACING", raising=False)
+    assert get_tracing_config().mode == "off"
+    assert setup_tracing() is None
+
+
+def test_invalid_configuration_is_rejected(monkeypatch):
+    monkeypatch.setenv("IOT_TRACING", "zipkin")
+    with pytest.raises(ValueError):
+        get_tracing_config()
+
+    monkeypatch.setenv("IOT_TRACING", "jsonl")
+    monkeypatch.setenv("IOT_TRACING_SAMPLE_RATE", "1.5")
+    with pytest.raises(ValueError):
+        get_tracing_config()
+
+
+def test_jsonl_exporter_writes_span_tree(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = build_tracer_provider(TracingConfig(mode="jsonl", traces_file=str(path)))
+    _emit(provider, traces=3)
+    provider.shutdown()
+
+    spans = _read_spans(path)
+    assert len(spans) == 6
+    roots = {s["span_id"]: s for s in spans if s["name"] == "agent"}
+    children = [s for s in spans if s["name"] == "tool"]
+    assert sorted(root["attributes"]["run"] for root in roots.values()) == [0, 1, 2]
+    for child in children:
+        assert roots[child["parent_id"]]["trace_id"] == child["trace_id"]
+        assert child["duration_ms"] >= 0
+
+
+def test_head_sampling_keeps_or_drops_whole_traces(tmp_path):
+    dropped = tmp_path / "dropped.jsonl"
+    provider = build_tracer_provider(
+        TracingConfig(mode="jsonl", traces_file=str(dropped), sample_rate=0.0)
+    )
+    _emit(provider, traces=20)
+    provider.shutdown()
+    assert not dropped.exists() or not _read_spans(dropped)
+
+    sampled = tmp_path / "sampled.jsonl"
+    provider = build_tracer_provider(
+        TracingConfig(mode="jsonl", traces_file=str(sampled), sample_rate=0.5)
+    )
+    _emit(provider, traces=200)
+    provider.shutdown()
+
+    spans = _read_spans(sampled)
+    per_trace = {}
+    for s in spans:
+        per_trace.setdefault(s["trace_id"], []).append(s["name"])
+    # Children follow their root's sampling decision
+    assert all(sorted(names) == ["agent", "tool"] for names in per_trace.values())
+    assert 40 < len(per_trace) < 160
+
+
+def test_shutdown_exports_the_last_batch(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    # Longer than the test, so only shutdown can export the span
+    monkeypatch.setenv("OTEL_BSP_SCHEDULE_DELAY", "60000")
+    provider = setup_tracing(TracingConfig(mode="jsonl", traces_file=str(path)))
+    with provider.get_tracer("test").start_as_current_span("agent"):
+        pass
+    assert not path.exists()
+
+    shutdown_tracing()
+    shutdown_tracing()
+
+    assert [span["name"] for span in _read_spans(path)] == ["agent"]
+    assert tracer._provider is None
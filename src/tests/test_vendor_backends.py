@@ -0,0 +1,70 @@
+"""Unit tests for the vendor backends and the mock vendor server."""
+
+import time
+
+import pytest
+
+from agent.inventory.backends import HTTPVendorBackend, parse_vendor_endpoints
+from agent.inventory.catalog import InventoryCatalog
+from agent.inventory.mock_vendor_server import start_mock_vendors
+from agent.tools.component_sourcing_tool import find_component_offers
+
+
+@pytest.fixture
+def mock_vendors(request):
+    servers = start_mock_vendors(getattr(request, "param", None))
+    yield {server.vendor: server for server in servers}
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _backends(servers, timeout=2.0):
+    return [
+        HTTPVendorBackend(name, server.url, timeout=timeout) for name, server in servers.items()
+    ]
+
+
+def test_http_backends_match_local_catalog(mock_vendors):
+    components = ["ESP32-WROOM-32", "ESP32 Mini DevKit", "1528-DHT22-ND", "DHT-22"]
+    results = find_component_offers(components, backends=_backends(mock_vendors))
+
+    # Offers arrive in vendor order, as from the combined local catalog; suggestions are
+    # ranked per vendor, so only the offers are compared
+    expected = find_component_offers(components, catalog=InventoryCatalog())
+    assert {comp: results[comp] for comp in components} == {
+        comp: expected[comp] for comp in components
+    }
+    assert results["ESP32 Mini DevKit"][0]["vendor"] == "AliExpress"
+    assert "vendor_errors" not in results
+
+
+def test_connections_are_reused(mock_vendors):
+    backends = _backends(mock_vendors)
+    for _ in range(5):
+        find_component_offers(["ESP32-WROOM-32"], backends=backends)
+
+    for server in mock_vendors.values():
+        assert server.request_count == 5
+        assert server.connection_count == 1
+
+
+@pytest.mark.parametrize("mock_vendors", [{"AliExpress": 1.0}], indirect=True)
+def test_slow_vendor_returns_partial_results(mock_vendors):
+    start = time.monotonic()
+    results = find_component_offers(
+        ["ESP32-WROOM-32"], backends=_backends(mock_vendors, timeout=0.2)
+    )
+
+    assert time.monotonic() - start < 0.8
+    assert [offer["vendor"] for offer in results["ESP32-WROOM-32"]] == ["Digi-Key"]
+    assert "timed out" in results["vendor_errors"]["AliExpress"]
+
+
+def test_parse_vendor_endpoints():
+    assert parse_vendor_endpoints("A=http://a:1, B = https://b/api ,") == {
+        "A": "http://a:1",
+        "B": "https://b/api",
+    }
+    with pytest.raises(ValueError):
+        parse_vendor_endpoints("http://missing-name")